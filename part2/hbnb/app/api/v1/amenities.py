@@ -92,7 +92,7 @@ class AmenityResource(Resource):
         amenity_data = api.payload
 
         try:
-            amenity.update(amenity_data)
+            amenity = facade.update_amenity(amenity_id, amenity_data)
         except ValueError as e:
             return {'error': str(e)}, 400
 
@@ -1,3 +1,4 @@
+from flask import request
 from flask_restx import Namespace, Resource, fields
 from app.services import facade
 
@@ -86,14 +87,35 @@ class PlaceList(Resource):
         }, 201
 
     @api.response(200, 'List of places retrieved successfully')
+    @api.response(400, 'Invalid price filter or bbox')
+    @api.doc(params={'min_price': 'Lowest price, inclusive', 'max_price': 'Highest price, inclusive',
+                     'bbox': 'Bounding box as min_lng,min_lat,max_lng,max_lat',
+                     'amenities': 'Comma-separated amenity IDs the place must all have'})
     def get(self):
         """
-        Retrieve all places.
+        Retrieve all places, optionally filtered by price, area and amenities.
 
         Returns:
-            A list of places with minimal details (owner ID only).
+            A list of places with minimal details (owner ID only),
+            cheapest first when a filter is given.
         """
-        places = facade.get_all_places()
+        try:
+            min_price, max_price = (float(request.args[arg]) if arg in request.args else None
+                                    for arg in ('min_price', 'max_price'))
+        except ValueError:
+            return {'error': 'Invalid price filter'}, 400
+        bbox = None
+        if 'bbox' in request.args:
+            try:
+                west, south, east, north = (float(value) for value in request.args['bbox'].split(','))
+            except ValueError:
+                return {'error': 'Invalid bbox'}, 400
+            bbox = (south, west, north, east)
+        amenity_ids = [a for a in request.args.get('amenities', '').split(',') if a]
+        if min_price is None and max_price is None and bbox is None and not amenity_ids:
+            places = facade.get_all_places()
+        else:
+            places = facade.search_places(min_price, max_price, bbox, amenity_ids)
         return [
             {
                 'id': p.id,
@@ -109,7 +109,7 @@ class UserResource(Resource):
             return {'error': 'Email already registered by another user'}, 400
 
         try:
-            user.update(user_data)
+            user = facade.update_user(user_id, user_data)
         except ValueError as e:
             return {'error': str(e)}, 400
 
@@ -7,6 +7,8 @@ class Amenity(BaseModel):
     Inherits from BaseModel and adds a validated 'name' attribute.
     """
 
+    __slots__ = ('name',)
+
     def __init__(self, name):
         """
         Initialize a new Amenity instance.
@@ -1,24 +1,97 @@
 import uuid
-from datetime import datetime
+from datetime import datetime, timedelta
+from functools import cache
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def _compact_time(value):
+    """
+    Return a naive datetime as seconds since 1970 (a 24-byte float instead
+    of a 48-byte datetime), or the value itself if the float would not
+    give back the exact same datetime.
+    """
+    if type(value) is datetime and value.tzinfo is None:
+        micros = (value - _EPOCH) // _MICROSECOND
+        seconds = micros / 1e6
+        if round(seconds * 1e6) == micros:
+            return seconds
+    return value
+
+
+def _expand_time(value):
+    """Inverse of `_compact_time`."""
+    if type(value) is float:
+        return _EPOCH + timedelta(microseconds=round(value * 1e6))
+    return value
+
+
+@cache
+def _field_slots(cls):
+    """Return the slot names of the model fields (all but id and timestamps), base classes first."""
+    return tuple(attr for klass in reversed(cls.__mro__)
+                 for attr in klass.__dict__.get('__slots__', ()) if not attr.startswith('_') and attr != 'id')
 
 
 class BaseModel:
     """
     Base class that provides common attributes and behavior for all models.
 
+    Models declare their attributes in `__slots__`, so instances carry no
+    `__dict__`, and timestamps are stored as epoch floats, rebuilt into
+    datetimes when read. A new instance shares one float between
+    `created_at` and `updated_at`.
+
     Attributes:
         id (str): A unique identifier for the instance (UUID).
         created_at (datetime): Timestamp when the instance was created.
         updated_at (datetime): Timestamp when the instance was last updated.
     """
 
+    __slots__ = ('id', '_created_at', '_updated_at')
+
     def __init__(self):
         """
         Initialize a new instance with a unique ID and timestamps.
         """
         self.id = str(uuid.uuid4())
-        self.created_at = datetime.now()
-        self.updated_at = datetime.now()
+        self._created_at = self._updated_at = _compact_time(datetime.now())
+
+    @property
+    def created_at(self):
+        return _expand_time(self._created_at)
+
+    @created_at.setter
+    def created_at(self, value):
+        self._created_at = _compact_time(value)
+
+    @property
+    def updated_at(self):
+        return _expand_time(self._updated_at)
+
+    @updated_at.setter
+    def updated_at(self, value):
+        self._updated_at = _compact_time(value)
+
+    def __getstate__(self):
+        """
+        Return the public attributes of the object as a dict.
+
+        Used by `copy` and `pickle`, and by the repositories to copy or
+        journal an object, since slotted instances have no `vars()`.
+        """
+        state = {'id': self.id, 'created_at': self.created_at, 'updated_at': self.updated_at}
+        for attr in _field_slots(type(self)):
+            if hasattr(self, attr):
+                state[attr] = getattr(self, attr)
+        state.update(getattr(self, '__dict__', {}))
+        return state
+
+    def __setstate__(self, state):
+        """Set the attributes of a dict returned by `__getstate__`."""
+        for attr, value in state.items():
+            setattr(self, attr, value)
 
     def save(self):
         """
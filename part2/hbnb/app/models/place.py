@@ -9,6 +9,8 @@ class Place(BaseModel):
     owner, amenities, and reviews.
     """
 
+    __slots__ = ('title', 'description', 'price', 'latitude', 'longitude', 'owner', 'reviews', 'amenities')
+
     def __init__(self, title, description, price, latitude, longitude, owner):
         """
         Initialize a new Place instance with validated attributes.
@@ -9,6 +9,8 @@ class Review(BaseModel):
     and associations to a user and a place.
     """
 
+    __slots__ = ('text', 'rating', 'user', 'place')
+
     def __init__(self, text, rating, user, place):
         """
         Initialize a new Review instance with validation.
@@ -10,6 +10,8 @@ class User(BaseModel):
     such as first name, last name, email, and admin status.
     """
 
+    __slots__ = ('first_name', 'last_name', 'email', 'is_admin')
+
     def __init__(self, first_name, last_name, email, is_admin=False):
         """
         Initialize a new User instance with validation.
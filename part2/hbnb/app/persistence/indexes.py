@@ -0,0 +1,339 @@
+"""
+Secondary indexes for the in-memory repository.
+
+An index maps the value of one attribute to the IDs of the objects
+holding it, so lookups on that attribute do not scan the whole storage:
+
+    HashIndex('email', unique=True)   # one object per value
+    HashIndex('owner_id')             # many objects per value
+    SortedIndex('price')              # equality and range lookups
+    ColumnIndex({'price': (0, 1000), 'latitude': (-90, 90)},
+                sets={'amenities': amenity_ids})  # several criteria at once
+
+Each index remembers the value it indexed for every ID, so an object
+can be re-indexed after it was modified in place. Objects whose value
+is None are not indexed.
+"""
+
+from abc import ABC, abstractmethod
+from array import array
+from bisect import bisect_left, bisect_right, insort
+from collections import namedtuple
+from operator import attrgetter
+
+# Inclusive bounds of a range criterion, None leaving the bound open
+Range = namedtuple('Range', 'low high', defaults=(None, None))
+
+
+class Index(ABC):
+    """
+    Base class of the secondary indexes.
+
+    Attributes:
+        attr (str): Name of the indexed attribute, used in criteria.
+        unique (bool): Whether two objects may share a value.
+    """
+
+    unique = False
+
+    def __init__(self, attr, key=None):
+        """
+        Args:
+            attr (str): Name of the indexed attribute.
+            key (callable, optional): Computes the value from an object,
+                defaults to reading `attr` (e.g. `lambda r: r.place.id`
+                to index a related object's ID).
+        """
+        self.attr = attr
+        self.key = key or attrgetter(attr)
+        self._values = {}
+
+    @property
+    def attrs(self):
+        """Names of the attributes whose criteria the index answers."""
+        return (self.attr,)
+
+    def value_of(self, obj):
+        """Return the value to index for `obj`."""
+        return self.key(obj)
+
+    def add(self, obj):
+        """
+        Index (or re-index) an object under its current value.
+
+        Raises:
+            ValueError: If a unique index already holds the value for
+                another object; the index is left unchanged.
+        """
+        value = self.value_of(obj)
+        if self.owner_of(value) not in (None, obj.id):
+            raise ValueError(f"{self.attr} already exists")
+        self.remove(obj.id)
+        if value is not None:
+            self._insert(obj.id, value)
+            self._values[obj.id] = value
+
+    def remove(self, obj_id):
+        """Forget an object, if indexed."""
+        if obj_id in self._values:
+            self._delete(obj_id, self._values.pop(obj_id))
+
+    def owner_of(self, value):
+        """Return the ID of another object already holding `value` (unique indexes)."""
+        return None
+
+    @abstractmethod
+    def lookup(self, criterion):
+        """
+        Return the IDs matching a criterion, in a stable order.
+
+        Args:
+            criterion: A value, or a `Range` for sorted indexes.
+        """
+        pass
+
+    def match(self, criteria):
+        """
+        Return the IDs matching every criterion of `criteria`.
+
+        Args:
+            criteria (dict): Attribute name -> criterion, for attributes
+                of `attrs` only.
+        """
+        return self.lookup(criteria[self.attr])
+
+    @abstractmethod
+    def _insert(self, obj_id, value):
+        """Store `value` for an object that is not indexed."""
+        pass
+
+    @abstractmethod
+    def _delete(self, obj_id, value):
+        """Drop the `value` stored for an object."""
+        pass
+
+
+class HashIndex(Index):
+    """Equality index backed by a dict, optionally unique."""
+
+    def __init__(self, attr, unique=False, key=None):
+        """
+        Args:
+            attr (str): Name of the indexed attribute.
+            unique (bool): Reject two objects with the same value.
+            key (callable, optional): See `Index`.
+        """
+        super().__init__(attr, key)
+        self.unique = unique
+        # value -> {id: None}, an insertion-ordered set
+        self._buckets = {}
+
+    def owner_of(self, value):
+        if not self.unique or value is None:
+            return None
+        return next(iter(self._buckets.get(value, ())), None)
+
+    def lookup(self, criterion):
+        if isinstance(criterion, Range):
+            raise ValueError(f"Range lookups need a sorted index on {self.attr}")
+        return list(self._buckets.get(criterion, ()))
+
+    def _insert(self, obj_id, value):
+        self._buckets.setdefault(value, {})[obj_id] = None
+
+    def _delete(self, obj_id, value):
+        bucket = self._buckets[value]
+        del bucket[obj_id]
+        if not bucket:
+            del self._buckets[value]
+
+
+class SortedIndex(Index):
+    """Ordered index answering equality and `Range` lookups with bisection."""
+
+    def __init__(self, attr, key=None):
+        super().__init__(attr, key)
+        # Sorted (value, id) pairs
+        self._entries = []
+
+    def lookup(self, criterion):
+        if not isinstance(criterion, Range):
+            criterion = Range(criterion, criterion)
+        start = 0
+        end = len(self._entries)
+        if criterion.low is not None:
+            start = bisect_left(self._entries, criterion.low, key=lambda entry: entry[0])
+        if criterion.high is not None:
+            end = bisect_right(self._entries, criterion.high, key=lambda entry: entry[0])
+        return [obj_id for _, obj_id in self._entries[start:end]]
+
+    def _insert(self, obj_id, value):
+        insort(self._entries, (value, obj_id))
+
+    def _delete(self, obj_id, value):
+        del self._entries[bisect_left(self._entries, (value, obj_id))]
+
+
+# Number of buckets of a ColumnIndex column: one byte code per row
+_BUCKETS = 256
+
+
+class _Column:
+    """Values of one numeric attribute, with the bucket code of each row."""
+
+    def __init__(self, low, high):
+        self.low = low
+        self.scale = _BUCKETS / (high - low)
+        self.values = array('d')
+        self.codes = bytearray()
+
+    def code(self, value):
+        """Return the bucket of a value; out-of-bounds values go to the end buckets."""
+        if value != value:
+            return 0
+        return min(max(int((value - self.low) * self.scale), 0), _BUCKETS - 1)
+
+    def table(self, criterion):
+        """Return the translate table mapping the buckets a range may match to 1."""
+        first = 0 if criterion.low is None else self.code(criterion.low)
+        last = _BUCKETS - 1 if criterion.high is None else self.code(criterion.high)
+        return bytes(first) + b'\x01' * (last - first + 1) + bytes(_BUCKETS - 1 - last)
+
+
+class ColumnIndex(Index):
+    """
+    Columnar index answering range and "has all" criteria with row masks.
+
+    Indexed objects get a row number. Each numeric attribute is stored
+    as an `array('d')` of values plus one byte per row: the bucket of
+    the value among 256 equal slices of [low, high]. Each member of a
+    set attribute (e.g. each amenity ID) has a byte mask of the rows
+    holding it.
+
+    A query turns each criterion into a byte mask over all rows in C
+    (`bytes.translate` maps the buckets a range may match to 1), ANDs
+    the masks as big integers, then checks the exact values of the
+    remaining rows only. Python code therefore runs per candidate, not
+    per stored object.
+    """
+
+    def __init__(self, columns, sets=None):
+        """
+        Args:
+            columns (dict): Numeric attribute -> (low, high) bounds of its
+                buckets. Values outside still match exactly, but share
+                the end buckets.
+            sets (dict, optional): Set attribute -> callable returning
+                the members of an object (e.g. its amenity IDs), or None
+                to read the attribute.
+        """
+        self._columns = {attr: _Column(low, high) for attr, (low, high) in columns.items()}
+        self._set_keys = {attr: key or attrgetter(attr) for attr, key in (sets or {}).items()}
+        self._masks = {attr: {} for attr in self._set_keys}
+        self._members = {attr: [] for attr in self._set_keys}
+        self.attr = ', '.join(self.attrs)
+        self._ids = []
+        self._rows = {}
+        self._free = []
+        self._live = bytearray()
+
+    @property
+    def attrs(self):
+        return (*self._columns, *self._set_keys)
+
+    def value_of(self, obj):
+        return None
+
+    def add(self, obj):
+        # A row holds several values: the object itself is the indexed value
+        self._insert(obj.id, obj)
+
+    def remove(self, obj_id):
+        self._delete(obj_id, None)
+
+    def _insert(self, obj_id, obj):
+        """Write the values of `obj` into its row, allocating one if needed."""
+        row = self._rows.get(obj_id)
+        if row is None:
+            row = self._free.pop() if self._free else len(self._ids)
+            if row == len(self._ids):
+                self._ids.append(obj_id)
+                self._live.append(1)
+                for column in self._columns.values():
+                    column.values.append(0.0)
+                    column.codes.append(0)
+            self._ids[row] = obj_id
+            self._live[row] = 1
+            self._rows[obj_id] = row
+        for attr, column in self._columns.items():
+            value = getattr(obj, attr)
+            value = float('nan') if value is None else float(value)
+            column.values[row] = value
+            column.codes[row] = column.code(value)
+        for attr, key in self._set_keys.items():
+            self._set_members(attr, row, tuple(dict.fromkeys(key(obj))))
+
+    def _set_members(self, attr, row, members):
+        """Move a row from the masks of its old members to those of `members`."""
+        masks, rows_members = self._masks[attr], self._members[attr]
+        if row == len(rows_members):
+            rows_members.append(())
+        for member in rows_members[row]:
+            masks[member][row] = 0
+        for member in members:
+            mask = masks.setdefault(member, bytearray())
+            if len(mask) <= row:
+                mask.extend(bytes(row + 1 - len(mask)))
+            mask[row] = 1
+        rows_members[row] = members
+
+    def _delete(self, obj_id, value):
+        """Free the row of an object, if indexed."""
+        row = self._rows.pop(obj_id, None)
+        if row is None:
+            return
+        for attr in self._set_keys:
+            self._set_members(attr, row, ())
+        self._ids[row] = None
+        self._live[row] = 0
+        self._free.append(row)
+
+    def lookup(self, criterion):
+        raise ValueError(f"Use match() to query the columns of {self.attr}")
+
+    def match(self, criteria):
+        """
+        Return the IDs matching every criterion, in row order.
+
+        Args:
+            criteria (dict): Numeric attribute -> value or `Range`; set
+                attribute -> members the object must all have.
+        """
+        mask = int.from_bytes(self._live, 'little')
+        ranges = []
+        for attr, criterion in criteria.items():
+            if attr in self._columns:
+                if not isinstance(criterion, Range):
+                    criterion = Range(criterion, criterion)
+                column = self._columns[attr]
+                mask &= int.from_bytes(column.codes.translate(column.table(criterion)), 'little')
+                ranges.append((column.values,
+                               float('-inf') if criterion.low is None else criterion.low,
+                               float('inf') if criterion.high is None else criterion.high))
+            else:
+                for member in criterion:
+                    member_mask = self._masks[attr].get(member)
+                    if member_mask is None:
+                        return []
+                    mask &= int.from_bytes(member_mask, 'little')
+
+        # One byte per row: the rows left are the non-zero bytes
+        rows = mask.to_bytes(len(self._live), 'little')
+        obj_ids = []
+        row = rows.find(1)
+        while row != -1:
+            # Rows in the end buckets of a range may fall outside it
+            if all(low <= values[row] <= high for values, low, high in ranges):
+                obj_ids.append(self._ids[row])
+            row = rows.find(1, row + 1)
+        return obj_ids
@@ -0,0 +1,254 @@
+"""
+Append-only journal and snapshots for the persistent in-memory repository.
+
+A repository named `places` stored in `directory` owns these files:
+
+    places.000001.log    journal segments, one JSON record per line
+    places.snapshot      compacted state, covering every segment up to
+                         the number in its header line
+
+Every add/update writes the full state of the object (`put`), every
+delete its ID (`del`), so replaying is idempotent and the last record of
+an ID wins. Each line starts with the CRC32 of its payload: a line torn
+by a crash is detected and cut off when the journal is reopened.
+
+Durability uses group commit: `append` returns once its record is on
+disk, but concurrent writers waiting at the same time share one fsync.
+Compaction rotates to a new segment, writes the snapshot next to the
+live files (fsync + atomic rename), then deletes the covered segments.
+"""
+
+import glob
+import json
+import os
+import threading
+import zlib
+from datetime import datetime
+
+SNAPSHOT_SUFFIX = '.snapshot'
+# How appends reach the disk
+SYNC_MODES = ('group', 'none')
+
+
+def _default(value):
+    if isinstance(value, datetime):
+        return {'$dt': value.isoformat()}
+    raise TypeError(f"Cannot journal {type(value).__name__} values")
+
+
+def _object_hook(value):
+    if len(value) == 1 and '$dt' in value:
+        return datetime.fromisoformat(value['$dt'])
+    return value
+
+
+# Shared codec instances: building them per line dominates replay time
+_encoder = json.JSONEncoder(default=_default, separators=(',', ':'))
+_decoder = json.JSONDecoder(object_hook=_object_hook)
+
+
+def encode_line(record):
+    """Return the journal line of a record: CRC32, space, JSON payload."""
+    payload = _encoder.encode(record).encode('utf-8')
+    return b'%08x %s\n' % (zlib.crc32(payload), payload)
+
+
+def decode_line(line):
+    """
+    Return the record stored in a journal line.
+
+    Raises:
+        ValueError: If the line is truncated or corrupted.
+    """
+    if not line.endswith(b'\n') or len(line) < 10:
+        raise ValueError("Truncated journal line")
+    checksum, payload = line[:8], line[9:-1]
+    if int(checksum, 16) != zlib.crc32(payload):
+        raise ValueError("Corrupted journal line")
+    return _decoder.decode(payload.decode('utf-8'))
+
+
+def _fsync_directory(directory):
+    """Make renames and file creations in `directory` durable."""
+    fd = os.open(directory, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+class Journal:
+    """
+    Segmented append-only log with group-commit fsync.
+
+    Methods:
+        replay(): Yield the snapshot records, then the journal records.
+        append(record): Write a record; durable on return in "group" mode.
+        rotate(): Start a new segment and return the number of the old one.
+        write_snapshot(records, segment): Replace the snapshot and drop
+            the segments it covers.
+        close(): Flush and close the current segment.
+    """
+
+    def __init__(self, directory, name, sync='group'):
+        """
+        Args:
+            directory (str): Directory of the journal files (created if needed).
+            name (str): Prefix of the files.
+            sync (str): "group" (fsync before returning, shared between
+                concurrent writers) or "none" (left to the OS).
+        """
+        if sync not in SYNC_MODES:
+            raise ValueError(f"Unknown journal sync mode: {sync}")
+        os.makedirs(directory, exist_ok=True)
+        self.directory = directory
+        self.name = name
+        self.sync = sync
+        self._cond = threading.Condition()
+        self._written = 0
+        self._synced = 0
+        self._syncing = False
+        self._fd = None
+        # Never reuse the number of a segment covered by the snapshot
+        self.segment = max(self._segments(), default=self._covered())
+
+    def _covered(self):
+        """Return the last segment included in the snapshot (0 without snapshot)."""
+        if not os.path.exists(self.snapshot_path):
+            return 0
+        with open(self.snapshot_path, 'rb') as snapshot:
+            return decode_line(snapshot.readline())['segment']
+
+    @property
+    def snapshot_path(self):
+        return os.path.join(self.directory, self.name + SNAPSHOT_SUFFIX)
+
+    def _segment_path(self, segment):
+        return os.path.join(self.directory, f'{self.name}.{segment:06d}.log')
+
+    def _segments(self):
+        """Return the numbers of the segments on disk, in order."""
+        prefix = os.path.join(self.directory, self.name + '.')
+        return sorted(int(path[len(prefix):-len('.log')])
+                      for path in glob.glob(glob.escape(prefix) + '[0-9]*.log'))
+
+    def replay(self):
+        """
+        Yield every stored record, oldest first.
+
+        A torn or corrupted tail of the last segment (crash during a
+        write) is truncated; damage anywhere else raises ValueError.
+        """
+        covered = 0
+        if os.path.exists(self.snapshot_path):
+            with open(self.snapshot_path, 'rb') as snapshot:
+                covered = decode_line(snapshot.readline())['segment']
+                for line in snapshot:
+                    yield decode_line(line)
+
+        segments = [segment for segment in self._segments() if segment > covered]
+        for segment in segments:
+            path = self._segment_path(segment)
+            with open(path, 'rb') as log:
+                offset = 0
+                for line in log:
+                    try:
+                        record = decode_line(line)
+                    except ValueError:
+                        if segment != segments[-1]:
+                            raise
+                        break
+                    offset += len(line)
+                    yield record
+            if os.path.getsize(path) != offset:
+                os.truncate(path, offset)
+
+    def _open(self):
+        if self._fd is None:
+            if self.segment <= self._covered():
+                self.segment += 1
+            self._fd = os.open(self._segment_path(self.segment),
+                               os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+
+    def append(self, record):
+        """
+        Write a record at the end of the journal.
+
+        In "group" mode the call returns once the record is on disk: the
+        first waiting writer fsyncs for everybody written so far, the
+        others wait for it instead of issuing their own fsync.
+        """
+        line = encode_line(record)
+        with self._cond:
+            self._open()
+            os.write(self._fd, line)
+            self._written += 1
+            seq = self._written
+            if self.sync == 'none':
+                return
+            while self._synced < seq:
+                if self._syncing:
+                    self._cond.wait()
+                    continue
+                self._syncing = True
+                target, fd = self._written, self._fd
+                synced = False
+                self._cond.release()
+                try:
+                    os.fsync(fd)
+                    synced = True
+                finally:
+                    self._cond.acquire()
+                    if synced:
+                        self._synced = max(self._synced, target)
+                    self._syncing = False
+                    self._cond.notify_all()
+
+    def rotate(self):
+        """
+        Close the current segment and start a new one.
+
+        Returns:
+            int: Number of the closed segment, to pass to `write_snapshot`.
+        """
+        with self._cond:
+            while self._syncing:
+                self._cond.wait()
+            self._open()
+            os.fsync(self._fd)
+            os.close(self._fd)
+            self._fd = None
+            self._synced = self._written
+            covered = self.segment
+            self.segment += 1
+            self._open()
+            return covered
+
+    def write_snapshot(self, records, segment):
+        """
+        Atomically replace the snapshot, then delete the segments it covers.
+
+        Args:
+            records (iterable[dict]): `put` records of every live object.
+            segment (int): Last segment whose records are included.
+        """
+        tmp_path = self.snapshot_path + '.tmp'
+        with open(tmp_path, 'wb') as snapshot:
+            snapshot.write(encode_line({'segment': segment}))
+            for record in records:
+                snapshot.write(encode_line(record))
+            snapshot.flush()
+            os.fsync(snapshot.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        _fsync_directory(self.directory)
+        for old in self._segments():
+            if old <= segment:
+                os.remove(self._segment_path(old))
+
+    def close(self):
+        """Flush and close the current segment."""
+        with self._cond:
+            if self._fd is not None:
+                os.fsync(self._fd)
+                os.close(self._fd)
+                self._fd = None
@@ -1,4 +1,9 @@
 from abc import ABC, abstractmethod
+from contextlib import contextmanager
+import copy
+import threading
+from app.persistence.indexes import Range
+from app.persistence.journal import Journal
 
 
 class Repository(ABC):
@@ -73,17 +78,42 @@ class Repository(ABC):
         """
         pass
 
+    @abstractmethod
+    def filter_by(self, **criteria):
+        """
+        Retrieve all objects matching every criterion.
+
+        Args:
+            **criteria: Attribute values to match; a `Range(low, high)`
+                value matches an inclusive range.
+
+        Returns:
+            A list of the matching objects.
+        """
+        pass
+
 
 class InMemoryRepository(Repository):
     """
     In-memory implementation of the Repository interface using a dictionary.
+
+    Secondary indexes (see `app.persistence.indexes`) are kept up to date
+    on add, update and delete, and used by `get_by_attribute` and
+    `filter_by` for the attributes they cover. Objects modified in place
+    outside `update` must be passed to `reindex`.
     """
 
-    def __init__(self):
+    def __init__(self, indexes=()):
         """
         Initialize the repository with an empty internal storage.
+
+        Args:
+            indexes (iterable[Index]): Secondary indexes to maintain.
         """
         self._storage = {}
+        self._index_list = list(indexes)
+        # Attribute -> index answering its criteria
+        self._indexes = {attr: index for index in self._index_list for attr in index.attrs}
 
     def add(self, obj):
         """
@@ -91,8 +121,33 @@ class InMemoryRepository(Repository):
 
         Args:
             obj: The object to be added. Must have a unique 'id' attribute.
+
+        Raises:
+            ValueError: If a unique index already holds one of its values.
         """
+        self._check_unique(obj.id, {index.attr: index.value_of(obj) for index in self._index_list if index.unique})
         self._storage[obj.id] = obj
+        self._index(obj)
+
+    def reindex(self, obj):
+        """
+        Refresh the index entries of an object modified in place.
+
+        Args:
+            obj: A stored object.
+        """
+        self._index(obj)
+
+    def _index(self, obj):
+        for index in self._index_list:
+            index.add(obj)
+
+    def _check_unique(self, obj_id, values):
+        """Raise ValueError if a unique index holds one of `values` for another object."""
+        for attr, value in values.items():
+            index = self._indexes.get(attr)
+            if index is not None and index.owner_of(value) not in (None, obj_id):
+                raise ValueError(f"{attr} already exists")
 
     def get(self, obj_id):
         """
@@ -117,15 +172,29 @@ class InMemoryRepository(Repository):
 
     def update(self, obj_id, data):
         """
-        Update an existing object with new data.
+        Update an existing object with new data and refresh its index entries.
+
+        Unique values are checked before the object is modified.
 
         Args:
             obj_id: The unique identifier of the object.
             data (dict): Data to update on the object.
+
+        Returns:
+            The updated object, or None if not found.
+
+        Raises:
+            ValueError: If the data is invalid or breaks a unique index.
         """
         obj = self.get(obj_id)
         if obj:
-            obj.update(data)
+            self._check_unique(obj_id, data)
+            try:
+                obj.update(data)
+            finally:
+                # Validation may fail after some fields were already set
+                self._index(obj)
+        return obj
 
     def delete(self, obj_id):
         """
@@ -136,6 +205,8 @@ class InMemoryRepository(Repository):
         """
         if obj_id in self._storage:
             del self._storage[obj_id]
+            for index in self._index_list:
+                index.remove(obj_id)
 
     def get_by_attribute(self, attr_name, attr_value):
         """
@@ -148,4 +219,292 @@ class InMemoryRepository(Repository):
         Returns:
             The first matching object, or None if not found.
         """
+        index = self._indexes.get(attr_name)
+        if index is not None:
+            obj_ids = index.match({attr_name: attr_value})
+            return self._storage[obj_ids[0]] if obj_ids else None
         return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
+
+    def filter_by(self, **criteria):
+        """
+        Retrieve all objects matching every criterion.
+
+        Indexed criteria are resolved first, each index answering all the
+        criteria it covers at once, starting from the most selective
+        result; the others are checked on the remaining candidates only.
+        Without any indexed criterion the whole storage is scanned.
+
+        Args:
+            **criteria: Attribute values to match; a `Range(low, high)`
+                value matches an inclusive range.
+
+        Returns:
+            list: The matching objects, in index (or insertion) order.
+        """
+        by_index = {}
+        for attr, value in criteria.items():
+            if attr in self._indexes:
+                by_index.setdefault(self._indexes[attr], {})[attr] = value
+        matches = sorted((index.match(subset) for index, subset in by_index.items()), key=len)
+        others = [(attr, value) for attr, value in criteria.items() if attr not in self._indexes]
+        if matches:
+            first, rest = matches[0], [set(obj_ids) for obj_ids in matches[1:]]
+            candidates = (self._storage[obj_id] for obj_id in first
+                          if all(obj_id in obj_ids for obj_ids in rest))
+        else:
+            candidates = self._storage.values()
+        return [obj for obj in candidates if all(_matches(obj, attr, value) for attr, value in others)]
+
+
+def _matches(obj, attr, criterion):
+    """Check one `filter_by` criterion against an object."""
+    value = getattr(obj, attr)
+    if isinstance(criterion, Range):
+        return value is not None and (criterion.low is None or value >= criterion.low) \
+            and (criterion.high is None or value <= criterion.high)
+    return value == criterion
+
+
+class ConcurrentInMemoryRepository(InMemoryRepository):
+    """
+    Thread-safe InMemoryRepository for multi-threaded servers.
+
+    Two kinds of locks are used:
+        - Stripe locks, chosen by hashing the object ID, serialize the
+          writers of one object while writers of objects on other stripes
+          proceed independently. `locked(obj_id)` exposes them for
+          read-modify-write sequences spanning several calls.
+        - A shared lock, held only for short structural changes (storage
+          membership, index entries, committing an update), makes reads
+          see a consistent state.
+
+    `update` is atomic: the data is validated and applied on a copy of
+    the object, and copied back only if it succeeds, so readers never see
+    a half-applied or invalid update.
+    """
+
+    def __init__(self, indexes=(), stripes=64):
+        """
+        Args:
+            indexes (iterable[Index]): Secondary indexes to maintain.
+            stripes (int): Number of stripe locks; 1 gives a single
+                global lock.
+        """
+        super().__init__(indexes)
+        self._stripes = [threading.RLock() for _ in range(stripes)]
+        self._shared = threading.RLock()
+
+    def _stripe(self, obj_id):
+        return self._stripes[hash(obj_id) % len(self._stripes)]
+
+    @contextmanager
+    def locked(self, obj_id):
+        """
+        Hold the stripe lock of an object, e.g. to read and update it atomically.
+
+        Args:
+            obj_id: The unique identifier of the object.
+        """
+        with self._stripe(obj_id):
+            yield
+
+    def add(self, obj):
+        """
+        Add an object; checking unique indexes and inserting is atomic.
+
+        Raises:
+            ValueError: If a unique index already holds one of its values.
+        """
+        with self._stripe(obj.id), self._shared:
+            super().add(obj)
+
+    def reindex(self, obj):
+        """Refresh the index entries of an object modified in place."""
+        with self._shared:
+            super().reindex(obj)
+
+    def get_all(self):
+        """
+        Retrieve all stored objects.
+
+        Returns:
+            list: Snapshot of the objects stored at one point in time.
+        """
+        with self._shared:
+            return list(self._storage.values())
+
+    def update(self, obj_id, data):
+        """
+        Validate and apply an update atomically.
+
+        Args:
+            obj_id: The unique identifier of the object.
+            data (dict): Data to update on the object.
+
+        Returns:
+            The updated object, or None if not found.
+
+        Raises:
+            ValueError: If the data is invalid or breaks a unique index;
+                the object is left unchanged.
+        """
+        with self._stripe(obj_id):
+            obj = self.get(obj_id)
+            if obj is None:
+                return None
+            draft = copy.copy(obj)
+            draft.update(data)
+            with self._shared:
+                self._check_unique(obj_id, data)
+                obj.__setstate__(draft.__getstate__())
+                self._index(obj)
+            return obj
+
+    def delete(self, obj_id):
+        """Delete an object by ID."""
+        with self._stripe(obj_id), self._shared:
+            super().delete(obj_id)
+
+    def get_by_attribute(self, attr_name, attr_value):
+        """Retrieve an object by matching an attribute value."""
+        with self._shared:
+            return super().get_by_attribute(attr_name, attr_value)
+
+    def filter_by(self, **criteria):
+        """Retrieve all objects matching every criterion (see InMemoryRepository)."""
+        with self._shared:
+            return super().filter_by(**criteria)
+
+
+class PersistentInMemoryRepository(ConcurrentInMemoryRepository):
+    """
+    ConcurrentInMemoryRepository made durable by a journal and snapshots.
+
+    Reads are served from memory as usual. Every add, update, delete and
+    `reindex` appends the new state of the object to an append-only
+    journal (see `app.persistence.journal`) before returning, and the
+    journal is compacted into a snapshot every `snapshot_every` writes,
+    in a background thread. On construction the snapshot and the journal
+    are replayed to rebuild the objects.
+
+    References to objects of other repositories are stored as IDs and
+    resolved on load, so referenced repositories must be built first.
+    """
+
+    def __init__(self, model, directory, name, refs=None, transient=(), indexes=(),
+                 stripes=64, sync='group', snapshot_every=100000):
+        """
+        Args:
+            model (type): Class of the stored objects, rebuilt without
+                calling __init__ (the data was validated when written).
+            directory (str): Directory of the journal and snapshot files.
+            name (str): Prefix of the files, e.g. "places".
+            refs (dict, optional): Attribute name -> repository of the
+                referenced object(s), for attributes holding an object or
+                a list of objects.
+            transient (tuple[str]): Attributes not persisted, restored as
+                empty lists (e.g. back-references rebuilt by the caller).
+            indexes (iterable[Index]): Secondary indexes to maintain.
+            stripes (int): Number of stripe locks.
+            sync (str): Journal sync mode, "group" or "none".
+            snapshot_every (int): Writes between two compactions.
+        """
+        super().__init__(indexes, stripes)
+        self.model = model
+        self.refs = refs or {}
+        self.transient = set(transient)
+        self.snapshot_every = snapshot_every
+        self._journal = Journal(directory, name, sync)
+        self._writes = 0
+        self._compacting = threading.Lock()
+        self._load()
+
+    def _encode(self, obj):
+        """Return the `put` record of an object."""
+        state = {}
+        for attr, value in obj.__getstate__().items():
+            if attr in self.transient:
+                continue
+            if attr in self.refs:
+                value = [item.id for item in value] if isinstance(value, list) else getattr(value, 'id', None)
+            state[attr] = value
+        return {'op': 'put', 'obj': state}
+
+    def _decode(self, state):
+        """Rebuild an object from its stored state."""
+        obj = self.model.__new__(self.model)
+        for attr, repository in self.refs.items():
+            value = state.get(attr)
+            if isinstance(value, list):
+                state[attr] = [item for item in map(repository.get, value) if item is not None]
+            elif value is not None:
+                state[attr] = repository.get(value)
+        for attr in self.transient:
+            state[attr] = []
+        obj.__setstate__(state)
+        return obj
+
+    def _load(self):
+        """Replay the snapshot and the journal into memory."""
+        states = {}
+        for record in self._journal.replay():
+            if record['op'] == 'put':
+                states[record['obj']['id']] = record['obj']
+            else:
+                states.pop(record['id'], None)
+        for state in states.values():
+            InMemoryRepository.add(self, self._decode(state))
+
+    def _log(self, record):
+        self._journal.append(record)
+        self._writes += 1
+        if self._writes >= self.snapshot_every and not self._compacting.locked():
+            self._writes = 0
+            threading.Thread(target=self.compact, daemon=True).start()
+
+    def add(self, obj):
+        """Add an object and journal it."""
+        with self._stripe(obj.id):
+            super().add(obj)
+            self._log(self._encode(obj))
+
+    def reindex(self, obj):
+        """Refresh the index entries of an object modified in place, and journal it."""
+        with self._stripe(obj.id):
+            super().reindex(obj)
+            self._log(self._encode(obj))
+
+    def update(self, obj_id, data):
+        """Validate and apply an update atomically, then journal it."""
+        with self._stripe(obj_id):
+            obj = super().update(obj_id, data)
+            if obj is not None:
+                self._log(self._encode(obj))
+            return obj
+
+    def delete(self, obj_id):
+        """Delete an object by ID and journal it."""
+        with self._stripe(obj_id):
+            if obj_id in self._storage:
+                super().delete(obj_id)
+                self._log({'op': 'del', 'id': obj_id})
+
+    def compact(self):
+        """
+        Write a snapshot of the current state and drop the journal it covers.
+
+        The state is captured and the journal rotated under the shared
+        lock; the snapshot itself is written without blocking writers.
+        Writes logged meanwhile land in the new segment and are replayed
+        on top of the snapshot.
+        """
+        with self._compacting:
+            with self._shared:
+                records = [self._encode(obj) for obj in self._storage.values()]
+                segment = self._journal.rotate()
+            self._journal.write_snapshot(records, segment)
+
+    def close(self):
+        """Flush and close the journal."""
+        with self._compacting:
+            self._journal.close()
@@ -1,8 +1,13 @@
 """
 Initializes the HBnBFacade service layer for managing application data.
+
+Set HBNB_DATA_DIR to keep the data across restarts (journal + snapshots);
+otherwise it only lives in memory.
 """
 
+import os
+
 from app.services.facade import HBnBFacade
 
 # Instantiate the application facade to manage users, places, amenities, and reviews.
-facade = HBnBFacade()
+facade = HBnBFacade(data_dir=os.getenv('HBNB_DATA_DIR'))
@@ -1,4 +1,5 @@
-from app.persistence.repository import InMemoryRepository
+from app.persistence.repository import ConcurrentInMemoryRepository, PersistentInMemoryRepository
+from app.persistence.indexes import ColumnIndex, HashIndex, Range
 from app.models.user import User
 from app.models.amenity import Amenity
 from app.models.place import Place
@@ -9,16 +10,43 @@ class HBnBFacade:
     """
     Facade class that provides a simplified interface to interact with
     users, amenities, places, and reviews using in-memory repositories.
+
+    The repositories are thread-safe; objects shared between requests
+    (e.g. a place's reviews list) are only mutated under the stripe lock
+    of their repository.
     """
 
-    def __init__(self):
-        """
-        Initializes repositories for users, places, reviews, and amenities.
+    def __init__(self, data_dir=None):
         """
-        self.user_repo = InMemoryRepository()
-        self.place_repo = InMemoryRepository()
-        self.review_repo = InMemoryRepository()
-        self.amenity_repo = InMemoryRepository()
+        Initializes repositories for users, places, reviews, and amenities,
+        with secondary indexes on the attributes they are queried by.
+
+        Args:
+            data_dir (str, optional): Directory of the journal and snapshot
+                files. Without it the data only lives in memory.
+        """
+        def repository(name, model, indexes, refs=None, transient=()):
+            if data_dir is None:
+                return ConcurrentInMemoryRepository(indexes=indexes)
+            return PersistentInMemoryRepository(model, data_dir, name, refs=refs,
+                                                transient=transient, indexes=indexes)
+
+        # Les repositories référencés doivent être chargés en premier
+        self.user_repo = repository('users', User, [HashIndex('email', unique=True)])
+        self.amenity_repo = repository('amenities', Amenity, [HashIndex('name')])
+        self.place_repo = repository('places', Place, [
+            HashIndex('owner_id', key=lambda place: place.owner.id),
+            ColumnIndex({'price': (0.0, 1000.0), 'latitude': (-90.0, 90.0), 'longitude': (-180.0, 180.0)},
+                        sets={'amenities': lambda place: [amenity.id for amenity in place.amenities]}),
+        ], refs={'owner': self.user_repo, 'amenities': self.amenity_repo}, transient=('reviews',))
+        self.review_repo = repository('reviews', Review, [
+            HashIndex('place_id', key=lambda review: review.place.id),
+            HashIndex('user_id', key=lambda review: review.user.id),
+        ], refs={'user': self.user_repo, 'place': self.place_repo})
+
+        # Les listes de reviews des places ne sont pas journalisées : les reconstruire
+        for review in self.review_repo.get_all():
+            review.place.reviews.append(review)
 
     # -------------------------------
     # User Methods
@@ -82,11 +110,7 @@ class HBnBFacade:
         Returns:
             User or None: The updated user object, or None if not found.
         """
-        user = self.get_user(user_id)
-        if not user:
-            return None
-        user.update(user_data)
-        return user
+        return self.user_repo.update(user_id, user_data)
 
     # -------------------------------
     # Amenity Methods
@@ -138,11 +162,7 @@ class HBnBFacade:
         Returns:
             Amenity or None: Updated amenity object or None if not found.
         """
-        amenity = self.get_amenity(amenity_id)
-        if not amenity:
-            return None
-        amenity.update(amenity_data)
-        return amenity
+        return self.amenity_repo.update(amenity_id, amenity_data)
 
     # -------------------------------
     # Place Methods
@@ -216,6 +236,47 @@ class HBnBFacade:
         """
         return self.place_repo.get_all()
 
+    def get_places_by_price(self, min_price=None, max_price=None):
+        """
+        Retrieves the places priced within a range, cheapest first.
+
+        Args:
+            min_price (float, optional): Lowest price, inclusive.
+            max_price (float, optional): Highest price, inclusive.
+
+        Returns:
+            list[Place]: Matching place objects.
+        """
+        return self.search_places(min_price, max_price)
+
+    def search_places(self, min_price=None, max_price=None, bbox=None, amenity_ids=None):
+        """
+        Retrieves the places matching every given filter, cheapest first.
+
+        The filters are answered together by the columnar index of the
+        place repository.
+
+        Args:
+            min_price (float, optional): Lowest price, inclusive.
+            max_price (float, optional): Highest price, inclusive.
+            bbox (tuple, optional): (south, west, north, east) in degrees.
+            amenity_ids (list[str], optional): Amenities a place must all have.
+
+        Returns:
+            list[Place]: Matching place objects.
+        """
+        criteria = {}
+        if min_price is not None or max_price is not None:
+            criteria['price'] = Range(min_price, max_price)
+        if bbox is not None:
+            south, west, north, east = bbox
+            criteria['latitude'] = Range(south, north)
+            criteria['longitude'] = Range(west, east)
+        if amenity_ids:
+            criteria['amenities'] = amenity_ids
+        places = self.place_repo.filter_by(**criteria)
+        return sorted(places, key=lambda place: (place.price, place.id))
+
     def update_place(self, place_id, place_data):
         """
         Updates an existing place.
@@ -238,7 +299,8 @@ class HBnBFacade:
         if "owner_id" in place_data:
             place_data.pop("owner_id")
 
-        # Si des amenities sont fournies : les mettre à jour aussi
+        # Si des amenities sont fournies : les valider avant toute modification
+        new_amenities = None
         if "amenities" in place_data:
             new_amenity_ids = place_data.pop("amenities")
             new_amenities = []
@@ -247,11 +309,13 @@ class HBnBFacade:
                 if not amenity:
                     raise ValueError(f"Amenity not found: {amenity_id}")
                 new_amenities.append(amenity)
-            place.amenities = new_amenities
-
-        # Mise à jour des autres champs
-        place.update(place_data)
 
+        # Mise à jour atomique des champs, puis des amenities
+        with self.place_repo.locked(place_id):
+            place = self.place_repo.update(place_id, place_data)
+            if place is not None and new_amenities is not None:
+                place.amenities = new_amenities
+                self.place_repo.reindex(place)
         return place
 
     # -------------------------------
@@ -299,7 +363,8 @@ class HBnBFacade:
         review = Review(text=text, rating=rating, user=user, place=place)
 
         # 7. Ajouter à la place
-        place.reviews.append(review)
+        with self.place_repo.locked(place_id):
+            place.reviews.append(review)
 
         # 8. Ajouter au repo
         self.review_repo.add(review)
@@ -338,7 +403,7 @@ class HBnBFacade:
         Returns:
             list[Review]: Reviews linked to the specified place.
         """
-        return [review for review in self.review_repo.get_all() if review.place.id == place_id]
+        return self.review_repo.filter_by(place_id=place_id)
 
     def update_review(self, review_id, review_data):
         """
@@ -360,8 +425,7 @@ class HBnBFacade:
         review_data.pop("place_id", None)
 
         # Mise à jour des champs valides
-        review.update(review_data)
-        return review
+        return self.review_repo.update(review_id, review_data)
 
     def delete_review(self, review_id):
         """
@@ -381,7 +445,9 @@ class HBnBFacade:
         self.review_repo.delete(review_id)
 
         # Retirer aussi la review de la place correspondante
-        if review.place and review in review.place.reviews:
-            review.place.reviews.remove(review)
+        if review.place:
+            with self.place_repo.locked(review.place.id):
+                if review in review.place.reviews:
+                    review.place.reviews.remove(review)
 
         return True
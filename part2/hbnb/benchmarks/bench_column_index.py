@@ -0,0 +1,102 @@
+"""
+Benchmark place filtering: object scan vs the columnar index.
+
+Fills an `InMemoryRepository` with N places spread over France, each
+with a few of 10 amenities, then times each query two ways:
+
+    scan     a Python loop over every place, checking its attributes
+             (the repository without index)
+    columns  `filter_by` answered by the `ColumnIndex` of the facade
+
+Both must return the same places.
+
+Usage (from part2/hbnb):
+    python -m benchmarks.bench_column_index [size ...]
+"""
+
+import random
+import sys
+import time
+import uuid
+from datetime import datetime
+
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.persistence.indexes import ColumnIndex, Range
+from app.persistence.repository import InMemoryRepository
+
+DEFAULT_SIZES = [100000, 1000000]
+REPEAT = 5
+
+
+def make_places(size, amenities):
+    """Build `size` places without validation, with reproducible values."""
+    rng = random.Random(42)
+    now = datetime.now()
+    for i in range(size):
+        place = Place.__new__(Place)
+        place.__setstate__({
+            'id': str(uuid.UUID(int=rng.getrandbits(128))), 'created_at': now, 'updated_at': now,
+            'title': f'Place {i}', 'description': '', 'price': round(rng.uniform(20.0, 500.0), 2),
+            'latitude': rng.uniform(42.0, 51.0), 'longitude': rng.uniform(-4.5, 8.0), 'owner': None,
+            'reviews': [], 'amenities': rng.sample(amenities, rng.randint(0, 4)),
+        })
+        yield place
+
+
+def queries(amenities):
+    """Yield (label, filter_by criteria)."""
+    wifi, pool = amenities[0].id, amenities[1].id
+    paris = {'latitude': Range(48.7, 49.0), 'longitude': Range(2.2, 2.5)}
+    yield 'price range', {'price': Range(100.0, 110.0)}
+    yield 'bbox', paris
+    yield 'amenities', {'amenities': [wifi, pool]}
+    yield 'all three', {'price': Range(high=200.0), 'amenities': [wifi], **paris}
+
+
+def scan(places, criteria):
+    """Filter `places` with a Python loop, as without index."""
+    price = criteria.get('price', Range())
+    latitude = criteria.get('latitude', Range())
+    longitude = criteria.get('longitude', Range())
+    required = set(criteria.get('amenities', ()))
+
+    def within(value, bounds):
+        return (bounds.low is None or value >= bounds.low) and (bounds.high is None or value <= bounds.high)
+
+    return [place for place in places
+            if within(place.price, price) and within(place.latitude, latitude)
+            and within(place.longitude, longitude)
+            and required.issubset(amenity.id for amenity in place.amenities)]
+
+
+def timed_ms(query):
+    """Return (mean milliseconds over REPEAT runs, result of the last run)."""
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        result = query()
+    return (time.perf_counter() - start) * 1000 / REPEAT, result
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    amenities = [Amenity(f'Amenity {i}') for i in range(10)]
+    print(f"{'places':>8} | {'query':>11} | {'matches':>7} | {'scan ms':>8} | {'columns ms':>10} | {'speedup':>7}")
+    for size in sizes:
+        repo = InMemoryRepository(indexes=[ColumnIndex(
+            {'price': (0.0, 1000.0), 'latitude': (-90.0, 90.0), 'longitude': (-180.0, 180.0)},
+            sets={'amenities': lambda place: [amenity.id for amenity in place.amenities]})])
+        for place in make_places(size, amenities):
+            repo.add(place)
+        places = repo.get_all()
+        for label, criteria in queries(amenities):
+            scan_ms, expected = timed_ms(lambda: scan(places, criteria))
+            column_ms, found = timed_ms(lambda: repo.filter_by(**criteria))
+            assert {place.id for place in found} == {place.id for place in expected}, label
+            print(f"{size:>8} | {label:>11} | {len(found):>7} | {scan_ms:>8.1f} | {column_ms:>10.1f} | "
+                  f"{scan_ms / column_ms:>6.1f}x")
+        del repo, places
+
+
+if __name__ == '__main__':
+    main()
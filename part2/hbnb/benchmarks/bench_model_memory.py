@@ -0,0 +1,87 @@
+"""
+Benchmark the memory held by each model instance: __dict__ vs __slots__.
+
+Builds N instances of every model twice and reports the Python heap
+(tracemalloc) per object:
+
+    dict     the previous layout: a plain class whose attributes live in
+             a __dict__, with two datetime objects per instance
+    slots    the current models: __slots__ and one shared epoch float
+             for created_at / updated_at until the first update
+
+Both layouts hold the same (distinct) strings, so the difference is the
+per-object overhead. Users are built without __init__ to skip the email
+deliverability check.
+
+Usage (from part2/hbnb):
+    python -m benchmarks.bench_model_memory [objects]
+"""
+
+import sys
+import tracemalloc
+import uuid
+from datetime import datetime
+
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.models.review import Review
+from app.models.user import User
+
+
+def fields(model, i, related):
+    """Return the attributes of the i-th instance of a model, in __init__ order."""
+    if model is User:
+        return {'first_name': f'First{i}', 'last_name': f'Last{i}', 'email': f'user{i}@mail.com',
+                'is_admin': False}
+    if model is Amenity:
+        return {'name': f'Amenity {i}'}
+    if model is Place:
+        return {'title': f'Place {i}', 'description': f'Description {i}', 'price': 100.0 + i,
+                'latitude': 45.0, 'longitude': 5.0, 'owner': related, 'reviews': [], 'amenities': []}
+    return {'text': f'Review {i}', 'rating': 4, 'user': related, 'place': related}
+
+
+def build(model, i, related, compact):
+    """Build one instance with the compact (slots) or the previous (dict) layout."""
+    if compact:
+        obj = model.__new__(model)
+        obj.__setstate__({'id': str(uuid.uuid4()), 'created_at': datetime.now(), **fields(model, i, related)})
+        obj._updated_at = obj._created_at
+        return obj
+    obj = DICT_MODELS[model]()
+    obj.id = str(uuid.uuid4())
+    obj.created_at = datetime.now()
+    obj.updated_at = datetime.now()
+    for attr, value in fields(model, i, related).items():
+        setattr(obj, attr, value)
+    return obj
+
+
+# Same class names, attributes in __dict__ as before the models used __slots__
+DICT_MODELS = {model: type(model.__name__, (), {}) for model in (User, Amenity, Place, Review)}
+
+
+def bytes_per_object(model, count, compact):
+    """Return the heap bytes held per instance."""
+    related = object()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    objects = [build(model, i, related, compact) for i in range(count)]
+    held = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    del objects
+    return held / count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    print(f"{count} objects per model, heap bytes per object")
+    print(f"{'model':>8} | {'dict':>6} | {'slots':>6} | {'saved':>6}")
+    for model in (User, Amenity, Place, Review):
+        before = bytes_per_object(model, count, compact=False)
+        after = bytes_per_object(model, count, compact=True)
+        print(f"{model.__name__:>8} | {before:>6.0f} | {after:>6.0f} | {1 - after / before:>6.0%}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Benchmark the recovery time of the persistent in-memory repository.
+
+For each size, N amenities are written (plus N / 10 updates and N / 20
+deletes) to a `PersistentInMemoryRepository`, then the script times a
+restart from the journal alone and from a compacted snapshot, and
+reports the size of the files on disk. Writes use sync="none" to keep
+the setup short; recovery does not depend on the sync mode.
+
+Usage (from part2/hbnb):
+    python -m benchmarks.bench_recovery [size ...]
+"""
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+from app.models.amenity import Amenity
+from app.persistence.indexes import HashIndex
+from app.persistence.repository import PersistentInMemoryRepository
+
+DEFAULT_SIZES = [10000, 100000, 1000000]
+
+
+def open_repo(directory):
+    return PersistentInMemoryRepository(Amenity, directory, 'amenities', indexes=[HashIndex('name')],
+                                        sync='none', snapshot_every=10 ** 9)
+
+
+def disk_usage(directory):
+    return sum(os.path.getsize(os.path.join(directory, name)) for name in os.listdir(directory))
+
+
+def timed_open(directory):
+    """Return (seconds to reopen, object count)."""
+    start = time.perf_counter()
+    repo = open_repo(directory)
+    elapsed = time.perf_counter() - start
+    count = len(repo.get_all())
+    repo.close()
+    return elapsed, count
+
+
+def run(size):
+    directory = tempfile.mkdtemp(prefix='hbnb-recovery-')
+    try:
+        repo = open_repo(directory)
+        ids = []
+        for i in range(size):
+            amenity = Amenity(f"Amenity {i}")
+            repo.add(amenity)
+            ids.append(amenity.id)
+        for i in range(0, size, 10):
+            repo.update(ids[i], {"name": f"Updated {i}"})
+        for i in range(0, size, 20):
+            repo.delete(ids[i])
+        repo.close()
+
+        journal_bytes = disk_usage(directory)
+        journal_s, count = timed_open(directory)
+
+        repo = open_repo(directory)
+        repo.compact()
+        repo.close()
+        snapshot_bytes = disk_usage(directory)
+        snapshot_s, _ = timed_open(directory)
+        return count, journal_s, journal_bytes, snapshot_s, snapshot_bytes
+    finally:
+        shutil.rmtree(directory)
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    print(f"{'objects':>9} | {'journal (s)':>11} | {'journal MB':>10} | {'snapshot (s)':>12} | {'snapshot MB':>11}")
+    for size in sizes:
+        count, journal_s, journal_bytes, snapshot_s, snapshot_bytes = run(size)
+        print(f"{count:>9} | {journal_s:>11.2f} | {journal_bytes / 1e6:>10.1f} | "
+              f"{snapshot_s:>12.2f} | {snapshot_bytes / 1e6:>11.1f}")
+
+
+if __name__ == '__main__':
+    main()
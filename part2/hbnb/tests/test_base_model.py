@@ -0,0 +1,57 @@
+import copy
+import pickle
+import unittest
+from datetime import datetime, timezone
+from app.models.amenity import Amenity
+from app.models.base_model import BaseModel
+from app.models.place import Place
+
+
+class Tagged(BaseModel):
+    """Subclass without __slots__: extra attributes go to a __dict__."""
+
+    def __init__(self, tag):
+        super().__init__()
+        self.tag = tag
+
+
+class TestCompactBaseModel(unittest.TestCase):
+
+    def test_models_have_no_dict(self):
+        amenity = Amenity("WiFi")
+        self.assertFalse(hasattr(amenity, "__dict__"))
+        with self.assertRaises(AttributeError):
+            amenity.color = "blue"
+
+    def test_timestamps_are_exact_datetimes(self):
+        amenity = Amenity("WiFi")
+        self.assertIsInstance(amenity.created_at, datetime)
+        self.assertEqual(amenity.created_at, amenity.updated_at)
+        for value in (datetime(2024, 2, 29, 23, 59, 59, 999999), datetime(1969, 7, 20, 20, 17, 40, 1),
+                      datetime.min, datetime.max, datetime(2024, 1, 1, tzinfo=timezone.utc)):
+            amenity.updated_at = value
+            self.assertEqual(amenity.updated_at, value)
+            self.assertEqual(amenity.updated_at.tzinfo, value.tzinfo)
+        amenity.update({"name": "Pool"})
+        self.assertGreater(amenity.updated_at, amenity.created_at)
+
+    def test_state_copy_and_pickle(self):
+        place = Place("Flat", "Nice", 100.0, 45.0, 5.0, owner=None)
+        state = place.__getstate__()
+        self.assertEqual(list(state)[:3], ["id", "created_at", "updated_at"])
+        self.assertEqual(state["title"], "Flat")
+        self.assertEqual(state["amenities"], [])
+        for clone in (copy.copy(place), pickle.loads(pickle.dumps(place))):
+            self.assertEqual(clone.__getstate__(), state)
+        self.assertIs(copy.copy(place).reviews, place.reviews)
+
+    def test_subclass_without_slots(self):
+        obj = Tagged("a")
+        state = obj.__getstate__()
+        self.assertEqual(state["tag"], "a")
+        clone = copy.copy(obj)
+        self.assertEqual((clone.id, clone.tag, clone.created_at), (obj.id, "a", obj.created_at))
+
+
+if __name__ == "__main__":
+    unittest.main()
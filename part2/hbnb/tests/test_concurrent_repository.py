@@ -0,0 +1,114 @@
+import sys
+import threading
+import unittest
+from app.models.base_model import BaseModel
+from app.persistence.indexes import HashIndex
+from app.persistence.repository import ConcurrentInMemoryRepository
+
+THREADS = 8
+
+
+class Counter(BaseModel):
+
+    def __init__(self, email, count=0):
+        super().__init__()
+        self.email = email
+        self.count = count
+
+    def update(self, data):
+        if "email" in data:
+            self.email = data["email"]
+        if "count" in data:
+            if not isinstance(data["count"], int) or data["count"] < 0:
+                raise ValueError("Invalid count")
+            self.count = data["count"]
+        self.save()
+
+
+def run_threads(target, *args):
+    threads = [threading.Thread(target=target, args=(i, *args)) for i in range(THREADS)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+class TestConcurrentRepository(unittest.TestCase):
+
+    def setUp(self):
+        # Switch threads as often as possible to expose races
+        self.interval = sys.getswitchinterval()
+        sys.setswitchinterval(1e-6)
+        self.repo = ConcurrentInMemoryRepository(indexes=[HashIndex('email', unique=True)], stripes=4)
+
+    def tearDown(self):
+        sys.setswitchinterval(self.interval)
+
+    def test_no_lost_updates(self):
+        counters = [Counter(f"c{i}@mail.com") for i in range(3)]
+        for counter in counters:
+            self.repo.add(counter)
+
+        def increment(thread_index):
+            for step in range(300):
+                counter_id = counters[(thread_index + step) % len(counters)].id
+                with self.repo.locked(counter_id):
+                    self.repo.update(counter_id, {"count": self.repo.get(counter_id).count + 1})
+
+        run_threads(increment)
+        self.assertEqual(sum(counter.count for counter in self.repo.get_all()), THREADS * 300)
+
+    def test_unique_index_under_contention(self):
+        errors = []
+
+        def add(thread_index):
+            for step in range(50):
+                try:
+                    self.repo.add(Counter(f"shared{step}@mail.com"))
+                except ValueError:
+                    errors.append(step)
+
+        run_threads(add)
+        self.assertEqual(len(self.repo.get_all()), 50)
+        self.assertEqual(len(errors), (THREADS - 1) * 50)
+        for step in range(50):
+            self.assertIsNotNone(self.repo.get_by_attribute('email', f"shared{step}@mail.com"))
+
+    def test_snapshots_while_writing(self):
+        sizes = []
+
+        def write_or_read(thread_index):
+            for step in range(200):
+                if thread_index % 2:
+                    counter = Counter(f"t{thread_index}-{step}@mail.com")
+                    self.repo.add(counter)
+                    self.repo.update(counter.id, {"email": f"u{thread_index}-{step}@mail.com"})
+                    if step % 3 == 0:
+                        self.repo.delete(counter.id)
+                else:
+                    sizes.append(len(self.repo.get_all()))
+
+        run_threads(write_or_read)
+        survivors = THREADS // 2 * (200 - len(range(0, 200, 3)))
+        self.assertEqual(len(self.repo.get_all()), survivors)
+        self.assertEqual(len(self.repo.filter_by()), survivors)
+        self.assertIsNone(self.repo.get_by_attribute('email', "t1-1@mail.com"))
+        self.assertIsNotNone(self.repo.get_by_attribute('email', "u1-1@mail.com"))
+        self.assertTrue(all(0 <= size <= THREADS // 2 * 200 for size in sizes))
+
+    def test_failed_update_leaves_object_unchanged(self):
+        counter = Counter("a@mail.com", count=5)
+        self.repo.add(counter)
+        self.repo.add(Counter("b@mail.com"))
+        updated_at = counter.updated_at
+
+        with self.assertRaises(ValueError):
+            self.repo.update(counter.id, {"email": "new@mail.com", "count": -1})
+        with self.assertRaises(ValueError):
+            self.repo.update(counter.id, {"email": "b@mail.com", "count": 6})
+        self.assertEqual((counter.email, counter.count, counter.updated_at), ("a@mail.com", 5, updated_at))
+        self.assertIs(self.repo.get_by_attribute('email', "a@mail.com"), counter)
+
+
+if __name__ == '__main__':
+    unittest.main()
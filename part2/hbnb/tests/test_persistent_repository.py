@@ -0,0 +1,125 @@
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from app.models.amenity import Amenity
+from app.models.base_model import BaseModel
+from app.models.user import User
+from app.persistence import journal
+from app.persistence.indexes import HashIndex
+from app.persistence.repository import PersistentInMemoryRepository
+from app.services.facade import HBnBFacade
+
+
+def make_user(email):
+    """Build a user without the email deliverability check (no network in tests)."""
+    user = User.__new__(User)
+    BaseModel.__init__(user)
+    user.first_name, user.last_name, user.email, user.is_admin = "Alice", "Smith", email, False
+    return user
+
+
+class TestPersistentRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def open(self, **options):
+        return PersistentInMemoryRepository(Amenity, self.directory, 'amenities',
+                                            indexes=[HashIndex('name', unique=True)], **options)
+
+    def test_state_survives_reopening(self):
+        repo = self.open()
+        wifi, pool, gym = Amenity("Wifi"), Amenity("Pool"), Amenity("Gym")
+        for amenity in (wifi, pool, gym):
+            repo.add(amenity)
+        repo.update(wifi.id, {"name": "Fiber"})
+        repo.delete(pool.id)
+        repo.close()
+
+        repo = self.open()
+        self.assertEqual(sorted(a.name for a in repo.get_all()), ["Fiber", "Gym"])
+        self.assertEqual(repo.get(wifi.id).updated_at, wifi.updated_at)
+        self.assertEqual(repo.get_by_attribute('name', "Gym").id, gym.id)
+        with self.assertRaises(ValueError):
+            repo.add(Amenity("Fiber"))
+
+    def test_compaction(self):
+        repo = self.open(snapshot_every=10 ** 6)
+        amenities = [Amenity(f"Amenity {i}") for i in range(20)]
+        for amenity in amenities:
+            repo.add(amenity)
+        repo.compact()
+        repo.update(amenities[0].id, {"name": "Renamed"})
+        repo.delete(amenities[1].id)
+        repo.close()
+
+        files = sorted(os.listdir(self.directory))
+        self.assertEqual(files, ["amenities.000002.log", "amenities.snapshot"])
+        repo = self.open()
+        self.assertEqual(len(repo.get_all()), 19)
+        self.assertEqual(repo.get(amenities[0].id).name, "Renamed")
+        # New writes go to a segment the snapshot does not cover
+        repo.add(Amenity("After"))
+        repo.compact()
+        repo.close()
+        self.assertEqual(len(self.open().get_all()), 20)
+
+    def test_torn_tail_is_truncated(self):
+        repo = self.open()
+        repo.add(Amenity("Wifi"))
+        repo.close()
+        segment = os.path.join(self.directory, "amenities.000001.log")
+        size = os.path.getsize(segment)
+        with open(segment, "ab") as log:
+            log.write(journal.encode_line({"op": "put", "obj": {"id": "x"}})[:-5])
+
+        repo = self.open()
+        self.assertEqual([a.name for a in repo.get_all()], ["Wifi"])
+        self.assertEqual(os.path.getsize(segment), size)
+        repo.add(Amenity("Pool"))
+        repo.close()
+        self.assertEqual(len(self.open().get_all()), 2)
+
+    def test_group_commit_shares_fsyncs(self):
+        repo = self.open()
+        with mock.patch.object(journal.os, "fsync", wraps=os.fsync) as fsync:
+            threads = [threading.Thread(target=lambda i=i: [repo.add(Amenity(f"A{i}-{n}")) for n in range(25)])
+                       for i in range(8)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+        self.assertEqual(len(repo.get_all()), 200)
+        self.assertLessEqual(fsync.call_count, 200)
+        repo.close()
+        self.assertEqual(len(self.open().get_all()), 200)
+
+    def test_facade_references_are_restored(self):
+        facade = HBnBFacade(data_dir=self.directory)
+        owner, guest = make_user("owner@mail.com"), make_user("guest@mail.com")
+        facade.user_repo.add(owner)
+        facade.user_repo.add(guest)
+        wifi = facade.create_amenity({"name": "Wifi"})
+        pool = facade.create_amenity({"name": "Pool"})
+        place = facade.create_place({"title": "Flat", "description": "", "price": 80, "latitude": 1.0,
+                                     "longitude": 2.0, "owner_id": owner.id, "amenities": [wifi.id]})
+        facade.update_place(place.id, {"amenities": [pool.id, wifi.id]})
+        facade.create_review({"text": "Great", "rating": 5, "user_id": guest.id, "place_id": place.id})
+
+        facade = HBnBFacade(data_dir=self.directory)
+        place = facade.get_place(place.id)
+        self.assertIs(place.owner, facade.get_user(owner.id))
+        self.assertEqual([a.name for a in place.amenities], ["Pool", "Wifi"])
+        self.assertEqual([r.text for r in place.reviews], ["Great"])
+        self.assertIs(place.reviews[0].user, facade.get_user_by_email("guest@mail.com"))
+        self.assertEqual(facade.get_places_by_price(max_price=100), [place])
+
+
+if __name__ == '__main__':
+    unittest.main()
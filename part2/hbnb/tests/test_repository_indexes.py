@@ -0,0 +1,128 @@
+import random
+import unittest
+from app.models.base_model import BaseModel
+from app.persistence.indexes import ColumnIndex, HashIndex, Range, SortedIndex
+from app.persistence.repository import InMemoryRepository
+
+
+class Item(BaseModel):
+
+    def __init__(self, email, owner_id, price):
+        super().__init__()
+        self.email = email
+        self.owner_id = owner_id
+        self.price = price
+
+
+class TestIndexedRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryRepository(indexes=[
+            HashIndex('email', unique=True), HashIndex('owner_id'), SortedIndex('price')])
+        self.items = [Item(f"user{i}@mail.com", f"owner{i % 2}", float(i * 10)) for i in range(6)]
+        for item in self.items:
+            self.repo.add(item)
+
+    def test_get_by_attribute_uses_indexes(self):
+        self.assertIs(self.repo.get_by_attribute('email', "user3@mail.com"), self.items[3])
+        self.assertIsNone(self.repo.get_by_attribute('email', "missing@mail.com"))
+        self.assertIs(self.repo.get_by_attribute('price', 20.0), self.items[2])
+
+    def test_filter_by(self):
+        self.assertEqual(self.repo.filter_by(owner_id="owner1"), self.items[1::2])
+        self.assertEqual(self.repo.filter_by(price=Range(15, 40)), self.items[2:5])
+        self.assertEqual(self.repo.filter_by(price=Range(high=20), owner_id="owner0"), [self.items[0], self.items[2]])
+        self.assertEqual(self.repo.filter_by(price=Range(25), email="user5@mail.com"), [self.items[5]])
+
+    def test_unique_index(self):
+        with self.assertRaises(ValueError):
+            self.repo.add(Item("user0@mail.com", "owner0", 1.0))
+        with self.assertRaises(ValueError):
+            self.repo.update(self.items[1].id, {"email": "user0@mail.com"})
+        self.assertEqual(self.items[1].email, "user1@mail.com")
+        self.assertEqual(len(self.repo.get_all()), 6)
+
+    def test_update_and_delete_maintain_indexes(self):
+        self.repo.update(self.items[0].id, {"email": "new@mail.com", "price": 100.0})
+        self.assertIsNone(self.repo.get_by_attribute('email', "user0@mail.com"))
+        self.assertIs(self.repo.get_by_attribute('email', "new@mail.com"), self.items[0])
+        self.assertEqual(self.repo.filter_by(price=Range(60)), [self.items[0]])
+
+        self.repo.delete(self.items[1].id)
+        self.assertEqual(self.repo.filter_by(owner_id="owner1"), [self.items[3], self.items[5]])
+        self.assertIsNone(self.repo.get_by_attribute('email', "user1@mail.com"))
+
+
+class Spot(BaseModel):
+
+    def __init__(self, price, latitude, longitude, tags=()):
+        super().__init__()
+        self.price = price
+        self.latitude = latitude
+        self.longitude = longitude
+        self.tags = list(tags)
+
+
+class TestColumnIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryRepository(indexes=[
+            ColumnIndex({'price': (0, 100), 'latitude': (-90, 90), 'longitude': (-180, 180)}, sets={'tags': None})])
+        self.spots = [
+            Spot(10.0, 48.85, 2.35, ["wifi", "pool"]),
+            Spot(50.0, 48.80, 2.12, ["wifi"]),
+            Spot(95.0, 45.76, 4.83, ["pool"]),
+            Spot(500.0, 48.86, 2.34, ["wifi", "pool"]),
+            Spot(-5.0, -33.86, 151.2),
+        ]
+        for spot in self.spots:
+            self.repo.add(spot)
+
+    def test_ranges_boxes_and_sets(self):
+        paris = {'latitude': Range(48.7, 49.0), 'longitude': Range(2.2, 2.5)}
+        self.assertEqual(self.repo.filter_by(**paris), [self.spots[0], self.spots[3]])
+        self.assertEqual(self.repo.filter_by(price=Range(high=50)), [self.spots[0], self.spots[1], self.spots[4]])
+        self.assertEqual(self.repo.filter_by(price=Range(100)), [self.spots[3]])
+        self.assertEqual(self.repo.filter_by(price=95.0), [self.spots[2]])
+        self.assertEqual(self.repo.filter_by(tags=["wifi", "pool"]), [self.spots[0], self.spots[3]])
+        self.assertEqual(self.repo.filter_by(tags=["wifi", "pool"], price=Range(high=100), **paris), [self.spots[0]])
+        self.assertEqual(self.repo.filter_by(tags=["sauna"]), [])
+        self.assertIs(self.repo.get_by_attribute('price', 50.0), self.spots[1])
+
+    def test_update_delete_and_row_reuse(self):
+        self.repo.update(self.spots[0].id, {"price": 60.0})
+        self.spots[1].tags.append("pool")
+        self.repo.reindex(self.spots[1])
+        self.assertEqual(self.repo.filter_by(price=Range(55, 70)), [self.spots[0]])
+        self.assertEqual(self.repo.filter_by(tags=["pool", "wifi"]), self.spots[:2] + [self.spots[3]])
+
+        self.repo.delete(self.spots[0].id)
+        self.assertEqual(self.repo.filter_by(tags=["wifi"]), [self.spots[1], self.spots[3]])
+        spot = Spot(1.0, 0.0, 0.0, ["sauna"])
+        self.repo.add(spot)
+        self.assertEqual(self.repo.filter_by(tags=["sauna"]), [spot])
+        self.assertEqual(self.repo.filter_by(price=Range(high=5)), [spot, self.spots[4]])
+
+    def test_matches_object_scan(self):
+        rng = random.Random(7)
+        repo = InMemoryRepository(indexes=[
+            ColumnIndex({'price': (0, 100), 'latitude': (-90, 90), 'longitude': (-180, 180)}, sets={'tags': None})])
+        spots = [Spot(rng.uniform(-10, 150), rng.uniform(40, 50), rng.uniform(-5, 10),
+                      rng.sample(["a", "b", "c", "d"], rng.randint(0, 3))) for _ in range(2000)]
+        for spot in spots:
+            repo.add(spot)
+        for spot in spots[::3]:
+            repo.delete(spot.id)
+        live = {spot.id for spot in repo.get_all()}
+        for _ in range(50):
+            low = rng.uniform(-20, 150)
+            criteria = {'price': Range(low, low + rng.uniform(0, 60)),
+                        'latitude': Range(rng.uniform(40, 50), None), 'tags': rng.sample(["a", "b", "c"], 1)}
+            expected = {spot.id for spot in spots if spot.id in live
+                        and criteria['price'].low <= spot.price <= criteria['price'].high
+                        and spot.latitude >= criteria['latitude'].low and criteria['tags'][0] in spot.tags}
+            self.assertEqual({spot.id for spot in repo.filter_by(**criteria)}, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -23,7 +23,11 @@ from app.api.v1.auth import api as auth_ns
 from app.api.v1.admins import api as admins_ns
 
 from werkzeug.utils import import_string
-from app.extensions import db, bcrypt
+from app.extensions import db, bcrypt, hasher, json_encoder, compressor
+from app.hashing import HashingBusyError
+from app.persistence.cache import entity_cache
+from app.persistence.catalog import amenity_catalog
+from app.persistence.snapshot import place_snapshot
 from flask_jwt_extended import JWTManager
 
 jwt = JWTManager()
@@ -36,8 +40,13 @@ def create_app(config_class="config.DevelopmentConfig"):
     Sets up:
     - Flask-RESTX for API management
     - SQLAlchemy for ORM
-    - Bcrypt for password hashing
+    - Bcrypt for password hashing (run in a process pool by `hasher`)
     - JWTManager for authentication
+    - The JSON encoder of API responses (orjson when available)
+    - gzip / brotli compression of responses
+    - The read-through entity cache of the facade repositories
+    - The in-memory amenity catalogue
+    - The memory-mapped place snapshot, when one is configured
     - All registered API namespaces under /api/v1
 
     Args:
@@ -66,9 +75,20 @@ def create_app(config_class="config.DevelopmentConfig"):
               authorizations=authorizations,
               security='Bearer')
 
+    json_encoder.init_app(app, api)
+    compressor.init_app(app)
+    entity_cache.init_app(app)
+    amenity_catalog.init_app(app)
+    place_snapshot.init_app(app)
     bcrypt.init_app(app)
+    hasher.init_app(app)
     jwt.init_app(app)
 
+    @api.errorhandler(HashingBusyError)
+    def handle_hashing_busy(error):
+        """Shed load when the password hashing queue is full."""
+        return {'error': 'Server busy, please retry later'}, 503, {'Retry-After': '1'}
+
     # Register the users namespace
     api.add_namespace(users_ns, path='/api/v1/users')
     # Register the amenities namespace
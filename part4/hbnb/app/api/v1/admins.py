@@ -1,8 +1,15 @@
 from flask_restx import Namespace, Resource, fields
+from sqlalchemy.exc import IntegrityError
 from flask_jwt_extended import jwt_required, get_jwt_identity, get_jwt
 from app.services import facade
+from app.models.amenity import is_unique_violation
+from app.extensions import hasher
+from app.persistence.cache import entity_cache
 from flask import request
 from app.validators import is_valid_email
+from app.api.v1.batch import get_batch_payload, batch_response
+from app.api.v1.conditional import object_etag, precondition_failed
+from app.api.v1.places import place_detail_etag
 
 api = Namespace('admin', description='Admin operations')
 
@@ -42,6 +49,13 @@ review_admin_model = api.model('Review_Admin', {
     'rating': fields.Integer(required=False, description='Rating (optional)')
 })
 
+review_batch_admin_model = api.model('ReviewBatch_Admin', {
+    'text': fields.String(required=True, description='Content of the review'),
+    'rating': fields.Integer(required=True, description='Rating (1-5)'),
+    'user_id': fields.String(required=True, description='ID of the author'),
+    'place_id': fields.String(required=True, description='ID of the reviewed place')
+})
+
 
 @api.route('/users/')
 class AdminUserCreate(Resource):
@@ -122,10 +136,15 @@ class AdminUserModify(Resource):
         data = request.json
         email = data.get('email')
 
-        user = facade.get_user(user_id)
+        # The entity cache may be stale: check the precondition against the table
+        user = facade.get_user(user_id, fresh=bool(request.if_match))
         if not user:
             return {'error': 'User not found'}, 404
 
+        conflict = precondition_failed(object_etag(user))
+        if conflict:
+            return conflict
+
         # Ensure email uniqueness
         if email:
             existing_user = facade.get_user_by_email(email)
@@ -187,6 +206,11 @@ class AdminAmenityCreate(Resource):
             new_amenity = facade.create_amenity(data)
         except ValueError as e:
             return {'error': str(e)}, 400
+        except IntegrityError as e:
+            # Concurrent duplicate caught by the unique index on amenities.name
+            if not is_unique_violation(e, 'name'):
+                raise
+            return {'error': 'Amenity with this name already exists'}, 400
 
         return {
             'id': new_amenity.id,
@@ -223,10 +247,15 @@ class AdminAmenityModify(Resource):
         if not current_user.get('is_admin'):
             return {'error': 'Admin privileges required'}, 403
 
-        amenity = facade.get_amenity(amenity_id)
+        # The entity cache may be stale: check the precondition against the table
+        amenity = facade.get_amenity(amenity_id, fresh=bool(request.if_match))
         if not amenity:
             return {'error': 'Amenity not found'}, 404
 
+        conflict = precondition_failed(object_etag(amenity))
+        if conflict:
+            return conflict
+
         data = request.json
 
         # Logic to update an amenity
@@ -234,6 +263,11 @@ class AdminAmenityModify(Resource):
             amenity.update(data)
         except ValueError as e:
             return {'error': str(e)}, 400
+        except IntegrityError as e:
+            # Concurrent duplicate caught by the unique index on amenities.name
+            if not is_unique_violation(e, 'name'):
+                raise
+            return {'error': 'Amenity with this name already exists'}, 400
 
         return {
             'id': amenity.id,
@@ -271,7 +305,7 @@ class AdminPlaceModify(Resource):
         is_admin = current_user.get('is_admin', False)
         user_id = current_user.get('id')
 
-        place = facade.get_place(place_id)
+        place = facade.get_place(place_id, profile='detail' if request.if_match else None)
 
         if not place:
             return {'error': 'Place not found'}, 404
@@ -279,6 +313,12 @@ class AdminPlaceModify(Resource):
         if not is_admin and place.owner_id != user_id:
             return {'error': 'Unauthorized action'}, 403
 
+        # The detail ETag covers the owner, amenities and reviews: only build it when checked
+        if request.if_match:
+            conflict = precondition_failed(place_detail_etag(place))
+            if conflict:
+                return conflict
+
         data = request.json
 
         # Logic to update the place
@@ -289,6 +329,43 @@ class AdminPlaceModify(Resource):
 
         return {'message': 'Place updated successfully'}, 200
 
+@api.route('/reviews/batch')
+class AdminReviewBatch(Resource):
+    @api.expect([review_batch_admin_model])
+    @api.response(201, 'All reviews successfully created')
+    @api.response(207, 'Some reviews could not be created')
+    @api.response(400, 'Invalid batch')
+    @api.response(403, 'Admin privileges required')
+    @jwt_required()
+    def post(self):
+        """
+        Import many reviews at once (admin only).
+        ---
+        description: >
+            Creates a list of reviews on behalf of their authors in a single
+            transaction. Returns one result per item, in order, with the new
+            review ID or the reason it was rejected.
+        responses:
+            201:
+                description: All reviews successfully created
+            207:
+                description: Some reviews could not be created
+            400:
+                description: Invalid batch
+            403:
+                description: Admin privileges required
+        """
+        current_user = get_jwt_identity()
+        if not current_user.get('is_admin'):
+            return {'error': 'Admin privileges required'}, 403
+
+        try:
+            reviews_data = get_batch_payload()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        return batch_response(facade.create_reviews_bulk(reviews_data))
+
 @api.route('/reviews/<review_id>')
 class AdminReviewModify(Resource):
     @api.expect(review_admin_model, validate=True)
@@ -326,6 +403,10 @@ class AdminReviewModify(Resource):
         if not is_admin and review.user.id != user_id:
             return {'error': 'Unauthorized action'}, 403
 
+        conflict = precondition_failed(object_etag(review))
+        if conflict:
+            return conflict
+
         data = request.json
 
         try:
@@ -372,3 +453,53 @@ class AdminReviewModify(Resource):
             return {'error': 'Deletion failed'}, 400
 
         return {'message': 'Review deleted successfully'}, 200
+
+
+@api.route('/metrics/hashing')
+class AdminHashingMetrics(Resource):
+    @api.response(200, 'Hashing metrics retrieved successfully')
+    @api.response(403, 'Admin privileges required')
+    @jwt_required()
+    def get(self):
+        """
+        Retrieve password hashing queue metrics (admin only).
+        ---
+        description: >
+            Returns the size of the bcrypt worker pool, the number of
+            hashing jobs running or queued, and completed/rejected counters.
+        responses:
+            200:
+                description: Hashing metrics retrieved successfully
+            403:
+                description: Admin privileges required
+        """
+        current_user = get_jwt_identity()
+        if not current_user.get('is_admin'):
+            return {'error': 'Admin privileges required'}, 403
+
+        return hasher.stats(), 200
+
+
+@api.route('/metrics/cache')
+class AdminCacheMetrics(Resource):
+    @api.response(200, 'Cache metrics retrieved successfully')
+    @api.response(403, 'Admin privileges required')
+    @jwt_required()
+    def get(self):
+        """
+        Retrieve entity cache metrics (admin only).
+        ---
+        description: >
+            Returns the size of the read-through entity cache and its
+            hit, miss, eviction and expiration counters.
+        responses:
+            200:
+                description: Cache metrics retrieved successfully
+            403:
+                description: Admin privileges required
+        """
+        current_user = get_jwt_identity()
+        if not current_user.get('is_admin'):
+            return {'error': 'Admin privileges required'}, 403
+
+        return entity_cache.stats(), 200
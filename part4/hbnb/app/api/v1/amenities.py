@@ -1,5 +1,13 @@
 from flask_restx import Namespace, Resource, fields
+from flask import request
+from sqlalchemy.exc import IntegrityError
 from app.services import facade
+from app.models.amenity import is_unique_violation
+from app.api.v1.pagination import get_page_args, page_response
+from app.api.v1.batch import get_batch_payload, batch_response
+from app.api.v1.conditional import (
+    collection_etag, etag_header, not_modified, not_modified_response, object_etag, precondition_failed
+)
 
 api = Namespace('amenities', description='Amenity operations')
 
@@ -38,6 +46,11 @@ class AmenityList(Resource):
             new_amenity = facade.create_amenity(amenity_data)
         except ValueError as e:
             return {'error': str(e)}, 400
+        except IntegrityError as e:
+            # Concurrent duplicate caught by the unique index on amenities.name
+            if not is_unique_violation(e, 'name'):
+                raise
+            return {'error': 'Amenity with this name already exists'}, 400
 
         return {
             'id': new_amenity.id,
@@ -52,18 +65,75 @@ class AmenityList(Resource):
         tags:
           - Amenities
         description: >
-            Returns a list of all registered amenities.
+            Returns one page of registered amenities.
+        parameters:
+          - in: query
+            name: limit
+            type: integer
+            description: Maximum number of amenities to return (all when limit and after are omitted)
+          - in: query
+            name: after
+            type: string
+            description: Cursor of the next page (X-Next-Cursor header)
         responses:
             200:
                 description: List of amenities retrieved successfully
         """
-        amenities = facade.get_all_amenities()
-        return [
+        etag = collection_etag(*facade.get_collection_state('amenities'))
+        if not_modified(etag):
+            return not_modified_response(etag)
+        try:
+            limit, after = get_page_args()
+            amenities, next_cursor = facade.get_amenities_page(limit, after)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return page_response([
             {
                 'id': a.id,
                 'name': a.name
             } for a in amenities
-        ], 200
+        ], next_cursor, etag)
+
+
+@api.route('/batch')
+class AmenityBatch(Resource):
+    """
+    Bulk creation of amenities.
+    """
+    @api.expect([amenity_model])
+    @api.response(201, 'All amenities successfully created')
+    @api.response(207, 'Some amenities could not be created')
+    @api.response(400, 'Invalid batch')
+    def post(self):
+        """
+        Create many amenities at once.
+        ---
+        tags:
+          - Amenities
+        description: >
+            Registers a list of amenities in a single transaction. Returns
+            one result per item, in order, with the new amenity ID or the
+            reason it was rejected (missing, invalid or duplicate name).
+        responses:
+            201:
+                description: All amenities successfully created
+            207:
+                description: Some amenities could not be created
+            400:
+                description: Invalid batch
+        """
+        try:
+            amenities_data = get_batch_payload()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        try:
+            return batch_response(facade.create_amenities_bulk(amenities_data))
+        except IntegrityError as e:
+            # A name was taken concurrently: the whole batch was rolled back
+            if not is_unique_violation(e, 'name'):
+                raise
+            return {'error': 'Amenity with this name already exists'}, 400
 
 
 @api.route('/<amenity_id>')
@@ -96,10 +166,13 @@ class AmenityResource(Resource):
         amenity = facade.get_amenity(amenity_id)
         if not amenity:
             return {'error': 'Amenity not found'}, 404
+        etag = object_etag(amenity)
+        if not_modified(etag):
+            return not_modified_response(etag)
         return {
             'id': amenity.id,
             'name': amenity.name
-        }, 200
+        }, 200, etag_header(etag)
 
     @api.expect(amenity_model, validate=True)
     @api.response(200, 'Amenity updated successfully')
@@ -127,10 +200,16 @@ class AmenityResource(Resource):
                 description: Invalid name or missing field
             404:
                 description: Amenity not found
+            412:
+                description: Amenity modified since the If-Match ETag
         """
-        amenity = facade.get_amenity(amenity_id)
+        # The entity cache may be stale: check the precondition against the table
+        amenity = facade.get_amenity(amenity_id, fresh=bool(request.if_match))
         if not amenity:
             return {'error': 'Amenity not found'}, 404
+        conflict = precondition_failed(object_etag(amenity))
+        if conflict:
+            return conflict
 
         amenity_data = api.payload
 
@@ -138,8 +217,13 @@ class AmenityResource(Resource):
             amenity.update(amenity_data)
         except ValueError as e:
             return {'error': str(e)}, 400
+        except IntegrityError as e:
+            # Concurrent duplicate caught by the unique index on amenities.name
+            if not is_unique_violation(e, 'name'):
+                raise
+            return {'error': 'Amenity with this name already exists'}, 400
 
         return {
             'id': amenity.id,
             'name': amenity.name
-        }, 200
+        }, 200, etag_header(object_etag(amenity))
@@ -36,13 +36,20 @@ class Login(Resource):
         """
         credentials = api.payload  # Get the email and password from the request payload
 
-        # Step 1: Retrieve the user based on the provided email
-        user = facade.get_user_by_email(credentials['email'])
+        # Step 1: Retrieve the user based on the provided email, from the
+        # database: a cached row may hold a password hash changed since
+        user = facade.get_user_by_email(credentials['email'], fresh=True)
 
         # Step 2: Check if the user exists and the password is correct
         if not user or not user.verify_password(credentials['password']):
             return {'error': 'Invalid credentials'}, 401
 
+        # Step 2b: Upgrade hashes made with a lower bcrypt cost, now that
+        # the plain-text password is known to be correct
+        if user.password_needs_rehash():
+            user.hash_password(credentials['password'])
+            user.save()
+
         # Step 3: Create a JWT token with the user's id and is_admin flag
         access_token = create_access_token(identity={'id': str(user.id), 'is_admin': user.is_admin})
 
@@ -0,0 +1,53 @@
+"""
+Shared helpers for the bulk creation (/batch) endpoints.
+
+A batch is a JSON list of objects, each shaped like the body of the
+matching single-item POST. Items are validated and created together in
+one transaction; the response lists one result per item, in order,
+holding either the new `id` or an `error`.
+"""
+
+from flask import current_app, request
+
+
+def get_batch_payload():
+    """
+    Read and validate the list of items posted to a batch endpoint.
+
+    Returns:
+        list[dict]: The items of the batch.
+
+    Raises:
+        ValueError: If the body is not a non-empty list of objects or
+            exceeds BATCH_SIZE_MAX items.
+    """
+    items = request.get_json(silent=True)
+    if not isinstance(items, list) or not items:
+        raise ValueError("Request body must be a non-empty list")
+    if not all(isinstance(item, dict) for item in items):
+        raise ValueError("Every batch item must be an object")
+    if len(items) > current_app.config['BATCH_SIZE_MAX']:
+        raise ValueError(f"A batch holds at most {current_app.config['BATCH_SIZE_MAX']} items")
+    return items
+
+
+def batch_response(results):
+    """
+    Build a Flask-RESTX response tuple for the results of a batch.
+
+    The status is 201 when every item was created, 207 (Multi-Status)
+    otherwise.
+
+    Args:
+        results (list[dict]): Per-item results returned by the facade.
+
+    Returns:
+        tuple: (body, status).
+    """
+    failed = sum(1 for result in results if 'error' in result)
+    body = {
+        'created': len(results) - failed,
+        'failed': failed,
+        'results': results
+    }
+    return body, 201 if not failed else 207
@@ -0,0 +1,89 @@
+"""
+Shared helpers for conditional requests.
+
+Item responses carry a strong ETag derived from the `(id, updated_at)`
+of the objects they are built from; collection responses from the row
+count and latest `updated_at` of the table, plus the query string.
+Clients send it back:
+
+- in `If-None-Match` on GET: if it still matches, the resource answers
+  304 Not Modified before serializing anything;
+- in `If-Match` on PUT: if the object changed meanwhile, the update is
+  refused with 412 Precondition Failed (optimistic concurrency).
+
+Compressed responses carry the ETag with a coding suffix (see
+app.compression); the suffix is stripped before comparing, so a tag
+received with any coding validates the same data. If-None-Match uses
+the weak comparison, If-Match the strong one (RFC 9110): a weak tag
+never satisfies If-Match.
+"""
+
+import hashlib
+from flask import Response, request
+from app.compression import strip_encoding
+
+
+def _digest(parts):
+    return hashlib.sha1('\n'.join(parts).encode('utf-8')).hexdigest()
+
+
+def object_etag(*objs):
+    """
+    Return the ETag of a response built from `objs`.
+
+    Args:
+        *objs: Models (with `id` and `updated_at`) the body depends on,
+            in any order.
+
+    Returns:
+        str: The unquoted ETag.
+    """
+    return _digest(sorted(f'{obj.id}@{obj.updated_at}' for obj in objs))
+
+
+def collection_etag(count, last_update):
+    """
+    Return the ETag of a collection response.
+
+    Args:
+        count (int): Number of rows of the collection.
+        last_update (datetime): Latest `updated_at` of the collection.
+
+    Returns:
+        str: The unquoted ETag, specific to the request query string.
+    """
+    return _digest([str(count), str(last_update), request.full_path])
+
+
+def etag_header(etag):
+    """Return the response headers advertising `etag`."""
+    return {'ETag': f'"{etag}"'}
+
+
+def _matches(tags, etag, include_weak):
+    """Return True if the parsed ETags header `tags` lists `etag`, whatever its coding."""
+    return tags.star_tag or etag in {strip_encoding(tag) for tag in tags.as_set(include_weak)}
+
+
+def not_modified(etag):
+    """Return True if the client copy (If-None-Match) is still current."""
+    return _matches(request.if_none_match, etag, include_weak=True)
+
+
+def not_modified_response(etag):
+    """Return an empty 304 Not Modified response."""
+    return Response(status=304, headers=etag_header(etag))
+
+
+def precondition_failed(etag):
+    """
+    Check the If-Match header of a write request.
+
+    Returns:
+        tuple or None: A 412 response tuple if the client sent an ETag
+        that no longer matches, None otherwise.
+    """
+    # Strong comparison: weak tags never match
+    if request.if_match and not _matches(request.if_match, etag, include_weak=False):
+        return {'error': 'Resource was modified, fetch it again'}, 412, etag_header(etag)
+    return None
@@ -0,0 +1,61 @@
+"""
+Shared helpers for cursor-paginated collection endpoints.
+
+List resources read `limit` and `after` from the query string and return
+one page of results. Pagination is opt-in: without `limit` or `after`
+the whole collection is returned, as before pagination existed. The cursor of the next page is exposed in the
+`X-Next-Cursor` header and as a `Link: <...>; rel="next"` header, so the
+response body stays a plain JSON list.
+"""
+
+from urllib.parse import urlencode
+from flask import current_app, request
+
+
+def get_page_args():
+    """
+    Read and validate the pagination query parameters.
+
+    Returns:
+        tuple: (limit, after) where `after` is None for the first page,
+        and `limit` is None (no limit) when neither was sent.
+
+    Raises:
+        ValueError: If `limit` is not a positive integer.
+    """
+    limit = request.args.get('limit')
+    after = request.args.get('after') or None
+    if limit is None:
+        if after is None:
+            return None, None
+        limit = current_app.config['PAGE_SIZE_DEFAULT']
+    else:
+        try:
+            limit = int(limit)
+        except ValueError:
+            raise ValueError("limit must be a positive integer")
+        if limit <= 0:
+            raise ValueError("limit must be a positive integer")
+    limit = min(limit, current_app.config['PAGE_SIZE_MAX'])
+    return limit, after
+
+
+def page_response(items, next_cursor, etag=None):
+    """
+    Build a Flask-RESTX response tuple for one page of results.
+
+    Args:
+        items (list): Serialized objects of the page.
+        next_cursor (str or None): Cursor of the next page.
+        etag (str, optional): Collection ETag to advertise.
+
+    Returns:
+        tuple: (body, status, headers).
+    """
+    headers = {'ETag': f'"{etag}"'} if etag else {}
+    if next_cursor:
+        args = request.args.to_dict()
+        args['after'] = next_cursor
+        headers['X-Next-Cursor'] = next_cursor
+        headers['Link'] = f'<{request.base_url}?{urlencode(args)}>; rel="next"'
+    return items, 200, headers
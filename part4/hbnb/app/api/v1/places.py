@@ -1,5 +1,13 @@
 from flask_restx import Namespace, Resource, fields
 from app.services import facade
+from app.api.v1.pagination import get_page_args, page_response
+from app.api.v1.batch import get_batch_payload, batch_response
+from app.api.v1.streaming import ndjson_response, stream_batch_size, wants_stream
+from app.api.v1.conditional import (
+    collection_etag, etag_header, not_modified, not_modified_response, object_etag, precondition_failed
+)
+from app.geo import parse_bbox, parse_point
+from flask import request
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 api = Namespace('places', description='Place operations')
@@ -37,6 +45,10 @@ place_input_model = api.model('PlaceInput', {
     'longitude': fields.Float(required=True, description='Longitude of the place')
 })
 
+place_batch_item_model = api.inherit('PlaceBatchItem', place_input_model, {
+    'amenities': fields.List(fields.String, description="List of amenities ID's")
+})
+
 # --------------------------------------------
 # Output model (GET)
 # --------------------------------------------
@@ -53,6 +65,54 @@ place_model = api.model('Place', {
 })
 
 
+def get_place_filters():
+    """
+    Read the min_price / max_price / min_rating / amenities query arguments.
+
+    Returns:
+        dict: Filters accepted by the facade place listing methods.
+
+    Raises:
+        ValueError: If a price or rating is not a non-negative number.
+    """
+    filters = {}
+    for name in ('min_price', 'max_price', 'min_rating'):
+        value = request.args.get(name)
+        if value is None or value == '':
+            continue
+        try:
+            filters[name] = float(value)
+        except ValueError:
+            raise ValueError(f"{name} must be a number")
+        if filters[name] < 0:
+            raise ValueError(f"{name} must be a number")
+    amenities = request.args.get('amenities')
+    if amenities:
+        filters['amenity_ids'] = [a for a in amenities.split(',') if a]
+    return filters
+
+
+def place_summary(place):
+    """Serialize a place for the list endpoints (owner ID only)."""
+    return {
+        'id': place.id,
+        'title': place.title,
+        'description': place.description,
+        'price': place.price,
+        'latitude': place.latitude,
+        'longitude': place.longitude,
+        'owner_id': place.owner_id,
+        'review_count': place.review_count,
+        'average_rating': place.average_rating
+    }
+
+
+def place_detail_etag(place):
+    """Return the ETag of the detail view, which also shows the owner, amenities and reviews."""
+    return object_etag(place, place.owner, *place.amenities,
+                       *place.reviews, *{review.user for review in place.reviews})
+
+
 @api.route('/')
 class PlaceList(Resource):
     """
@@ -105,23 +165,172 @@ class PlaceList(Resource):
         tags:
           - Places
         description: >
-            Retrieves a list of all places with owner ID only.
+            Retrieves one page of places with owner ID only.
+            With `min_price` or `max_price`, places are listed by price,
+            cheapest first.
+            With `bbox` or `near` + `radius_km`, only places in that area
+            are returned, nearest first, with their `distance_km`.
+            With `Accept: application/x-ndjson` or `stream=1`, every
+            matching place is streamed as newline-delimited JSON instead.
+        parameters:
+          - in: query
+            name: min_price
+            type: number
+            description: Lowest price per night
+          - in: query
+            name: max_price
+            type: number
+            description: Highest price per night
+          - in: query
+            name: amenities
+            type: string
+            description: Comma-separated amenity IDs the place must all have
+          - in: query
+            name: min_rating
+            type: number
+            description: Lowest average review rating
+          - in: query
+            name: bbox
+            type: string
+            description: Bounding box as min_lng,min_lat,max_lng,max_lat
+          - in: query
+            name: near
+            type: string
+            description: Search center as lat,lng (requires radius_km)
+          - in: query
+            name: radius_km
+            type: number
+            description: Search radius around near, in kilometers
+          - in: query
+            name: limit
+            type: integer
+            description: Maximum number of places to return (all when limit and after are omitted)
+          - in: query
+            name: after
+            type: string
+            description: Cursor of the next page (X-Next-Cursor header)
+          - in: query
+            name: stream
+            type: integer
+            description: 1 to stream all places as NDJSON
         responses:
             200:
                 description: List of places retrieved successfully
         """
-        places = facade.get_all_places()
-        return [
-            {
-                'id': p.id,
-                'title': p.title,
-                'description': p.description,
-                'price': p.price,
-                'latitude': p.latitude,
-                'longitude': p.longitude,
-                'owner_id': p.owner.id
-            } for p in places
-        ], 200
+        try:
+            filters = get_place_filters()
+            if wants_stream():
+                if 'bbox' in request.args or 'near' in request.args:
+                    raise ValueError("Streaming is not supported with bbox or near")
+                return ndjson_response(facade.stream_places(stream_batch_size(), **filters), place_summary)
+            etag = collection_etag(*facade.get_collection_state('places'))
+            if not_modified(etag):
+                return not_modified_response(etag)
+            limit, after = get_page_args()
+            if 'bbox' in request.args or 'near' in request.args:
+                return self.search(limit, after, filters, etag)
+            places, next_cursor = facade.get_places_page(limit, after, **filters)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return page_response([place_summary(p) for p in places], next_cursor, etag)
+
+    def search(self, limit, after, filters, etag=None):
+        """
+        Run a location search from the bbox / near / radius_km query arguments.
+
+        Raises:
+            ValueError: If the query arguments are invalid.
+        """
+        bbox = request.args.get('bbox')
+        near = request.args.get('near')
+        radius_km = request.args.get('radius_km')
+        if radius_km is not None:
+            try:
+                radius_km = float(radius_km)
+            except ValueError:
+                raise ValueError("radius_km must be a positive number")
+
+        results, next_cursor = facade.search_places(
+            limit, after,
+            bbox=parse_bbox(bbox) if bbox else None,
+            near=parse_point(near) if near else None,
+            radius_km=radius_km,
+            **filters
+        )
+        return page_response([
+            dict(place_summary(p), distance_km=round(distance, 3))
+            for p, distance in results
+        ], next_cursor, etag)
+
+
+@api.route('/batch')
+class PlaceBatch(Resource):
+    """
+    Bulk creation of places owned by the current user.
+    """
+    @api.expect([place_batch_item_model])
+    @api.response(201, 'All places successfully created')
+    @api.response(207, 'Some places could not be created')
+    @api.response(400, 'Invalid batch')
+    @jwt_required()
+    def post(self):
+        """
+        Create many places at once.
+        ---
+        tags:
+          - Places
+        description: >
+            Creates a list of places owned by the current user in a single
+            transaction. Returns one result per item, in order, with the
+            new place ID or the reason it was rejected.
+        responses:
+            201:
+                description: All places successfully created
+            207:
+                description: Some places could not be created
+            400:
+                description: Invalid batch
+        """
+        current_user = get_jwt_identity()
+        try:
+            places_data = get_batch_payload()
+        except ValueError as e:
+            return {'error': str(e)}, 400
+
+        for place_data in places_data:
+            place_data['owner_id'] = current_user['id']
+
+        return batch_response(facade.create_places_bulk(places_data))
+
+
+@api.route('/facets')
+class PlaceFacets(Resource):
+    """
+    Amenity counts of the places matching the listing filters.
+    """
+    @api.response(200, 'Amenity counts retrieved successfully')
+    @api.response(400, 'Invalid filters')
+    def get(self):
+        """
+        Count the matching places that have each amenity.
+        ---
+        tags:
+          - Places
+        description: >
+            Takes the same min_price, max_price, min_rating and amenities
+            filters as the place listing, and returns every amenity with
+            the number of matching places that have it.
+        responses:
+            200:
+                description: Amenity counts retrieved successfully
+            400:
+                description: Invalid filters
+        """
+        try:
+            facets = facade.get_amenity_facets(**get_place_filters())
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return [{'id': amenity.id, 'name': amenity.name, 'count': count} for amenity, count in facets], 200
 
 
 @api.route('/<place_id>')
@@ -152,9 +361,12 @@ class PlaceResource(Resource):
             404:
                 description: Place not found
         """
-        place = facade.get_place(place_id)
+        place = facade.get_place(place_id, profile='detail')
         if not place:
             return {'error': 'Place not found'}, 404
+        etag = place_detail_etag(place)
+        if not_modified(etag):
+            return not_modified_response(etag)
         return {
             'id': place.id,
             'title': place.title,
@@ -162,6 +374,8 @@ class PlaceResource(Resource):
             'price': place.price,
             'latitude': place.latitude,
             'longitude': place.longitude,
+            'review_count': place.review_count,
+            'average_rating': place.average_rating,
             'owner': {
                 'id': place.owner.id,
                 'first_name': place.owner.first_name,
@@ -182,7 +396,7 @@ class PlaceResource(Resource):
                     }
                 } for r in place.reviews
             ]
-        }, 200
+        }, 200, etag_header(etag)
 
     @api.expect(place_input_model, validate=True)
     @api.response(200, 'Place updated successfully')
@@ -215,14 +429,23 @@ class PlaceResource(Resource):
                 description: Unauthorized action
             404:
                 description: Place not found
+            412:
+                description: Place modified since the If-Match ETag
         """
         current_user = get_jwt_identity()
-        place = facade.get_place(place_id)
+        # Load what the detail ETag covers only when the client sent one
+        place = facade.get_place(place_id, profile='detail' if request.if_match else None)
         if not place:
             return {'error': 'Place not found'}, 404
-        if place.owner.id != current_user['id']:
+        if place.owner_id != current_user['id']:
             return {'error': 'Unauthorized action'}, 403
 
+        # The detail ETag covers the owner, amenities and reviews: only build it when checked
+        if request.if_match:
+            conflict = precondition_failed(place_detail_etag(place))
+            if conflict:
+                return conflict
+
         place_data = api.payload
         try:
             facade.update_place(place_id, place_data)
@@ -1,5 +1,11 @@
 from flask_restx import Namespace, Resource, fields
+from sqlalchemy.exc import IntegrityError
 from app.services import facade
+from app.api.v1.pagination import get_page_args, page_response
+from app.api.v1.streaming import ndjson_response, stream_batch_size, wants_stream
+from app.api.v1.conditional import (
+    collection_etag, etag_header, not_modified, not_modified_response, object_etag, precondition_failed
+)
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 api = Namespace('reviews', description='Review operations')
@@ -21,6 +27,17 @@ review_model = api.model('Review', {
 })
 
 
+def review_summary(review):
+    """Serialize a review for the list endpoint, with user and place IDs."""
+    return {
+        'id': review.id,
+        'text': review.text,
+        'rating': review.rating,
+        'user_id': review.user_id,
+        'place_id': review.place_id
+    }
+
+
 @api.route('/')
 class ReviewList(Resource):
     @api.expect(review_input_model, validate=True)
@@ -57,14 +74,12 @@ class ReviewList(Resource):
             return {'error': 'Place not found'}, 404
 
         # Interdit de reviewer son propre lieu
-        if place.owner.id == current_user['id']:
+        if place.owner_id == current_user['id']:
             return {'error': 'You cannot review your own place.'}, 400
 
         # Vérifie si l'utilisateur a déjà review ce lieu
-        existing_reviews = facade.get_reviews_by_place(place_id)
-        for review in existing_reviews:
-            if review.user.id == current_user['id']:
-                return {'error': 'You have already reviewed this place.'}, 400
+        if facade.has_user_reviewed_place(current_user['id'], place_id):
+            return {'error': 'You have already reviewed this place.'}, 400
 
         # Remplace user_id par celui authentifié (évite la triche)
         review_data['user_id'] = current_user['id']
@@ -73,6 +88,9 @@ class ReviewList(Resource):
             new_review = facade.create_review(review_data)
         except ValueError as e:
             return {'error': str(e)}, 400
+        except IntegrityError:
+            # Concurrent duplicate caught by the (user_id, place_id) unique index
+            return {'error': 'You have already reviewed this place.'}, 400
         return {
             'id': new_review.id,
             'text': new_review.text,
@@ -92,21 +110,37 @@ class ReviewList(Resource):
         tags:
           - Reviews
         description: >
-            Returns a list of all reviews, with user and place IDs.
+            Returns one page of reviews, with user and place IDs, or streams
+            all of them as newline-delimited JSON with
+            `Accept: application/x-ndjson` or `stream=1`.
+        parameters:
+          - in: query
+            name: limit
+            type: integer
+            description: Maximum number of reviews to return (all when limit and after are omitted)
+          - in: query
+            name: after
+            type: string
+            description: Cursor of the next page (X-Next-Cursor header)
+          - in: query
+            name: stream
+            type: integer
+            description: 1 to stream all reviews as NDJSON
         responses:
             200:
                 description: List of reviews retrieved successfully
         """
-        reviews = facade.get_all_reviews()
-        return [
-            {
-                'id': r.id,
-                'text': r.text,
-                'rating': r.rating,
-                'user_id': r.user.id,
-                'place_id': r.place.id
-            } for r in reviews
-        ], 200
+        if wants_stream():
+            return ndjson_response(facade.stream_reviews(stream_batch_size()), review_summary)
+        etag = collection_etag(*facade.get_collection_state('reviews'))
+        if not_modified(etag):
+            return not_modified_response(etag)
+        try:
+            limit, after = get_page_args()
+            reviews, next_cursor = facade.get_reviews_page(limit, after)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return page_response([review_summary(r) for r in reviews], next_cursor, etag)
 
 
 @api.route('/<review_id>')
@@ -134,13 +168,10 @@ class ReviewResource(Resource):
         review = facade.get_review(review_id)
         if not review:
             api.abort(404, 'Review not found')
-        return {
-            'id': review.id,
-            'text': review.text,
-            'rating': review.rating,
-            'user_id': review.user.id,
-            'place_id': review.place.id
-        }, 200
+        etag = object_etag(review)
+        if not_modified(etag):
+            return not_modified_response(etag)
+        return review_summary(review), 200, etag_header(etag)
 
     @api.expect(review_input_model, validate=True)
     @api.response(200, 'Review updated successfully')
@@ -171,6 +202,8 @@ class ReviewResource(Resource):
                 description: Unauthorized action
             404:
                 description: Review not found
+            412:
+                description: Review modified since the If-Match ETag
         """
         current_user = get_jwt_identity()
         review_data = api.payload
@@ -184,12 +217,16 @@ class ReviewResource(Resource):
         if review.user.id != current_user['id']:
             return {'error': 'Unauthorized action.'}, 403
 
+        conflict = precondition_failed(object_etag(review))
+        if conflict:
+            return conflict
+
         try:
             updated_review = facade.update_review(review_id, review_data)
         except ValueError as e:
             return {'error': str(e)}, 400
 
-        return {'message': 'Review updated successfully'}, 200
+        return {'message': 'Review updated successfully'}, 200, etag_header(object_etag(updated_review))
 
     @api.response(200, 'Review deleted successfully')
     @api.response(404, 'Review not found')
@@ -248,6 +285,14 @@ class PlaceReviewList(Resource):
             required: true
             type: string
             description: The ID of the place
+          - in: query
+            name: limit
+            type: integer
+            description: Maximum number of reviews to return (all when limit and after are omitted)
+          - in: query
+            name: after
+            type: string
+            description: Cursor of the next page (X-Next-Cursor header)
         responses:
             200:
                 description: List of reviews for the place retrieved successfully
@@ -257,13 +302,18 @@ class PlaceReviewList(Resource):
         place = facade.get_place(place_id)
         if not place:
             return {'error': 'Place not found'}, 404
-        reviews = facade.get_reviews_by_place(place_id)
-        return [
+
+        try:
+            limit, after = get_page_args()
+            reviews, next_cursor = facade.get_reviews_by_place(place_id, limit, after)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return page_response([
             {
                 'id': r.id,
                 'text': r.text,
                 'rating': r.rating,
-                'user_id': r.user.id,
-                'place_id': r.place.id
+                'user_id': r.user_id,
+                'place_id': r.place_id
             } for r in reviews
-        ], 200
+        ], next_cursor)
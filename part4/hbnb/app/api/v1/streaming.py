@@ -0,0 +1,52 @@
+"""
+Shared helpers for streaming collection endpoints.
+
+List resources return one page of JSON by default. Clients exporting a
+whole collection can opt into streaming with `Accept: application/x-ndjson`
+or `?stream=1`: rows are then read from a database cursor in batches and
+written as newline-delimited JSON (one object per line) while the
+response is being sent, so memory use stays flat whatever the table size.
+"""
+
+from flask import Response, current_app, request, stream_with_context
+from app.extensions import json_encoder
+
+NDJSON_MIMETYPE = 'application/x-ndjson'
+
+
+def wants_stream():
+    """Return True if the client asked for a streamed NDJSON response."""
+    if request.args.get('stream', '').lower() in ('1', 'true'):
+        return True
+    return request.accept_mimetypes.best_match(['application/json', NDJSON_MIMETYPE]) == NDJSON_MIMETYPE
+
+
+def stream_batch_size():
+    """Return the number of rows fetched and written per chunk."""
+    return current_app.config['STREAM_BATCH_SIZE']
+
+
+def ndjson_response(rows, serialize):
+    """
+    Build a streamed NDJSON response.
+
+    Args:
+        rows (iterable): Objects to write, typically a repository `stream`.
+        serialize (callable): Turns one object into a JSON-serializable dict.
+
+    Returns:
+        Response: Chunked response writing one JSON object per line.
+    """
+    batch_size = stream_batch_size()
+
+    def generate():
+        lines = []
+        for row in rows:
+            lines.append(json_encoder.dumps(serialize(row)))
+            if len(lines) >= batch_size:
+                yield b'\n'.join(lines) + b'\n'
+                lines = []
+        if lines:
+            yield b'\n'.join(lines) + b'\n'
+
+    return Response(stream_with_context(generate()), mimetype=NDJSON_MIMETYPE)
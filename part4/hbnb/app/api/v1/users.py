@@ -1,5 +1,11 @@
 from flask_restx import Namespace, Resource, fields
+from flask import request
 from app.services import facade
+from app.api.v1.pagination import get_page_args, page_response
+from app.api.v1.streaming import ndjson_response, stream_batch_size, wants_stream
+from app.api.v1.conditional import (
+    collection_etag, etag_header, not_modified, not_modified_response, object_etag, precondition_failed
+)
 from flask_jwt_extended import jwt_required, get_jwt_identity
 
 api = Namespace('users', description='User operations')
@@ -17,6 +23,17 @@ user_update_model = api.model('UserUpdate', {
     'last_name': fields.String(required=True)
 })
 
+
+def user_summary(user):
+    """Serialize a user for the list endpoint."""
+    return {
+        'id': user.id,
+        'first_name': user.first_name,
+        'last_name': user.last_name,
+        'email': user.email
+    }
+
+
 @api.route('/')
 class UserList(Resource):
     @api.expect(user_model, validate=True)
@@ -66,20 +83,37 @@ class UserList(Resource):
         tags:
           - Users
         description: >
-            Returns a list of all registered users with their basic details.
+            Returns one page of registered users with their basic details,
+            or streams all of them as newline-delimited JSON with
+            `Accept: application/x-ndjson` or `stream=1`.
+        parameters:
+          - in: query
+            name: limit
+            type: integer
+            description: Maximum number of users to return (all when limit and after are omitted)
+          - in: query
+            name: after
+            type: string
+            description: Cursor of the next page (X-Next-Cursor header)
+          - in: query
+            name: stream
+            type: integer
+            description: 1 to stream all users as NDJSON
         responses:
             200:
                 description: List of users retrieved successfully
         """
-        users = facade.get_all_users()
-        return [
-            {
-                'id': u.id,
-                'first_name': u.first_name,
-                'last_name': u.last_name,
-                'email': u.email
-            } for u in users
-        ], 200
+        if wants_stream():
+            return ndjson_response(facade.stream_users(stream_batch_size()), user_summary)
+        etag = collection_etag(*facade.get_collection_state('users'))
+        if not_modified(etag):
+            return not_modified_response(etag)
+        try:
+            limit, after = get_page_args()
+            users, next_cursor = facade.get_users_page(limit, after)
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        return page_response([user_summary(u) for u in users], next_cursor, etag)
 
 
 @api.route('/<user_id>')
@@ -107,12 +141,10 @@ class UserResource(Resource):
         user = facade.get_user(user_id)
         if not user:
             return {'error': 'User not found'}, 404
-        return {
-            'id': user.id,
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-            'email': user.email
-        }, 200
+        etag = object_etag(user)
+        if not_modified(etag):
+            return not_modified_response(etag)
+        return user_summary(user), 200, etag_header(etag)
 
     @api.expect(user_update_model, validate=True)
     @api.response(200, 'User successfully updated')
@@ -144,17 +176,24 @@ class UserResource(Resource):
                 description: Unauthorized action
             404:
                 description: User not found
+            412:
+                description: User modified since the If-Match ETag
         """
         current_user = get_jwt_identity()
         user_data = api.payload
 
-        user = facade.get_user(user_id)
+        # The entity cache may be stale: check the precondition against the table
+        user = facade.get_user(user_id, fresh=bool(request.if_match))
         if not user:
             return {'error': 'User not found'}, 404
 
         if user.id != current_user['id']:
             return {'error': 'Unauthorized action.'}, 403
 
+        conflict = precondition_failed(object_etag(user))
+        if conflict:
+            return conflict
+
         if 'email' in user_data or 'password' in user_data:
             return {'error': 'You cannot modify email or password.'}, 400
         try:
@@ -162,9 +201,4 @@ class UserResource(Resource):
         except ValueError as e:
             return {'error': str(e)}, 400
 
-        return {
-            'id': user.id,
-            'first_name': user.first_name,
-            'last_name': user.last_name,
-            'email': user.email
-        }, 200
+        return user_summary(user), 200, etag_header(object_etag(user))
@@ -0,0 +1,200 @@
+"""
+Compression of HTTP responses.
+
+`Compressor` compresses response bodies after each request with gzip,
+or brotli when the `brotli` package is installed and the client prefers
+it, following the `Accept-Encoding` header. Bodies under
+`COMPRESS_MIN_SIZE` bytes and media types that are already compressed
+(images...) are sent as they are. Streamed responses (NDJSON exports)
+are compressed chunk by chunk, each chunk being flushed so the client
+still receives rows as they are produced.
+
+Compression changes the bytes of the body, so the ETag of a compressed
+response gets the coding as a suffix (`"<etag>-gzip"`, `"<etag>-br"`):
+it stays a strong validator, distinct for each representation, and
+conditional requests strip the suffix (`strip_encoding`) before
+comparing it.
+
+Configuration keys:
+    COMPRESS_ENABLED: Turn compression on or off.
+    COMPRESS_MIN_SIZE: Smallest body compressed, in bytes.
+    COMPRESS_LEVEL: gzip level (1-9).
+    COMPRESS_BROTLI_QUALITY: brotli quality (0-11).
+    COMPRESS_MIMETYPES: Media types worth compressing.
+"""
+
+import zlib
+from flask import request
+from werkzeug.http import remove_entity_headers
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+# gzip container, as opposed to raw deflate or zlib
+GZIP_WBITS = 16 + zlib.MAX_WBITS
+
+DEFAULT_MIMETYPES = (
+    'application/json',
+    'application/x-ndjson',
+    'application/javascript',
+    'text/html',
+    'text/css',
+    'text/javascript',
+    'text/plain',
+    'image/svg+xml',
+)
+
+
+def strip_encoding(etag):
+    """Return the ETag of the uncompressed response from the ETag of a compressed one."""
+    for encoding in ('gzip', 'br'):
+        if etag.endswith(f'-{encoding}'):
+            return etag[:-len(encoding) - 1]
+    return etag
+
+
+class _GzipStream:
+    """Incremental gzip compressor."""
+
+    def __init__(self, level):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, GZIP_WBITS)
+
+    def compress(self, data):
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self):
+        return self._compressor.flush(zlib.Z_FINISH)
+
+
+class _BrotliStream:
+    """Incremental brotli compressor."""
+
+    def __init__(self, quality):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def compress(self, data):
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self):
+        return self._compressor.finish()
+
+
+class Compressor:
+    """
+    Flask extension compressing responses according to Accept-Encoding.
+
+    Methods:
+        init_app(app): Register the after_request hook.
+        compress(response, encoding): Compress a response in place.
+    """
+
+    def __init__(self, app=None):
+        self.enabled = True
+        self.min_size = 500
+        self.level = 6
+        self.brotli_quality = 4
+        self.mimetypes = set(DEFAULT_MIMETYPES)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read the compression settings and register the after_request hook."""
+        self.enabled = app.config.get('COMPRESS_ENABLED', True)
+        self.min_size = app.config.get('COMPRESS_MIN_SIZE', 500)
+        self.level = app.config.get('COMPRESS_LEVEL', 6)
+        self.brotli_quality = app.config.get('COMPRESS_BROTLI_QUALITY', 4)
+        self.mimetypes = set(app.config.get('COMPRESS_MIMETYPES', DEFAULT_MIMETYPES))
+        app.after_request(self.after_request)
+        app.extensions['compressor'] = self
+
+    @staticmethod
+    def encodings():
+        """Return the supported content codings, preferred first."""
+        return ['br', 'gzip'] if brotli is not None else ['gzip']
+
+    def choose_encoding(self):
+        """Return the coding to use for the current request, or None."""
+        return request.accept_encodings.best_match(self.encodings())
+
+    def should_compress(self, response):
+        """Return True if `response` is worth compressing."""
+        # Nothing to compress in 204/304, and 206 bodies are byte ranges
+        if not (200 <= response.status_code < 300) or response.status_code in (204, 206):
+            return False
+        if 'Content-Encoding' in response.headers or response.mimetype not in self.mimetypes:
+            return False
+        if response.is_streamed and not response.direct_passthrough:
+            # Size unknown in advance: always compress
+            return True
+        length = response.calculate_content_length()
+        if length is None and response.direct_passthrough:
+            # Static files report their size in the Content-Length header
+            length = response.content_length
+        return length is not None and length >= self.min_size
+
+    def after_request(self, response):
+        """Compress the response if the client accepts it."""
+        if not self.enabled:
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = self.choose_encoding()
+        if encoding and self.should_compress(response):
+            etag, _ = response.get_etag()
+            # Views such as send_file compared If-None-Match with the uncompressed ETag
+            if etag and request.if_none_match.contains_weak(f'{etag}-{encoding}'):
+                self.not_modified(response, encoding)
+            else:
+                self.compress(response, encoding)
+        return response
+
+    @staticmethod
+    def not_modified(response, encoding):
+        """Turn `response` into a 304 for a client holding its `encoding` representation."""
+        etag, weak = response.get_etag()
+        response.close()
+        response.response = []
+        response.status_code = 304
+        remove_entity_headers(response.headers)
+        response.set_etag(f'{etag}-{encoding}', weak=weak)
+
+    def _stream(self, encoding):
+        if encoding == 'br':
+            return _BrotliStream(self.brotli_quality)
+        return _GzipStream(self.level)
+
+    def compress(self, response, encoding):
+        """
+        Compress `response` in place with `encoding` ("gzip" or "br").
+
+        Buffered bodies are compressed at once; streamed bodies are
+        wrapped in a generator compressing each chunk.
+        """
+        stream = self._stream(encoding)
+        if response.is_streamed and not response.direct_passthrough:
+            chunks = response.response
+
+            def generate():
+                try:
+                    for chunk in chunks:
+                        if isinstance(chunk, str):
+                            chunk = chunk.encode('utf-8')
+                        data = stream.compress(chunk)
+                        if data:
+                            yield data
+                    yield stream.finish()
+                finally:
+                    if hasattr(chunks, 'close'):
+                        chunks.close()
+
+            response.response = generate()
+            response.headers.pop('Content-Length', None)
+        else:
+            response.direct_passthrough = False
+            response.set_data(stream.compress(response.get_data()) + stream.finish())
+
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag:
+            response.set_etag(f'{etag}-{encoding}', weak=weak)
@@ -6,8 +6,17 @@ These extensions are imported in the app factory and used across the application
 
 from flask_bcrypt import Bcrypt
 from flask_sqlalchemy import SQLAlchemy
+from app.hashing import PasswordHasher
+from app.json_encoder import ResponseEncoder
+from app.compression import Compressor
 
 # SQLAlchemy instance used for ORM
 db = SQLAlchemy()
 # Bcrypt instance used for password hashing
 bcrypt = Bcrypt()
+# Runs bcrypt hashing and verification in a bounded process pool
+hasher = PasswordHasher()
+# Encodes API responses with orjson when available (stdlib fallback)
+json_encoder = ResponseEncoder()
+# Compresses responses with gzip (brotli when installed)
+compressor = Compressor()
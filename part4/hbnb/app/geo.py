@@ -0,0 +1,227 @@
+"""
+Geospatial helpers used by place search.
+
+Places are indexed by geohash: a base32 string where each character
+refines the cell of the previous one, so every place inside a cell
+shares the cell's prefix and a bounding box can be answered with a few
+B-tree range scans (`geohash >= prefix AND geohash < prefix + '{'`).
+
+The module also provides the great-circle distance used to sort
+results, and a uniform grid used by the in-memory repository.
+"""
+
+from math import asin, cos, degrees, floor, radians, sin, sqrt
+
+BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+# Stored precision (~3.7cm x 1.9cm cells)
+GEOHASH_LENGTH = 12
+# Upper bound of geohash cells used to cover a search box
+MAX_COVER_CELLS = 16
+# Character sorting right after every base32 digit, closes prefix ranges
+PREFIX_END = '{'
+EARTH_RADIUS_KM = 6371.0088
+
+
+def encode_geohash(latitude, longitude, length=GEOHASH_LENGTH):
+    """
+    Encode a coordinate into a geohash string.
+
+    Args:
+        latitude (float): Latitude (-90 to 90).
+        longitude (float): Longitude (-180 to 180).
+        length (int): Number of base32 characters.
+
+    Returns:
+        str: The geohash of the cell containing the point.
+    """
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    value = 0
+    even = True
+    while len(chars) < length:
+        rng, coord = (lng_range, longitude) if even else (lat_range, latitude)
+        mid = (rng[0] + rng[1]) / 2
+        value <<= 1
+        if coord >= mid:
+            value |= 1
+            rng[0] = mid
+        else:
+            rng[1] = mid
+        even = not even
+        bits += 1
+        if bits == 5:
+            chars.append(BASE32[value])
+            bits = 0
+            value = 0
+    return ''.join(chars)
+
+
+def cell_size(length):
+    """
+    Return the (height, width) in degrees of a geohash cell.
+
+    Args:
+        length (int): Geohash length.
+    """
+    total_bits = 5 * length
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (1 << lat_bits), 360.0 / (1 << lng_bits)
+
+
+def cover_bbox(south, west, north, east, max_cells=MAX_COVER_CELLS):
+    """
+    Return the geohash prefixes whose cells cover a bounding box.
+
+    The longest prefix length keeping the cover under `max_cells` cells
+    is used, so the range scans stay few and selective.
+
+    Args:
+        south, west, north, east (float): Box bounds in degrees.
+        max_cells (int): Maximum number of prefixes to return.
+
+    Returns:
+        list[str]: Sorted geohash prefixes (empty string covers the world).
+    """
+    for length in range(GEOHASH_LENGTH, 0, -1):
+        height, width = cell_size(length)
+        rows = floor(north / height) - floor(south / height) + 1
+        cols = floor(east / width) - floor(west / width) + 1
+        if rows * cols <= max_cells:
+            break
+    else:
+        return ['']
+
+    cells = set()
+    for row in range(rows):
+        lat = min(south + row * height, north)
+        for col in range(cols):
+            lng = min(west + col * width, east)
+            cells.add(encode_geohash(lat, lng, length))
+        cells.add(encode_geohash(lat, east, length))
+    for col in range(cols):
+        cells.add(encode_geohash(north, min(west + col * width, east), length))
+    cells.add(encode_geohash(north, east, length))
+    return sorted(cells)
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    """Return the great-circle distance between two points in kilometers."""
+    dlat = radians(lat2 - lat1)
+    dlng = radians(lng2 - lng1)
+    a = sin(dlat / 2) ** 2 + cos(radians(lat1)) * cos(radians(lat2)) * sin(dlng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * asin(min(1.0, sqrt(a)))
+
+
+def radius_bbox(latitude, longitude, radius_km):
+    """
+    Return the bounding box (south, west, north, east) enclosing a circle.
+
+    Longitudes are widened to the whole range near the poles or when
+    the circle crosses the antimeridian.
+    """
+    dlat = degrees(radius_km / EARTH_RADIUS_KM)
+    south = max(-90.0, latitude - dlat)
+    north = min(90.0, latitude + dlat)
+    if south <= -90.0 or north >= 90.0:
+        return south, -180.0, north, 180.0
+    dlng = dlat / cos(radians(latitude))
+    west, east = longitude - dlng, longitude + dlng
+    if west < -180.0 or east > 180.0:
+        return south, -180.0, north, 180.0
+    return south, west, north, east
+
+
+def parse_bbox(value):
+    """
+    Parse a `min_lng,min_lat,max_lng,max_lat` query value.
+
+    Returns:
+        tuple: (south, west, north, east).
+
+    Raises:
+        ValueError: If the value is malformed or out of range.
+    """
+    try:
+        west, south, east, north = (float(part) for part in value.split(','))
+    except ValueError:
+        raise ValueError("bbox must be min_lng,min_lat,max_lng,max_lat")
+    if not (-90 <= south <= north <= 90) or not (-180 <= west <= east <= 180):
+        raise ValueError("Invalid bbox")
+    return south, west, north, east
+
+
+def parse_point(value):
+    """
+    Parse a `lat,lng` query value.
+
+    Returns:
+        tuple: (latitude, longitude).
+
+    Raises:
+        ValueError: If the value is malformed or out of range.
+    """
+    try:
+        latitude, longitude = (float(part) for part in value.split(','))
+    except ValueError:
+        raise ValueError("near must be lat,lng")
+    if not (-90 <= latitude <= 90) or not (-180 <= longitude <= 180):
+        raise ValueError("Invalid near coordinates")
+    return latitude, longitude
+
+
+class GridIndex:
+    """
+    Uniform latitude/longitude grid mapping cells to object IDs.
+
+    Used by the in-memory repository to answer bounding-box queries by
+    visiting only the cells overlapping the box.
+    """
+
+    def __init__(self, cell_deg=1.0):
+        """
+        Args:
+            cell_deg (float): Size of a grid cell in degrees.
+        """
+        self.cell_deg = cell_deg
+        self._cells = {}
+        self._positions = {}
+
+    def _cell(self, latitude, longitude):
+        return floor(latitude / self.cell_deg), floor(longitude / self.cell_deg)
+
+    def add(self, obj_id, latitude, longitude):
+        """Index (or re-index) an object at the given position."""
+        self.remove(obj_id)
+        cell = self._cell(latitude, longitude)
+        self._cells.setdefault(cell, set()).add(obj_id)
+        self._positions[obj_id] = cell
+
+    def remove(self, obj_id):
+        """Forget an object, if indexed."""
+        cell = self._positions.pop(obj_id, None)
+        if cell is not None:
+            ids = self._cells[cell]
+            ids.discard(obj_id)
+            if not ids:
+                del self._cells[cell]
+
+    def candidates(self, south, west, north, east):
+        """
+        Yield the IDs indexed in cells overlapping the box.
+
+        Results are candidates: callers check exact coordinates.
+        """
+        min_row, min_col = self._cell(south, west)
+        max_row, max_col = self._cell(north, east)
+        if (max_row - min_row + 1) * (max_col - min_col + 1) > len(self._cells):
+            # Box larger than the populated area: scan occupied cells only
+            for (row, col), ids in self._cells.items():
+                if min_row <= row <= max_row and min_col <= col <= max_col:
+                    yield from ids
+            return
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                yield from self._cells.get((row, col), ())
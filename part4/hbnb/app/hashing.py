@@ -0,0 +1,220 @@
+"""
+Password hashing off the request thread.
+
+bcrypt is deliberately slow (~250ms at cost 12) and holds the GIL while it
+runs, so hashing inline pins a worker thread per login. `PasswordHasher`
+sends the work to a bounded process pool instead: hashes of concurrent
+requests run in parallel on every core, and once `HASHING_MAX_PENDING`
+jobs are waiting new ones are rejected with `HashingBusyError` (mapped
+to 503) rather than piling up.
+
+The cost factor can be tuned from a latency budget: calibrate_bcrypt.py
+runs `calibrate` once, offline, and writes the highest cost that fits
+the budget to BCRYPT_LOG_ROUNDS, so every worker hashes with the same
+cost. Hashes stored with a lower cost are upgraded on the next
+successful login (`needs_rehash`), so raising the cost needs no
+migration; hashes with a higher cost are kept as they are.
+
+Configuration keys:
+    BCRYPT_LOG_ROUNDS: bcrypt cost factor used for new hashes.
+    BCRYPT_MIN_ROUNDS / BCRYPT_MAX_ROUNDS: Bounds of the calibrated cost.
+    HASHING_EXECUTOR: "process" (default) or "inline" (tests, tooling).
+    HASHING_WORKERS: Number of worker processes (default: CPU count).
+    HASHING_MAX_PENDING: Maximum jobs running or queued at once.
+    HASHING_QUEUE_TIMEOUT: Seconds to wait for a free slot before rejecting.
+"""
+
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import bcrypt as _bcrypt
+
+
+logger = logging.getLogger(__name__)
+
+
+class HashingBusyError(Exception):
+    """Raised when the hashing queue is full."""
+
+
+# bcrypt only reads the first 72 bytes of a password
+BCRYPT_MAX_BYTES = 72
+
+
+def _hash_password(password, rounds):
+    """Hash a password with bcrypt (runs in a worker process)."""
+    secret = password.encode('utf-8')[:BCRYPT_MAX_BYTES]
+    return _bcrypt.hashpw(secret, _bcrypt.gensalt(rounds)).decode('utf-8')
+
+
+def _check_password(password_hash, password):
+    """Verify a password against a bcrypt hash (runs in a worker process)."""
+    try:
+        secret = password.encode('utf-8')[:BCRYPT_MAX_BYTES]
+        return _bcrypt.checkpw(secret, password_hash.encode('utf-8'))
+    except ValueError:
+        # Malformed stored hash
+        return False
+
+
+class PasswordHasher:
+    """
+    Flask extension running bcrypt in a bounded process pool.
+
+    Methods:
+        hash(password): Return a bcrypt hash using the configured cost.
+        verify(password_hash, password): Check a password against a hash.
+        stats(): Return queue-depth and throughput counters.
+        needs_rehash(password_hash): Check if a hash uses a lower cost.
+        calibrate(target_ms): Pick the cost matching a latency budget (offline).
+    """
+
+    def __init__(self, app=None):
+        self.rounds = 12
+        self.mode = 'process'
+        self.workers = os.cpu_count() or 1
+        self.max_pending = 4 * self.workers
+        self.queue_timeout = 1.0
+        self._executor = None
+        self._lock = threading.Lock()
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        self._in_flight = 0
+        self._completed = 0
+        self._rejected = 0
+        atexit.register(self.shutdown)
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        """Read the hashing settings from the application config."""
+        self.shutdown()
+        self.rounds = app.config.get('BCRYPT_LOG_ROUNDS', 12)
+        self.mode = app.config.get('HASHING_EXECUTOR', 'process')
+        self.workers = app.config.get('HASHING_WORKERS') or os.cpu_count() or 1
+        self.max_pending = app.config.get('HASHING_MAX_PENDING') or 4 * self.workers
+        self.queue_timeout = app.config.get('HASHING_QUEUE_TIMEOUT', 1.0)
+        self._slots = threading.BoundedSemaphore(self.max_pending)
+        app.extensions['password_hasher'] = self
+
+    @staticmethod
+    def calibrate(target_ms, min_rounds=10, max_rounds=16):
+        """
+        Return the highest bcrypt cost whose hash time fits `target_ms`.
+
+        Times one hash at `min_rounds`, then doubles the estimate per
+        extra round (bcrypt work is 2 ** rounds) and confirms the chosen
+        cost with a second measurement.
+
+        Args:
+            target_ms (float): Latency budget of one hash, in milliseconds.
+            min_rounds (int): Lowest acceptable cost, used even if over budget.
+            max_rounds (int): Highest cost considered.
+
+        Returns:
+            int: The calibrated cost factor.
+        """
+        def measure(rounds):
+            start = time.perf_counter()
+            _hash_password('calibration', rounds)
+            return (time.perf_counter() - start) * 1000
+
+        base_ms = measure(min_rounds)
+        rounds = min_rounds
+        while rounds < max_rounds and base_ms * 2 ** (rounds + 1 - min_rounds) <= target_ms:
+            rounds += 1
+        if rounds > min_rounds and measure(rounds) > target_ms:
+            rounds -= 1
+        logger.info("bcrypt cost calibrated to %d (%.1fms at cost %d, budget %sms)",
+                    rounds, base_ms, min_rounds, target_ms)
+        return rounds
+
+    def needs_rehash(self, password_hash):
+        """
+        Return True if `password_hash` was made with a lower cost than the configured one.
+
+        Higher costs are kept: workers configured with different costs
+        would otherwise rewrite the same hash back and forth.
+
+        Args:
+            password_hash (str): Stored bcrypt hash ("$2b$<cost>$...").
+        """
+        try:
+            return int(password_hash.split('$')[2]) < self.rounds
+        except (AttributeError, IndexError, ValueError):
+            return True
+
+    def _get_executor(self):
+        """Start the worker pool on first use."""
+        with self._lock:
+            if self._executor is None:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._executor
+
+    def shutdown(self):
+        """Stop the worker pool, if started."""
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False, cancel_futures=True)
+                self._executor = None
+
+    def _run(self, func, *args):
+        """
+        Run `func` in the pool and wait for its result.
+
+        Raises:
+            HashingBusyError: If no slot frees up within the queue timeout.
+        """
+        if self.mode == 'inline':
+            result = func(*args)
+            with self._lock:
+                self._completed += 1
+            return result
+        if not self._slots.acquire(timeout=self.queue_timeout):
+            with self._lock:
+                self._rejected += 1
+            raise HashingBusyError("Password hashing queue is full")
+        with self._lock:
+            self._in_flight += 1
+        try:
+            return self._get_executor().submit(func, *args).result()
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+                self._completed += 1
+            self._slots.release()
+
+    def hash(self, password):
+        """Return a bcrypt hash of `password` using the configured cost."""
+        return self._run(_hash_password, password, self.rounds)
+
+    def verify(self, password_hash, password):
+        """Return True if `password` matches `password_hash`."""
+        return self._run(_check_password, password_hash, password)
+
+    def stats(self):
+        """
+        Return hashing queue metrics.
+
+        Returns:
+            dict: workers, in_flight (running + queued jobs), queued
+            (jobs waiting for a free worker), max_pending, completed
+            and rejected counters.
+        """
+        with self._lock:
+            return {
+                'mode': self.mode,
+                'workers': self.workers,
+                'in_flight': self._in_flight,
+                'queued': max(0, self._in_flight - self.workers),
+                'max_pending': self.max_pending,
+                'completed': self._completed,
+                'rejected': self._rejected,
+            }
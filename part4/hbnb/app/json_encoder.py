@@ -0,0 +1,135 @@
+"""
+JSON encoding of API responses.
+
+Flask-RESTX encodes every resource return value with the stdlib `json`
+module. `ResponseEncoder` replaces its `application/json` representation
+with a pluggable encoder: orjson when it is installed (several times
+faster, and it serializes datetimes and UUIDs natively), the stdlib
+otherwise. orjson is optional: `pip install orjson` to enable it. Both
+encoders produce the same bytes (compact separators, UTF-8 text, and a
+2-space indent in pretty mode, the only one orjson has), so switching
+does not change responses or their ETags. The same encoder writes the
+lines of NDJSON streams.
+
+Configuration keys:
+    JSON_ENCODER: "auto" (default: orjson if available), "orjson" or "stdlib".
+    RESTX_JSON: Extra keyword arguments of the stdlib encoder.
+"""
+
+import json
+import logging
+from datetime import date, datetime
+from decimal import Decimal
+from uuid import UUID
+
+from flask import current_app, make_response
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional dependency
+    orjson = None
+
+
+logger = logging.getLogger(__name__)
+
+
+def _default(obj):
+    """Convert the values the encoders do not handle natively."""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, UUID):
+        return str(obj)
+    if isinstance(obj, Decimal):
+        return float(obj)
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def stdlib_dumps(data, pretty=False):
+    """Encode `data` to UTF-8 JSON bytes with the stdlib `json` module."""
+    settings = dict(current_app.config.get('RESTX_JSON', {})) if current_app else {}
+    # Same output as orjson_dumps
+    if pretty:
+        settings.setdefault('indent', 2)
+        settings.setdefault('separators', (',', ': '))
+    else:
+        settings.setdefault('separators', (',', ':'))
+    settings.setdefault('ensure_ascii', False)
+    settings.setdefault('default', _default)
+    return json.dumps(data, **settings).encode('utf-8')
+
+
+def orjson_dumps(data, pretty=False):
+    """Encode `data` to UTF-8 JSON bytes with orjson."""
+    option = orjson.OPT_NON_STR_KEYS
+    if pretty:
+        option |= orjson.OPT_INDENT_2
+    return orjson.dumps(data, default=_default, option=option)
+
+
+ENCODERS = {
+    'stdlib': stdlib_dumps,
+    'orjson': orjson_dumps,
+}
+
+
+class ResponseEncoder:
+    """
+    Flask extension encoding API responses with the configured JSON encoder.
+
+    Methods:
+        dumps(data): Encode a value to JSON bytes.
+        output_json(data, code, headers): Flask-RESTX representation.
+    """
+
+    def __init__(self, app=None, api=None):
+        self.name = 'stdlib'
+        self._dumps = stdlib_dumps
+        if app is not None:
+            self.init_app(app, api)
+
+    def init_app(self, app, api=None):
+        """
+        Select the encoder from the config and register it on `api`.
+
+        Args:
+            app (Flask): The application.
+            api (Api, optional): Flask-RESTX API whose `application/json`
+                representation is replaced.
+        """
+        self.name = self.resolve(app.config.get('JSON_ENCODER', 'auto'))
+        self._dumps = ENCODERS[self.name]
+        if api is not None:
+            api.representations['application/json'] = self.output_json
+        app.extensions['json_encoder'] = self
+
+    @staticmethod
+    def resolve(name):
+        """
+        Return the name of the encoder to use for a JSON_ENCODER value.
+
+        Falls back to the stdlib encoder (with a warning) when orjson is
+        requested but not installed.
+
+        Raises:
+            ValueError: If the name is unknown.
+        """
+        if name in (None, 'auto'):
+            return 'orjson' if orjson is not None else 'stdlib'
+        if name not in ENCODERS:
+            raise ValueError(f"Unknown JSON_ENCODER: {name}")
+        if name == 'orjson' and orjson is None:
+            logger.warning("orjson is not installed, using the stdlib JSON encoder")
+            return 'stdlib'
+        return name
+
+    def dumps(self, data, pretty=False):
+        """Encode `data` to UTF-8 JSON bytes."""
+        return self._dumps(data, pretty)
+
+    def output_json(self, data, code, headers=None):
+        """Make a Flask response with a JSON encoded body (RESTX representation)."""
+        # Same output as Flask-RESTX: indented in debug mode, ending with a newline
+        resp = make_response(self.dumps(data, pretty=current_app.debug) + b'\n', code)
+        resp.headers.extend(headers or {})
+        resp.mimetype = 'application/json'
+        return resp
@@ -1,5 +1,14 @@
 from app.models.base_model import BaseModel
 from app.extensions import db
+from app.persistence.catalog import amenity_catalog
+from sqlalchemy import event, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+# Bits of Place.amenity_bitmap, a signed 64-bit integer
+MAX_AMENITY_BITS = 63
+# Inserts retried by insert_amenities when a concurrent insert took the same bits
+BIT_ATTEMPTS = 5
 
 
 class Amenity(BaseModel):
@@ -11,11 +20,15 @@ class Amenity(BaseModel):
 
     Attributes:
         name (str): Name of the amenity. Must be a non-empty string of max 50 characters.
+        bit (int): Position of the amenity in `Place.amenity_bitmap`, given
+            once when the amenity is inserted and never reused. None once
+            all MAX_AMENITY_BITS positions are taken.
     """
 
     __tablename__ = 'amenities'
 
     name = db.Column(db.String(255), nullable=False, unique=True)
+    bit = db.Column(db.Integer, unique=True)
 
     def update(self, data):
         """
@@ -32,14 +45,81 @@ class Amenity(BaseModel):
             if not isinstance(new_name, str) or not new_name or len(new_name) > 255:
                 raise ValueError("Invalid name")
 
-            # Vérifie qu'aucune autre amenity n'a ce nom
-            existing = Amenity.query.filter(
-                Amenity.name == new_name,
-                Amenity.id != self.id
-            ).first()
-            if existing:
+            # Vérifie qu'aucune autre amenity n'a ce nom (catalogue, puis la table)
+            if amenity_catalog.id_of(new_name) not in (None, self.id):
                 raise ValueError("Amenity name already exists")
 
             self.name = new_name
 
         self.save()
+
+
+def assign_bits(session, amenities):
+    """
+    Give the amenities without a bit the next free bitmap positions, in name order.
+
+    Positions are never reused; amenities left once all MAX_AMENITY_BITS
+    positions are taken keep no bit.
+
+    Returns:
+        int: Number of amenities given a bit.
+    """
+    amenities = sorted((amenity for amenity in amenities if amenity.bit is None),
+                       key=lambda amenity: amenity.name or '')
+    if not amenities:
+        return 0
+    with session.no_autoflush:
+        last = session.execute(select(func.max(Amenity.bit))).scalar()
+    first = 0 if last is None else last + 1
+    amenities = amenities[:max(MAX_AMENITY_BITS - first, 0)]
+    for bit, amenity in enumerate(amenities, first):
+        amenity.bit = bit
+    return len(amenities)
+
+
+def is_unique_violation(error, column):
+    """
+    Tell whether an IntegrityError comes from the unique index on amenities.`column`.
+
+    Matches the SQLite message ("UNIQUE constraint failed: amenities.name")
+    and the PostgreSQL / migrated index names.
+    """
+    message = str(error.orig)
+    return any(name in message for name in (
+        f'amenities.{column}', f'amenities_{column}_key', f'uq_amenities_{column}'))
+
+
+def insert_amenities(session, amenities):
+    """
+    Insert new amenities, retrying when a concurrent insert took their bits.
+
+    Bits are read as MAX(bit) + 1 just before the INSERT, so two
+    transactions can get the same bit and the second INSERT then fails on
+    the unique index of `bit`. Each attempt runs in a savepoint: a
+    conflict only undoes these rows, and the next attempt reads the new
+    maximum.
+
+    Args:
+        session (Session): Session to insert into.
+        amenities (list[Amenity]): New amenities.
+
+    Raises:
+        IntegrityError: On another constraint (e.g. a duplicate name), or
+            if bits still conflict after BIT_ATTEMPTS attempts.
+    """
+    for attempt in range(BIT_ATTEMPTS):
+        try:
+            with session.begin_nested():
+                session.add_all(amenities)
+            return
+        except IntegrityError as error:
+            if attempt == BIT_ATTEMPTS - 1 or not is_unique_violation(error, 'bit'):
+                raise
+            for amenity in amenities:
+                amenity.bit = None
+
+
+@event.listens_for(Session, 'before_flush')
+def _assign_bits(session, flush_context, instances):
+    """Give the amenities about to be inserted their bitmap positions."""
+    assign_bits(session, [obj for obj in session.new if isinstance(obj, Amenity)])
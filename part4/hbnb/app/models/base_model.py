@@ -1,4 +1,5 @@
 from app.extensions import db
+from app.persistence.unit_of_work import commit
 import uuid
 from datetime import datetime
 
@@ -20,18 +21,19 @@ class BaseModel(db.Model):
     __abstract__ = True  # This ensures SQLAlchemy does not create a table for BaseModel
 
     id = db.Column(db.String(36), primary_key=True, default=lambda: str(uuid.uuid4()))
-    created_at = db.Column(db.DateTime, default=datetime.now)
+    created_at = db.Column(db.DateTime, default=datetime.now, index=True)  # Indexed for keyset pagination
     updated_at = db.Column(db.DateTime, default=datetime.now, onupdate=datetime.now)
 
     def save(self):
         """
         Persist the object in the database and refresh the 'updated_at' field.
 
-        Commits the current session after saving.
+        Commits the current session after saving, or leaves the commit to
+        the enclosing unit of work.
         """
         self.updated_at = datetime.now()
         db.session.add(self)
-        db.session.commit()
+        commit()
 
     def update(self, data):
         """
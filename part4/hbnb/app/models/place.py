@@ -1,13 +1,17 @@
 from app.models.base_model import BaseModel
 from app.extensions import db
+from app.geo import GEOHASH_LENGTH, encode_geohash
 import uuid
-from sqlalchemy import Table, Column, Integer, ForeignKey
+from sqlalchemy import Table, Column, Integer, ForeignKey, case, inspect
+from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
 
 # Association table for many-to-many relationship between Place and Amenity
 place_amenities = db.Table('place_amenities',
         db.Column('place_id', db.String(36), db.ForeignKey('places.id'), primary_key=True),
-        db.Column('amenity_id', db.String(36), db.ForeignKey('amenities.id'), primary_key=True)
+        db.Column('amenity_id', db.String(36), db.ForeignKey('amenities.id'), primary_key=True),
+        # The primary key only serves lookups by place_id
+        db.Index('ix_place_amenities_amenity_id', 'amenity_id')
     )
 
 class Place(BaseModel):
@@ -24,6 +28,10 @@ class Place(BaseModel):
         latitude (float): Geographical latitude (-90 to 90).
         longitude (float): Geographical longitude (-180 to 180).
         user_id (int): Foreign key to the owner (User).
+        review_count (int): Number of reviews, maintained by the facade.
+        rating_sum (int): Sum of review ratings, maintained by the facade.
+        amenity_bitmap (int): One bit per linked amenity (`Amenity.bit`),
+            kept in sync with `amenities` on every flush.
         reviews (List[Review]): Linked reviews.
         amenities (List[Amenity]): Linked amenities through many-to-many.
     """
@@ -32,15 +40,33 @@ class Place(BaseModel):
 
     title = db.Column(db.String(50), nullable=False)
     description = db.Column(db.String(3000), nullable=False)
-    price = db.Column(db.Float, nullable=False)
+    price = db.Column(db.Float, nullable=False, index=True)
     latitude = db.Column(db.Float, nullable=False)
     longitude = db.Column(db.Float, nullable=False)
+    # Derived from latitude/longitude, indexed for bounding-box searches
+    geohash = db.Column(db.String(GEOHASH_LENGTH), index=True)
+    # Denormalized review aggregates, so listings never touch the reviews table
+    review_count = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    rating_sum = db.Column(db.Integer, nullable=False, default=0, server_default='0')
+    # Denormalized amenity links, so "has all these amenities" is one bitwise test
+    amenity_bitmap = db.Column(db.BigInteger, nullable=False, default=0, server_default='0')
 
     owner_id = db.Column(db.String(36), db.ForeignKey('users.id'), nullable=False)
     reviews = db.relationship('Review', backref='place', lazy=True)
     amenities = db.relationship('Amenity', secondary=place_amenities, backref=db.backref('places', lazy=True))
     reviews = db.relationship('Review', back_populates='place', lazy=True)
 
+    @hybrid_property
+    def average_rating(self):
+        """Average review rating, or None when the place has no review."""
+        if not self.review_count:
+            return None
+        return self.rating_sum / self.review_count
+
+    @average_rating.expression
+    def average_rating(cls):
+        """SQL counterpart of `average_rating`, usable in filters and ORDER BY."""
+        return case((cls.review_count > 0, cls.rating_sum * 1.0 / cls.review_count), else_=None)
 
     def add_review(self, review):
         """
@@ -59,6 +85,8 @@ class Place(BaseModel):
             amenity (Amenity): Amenity instance to associate.
         """
         self.amenities.append(amenity)
+        if amenity.bit is not None:
+            self.amenity_bitmap = (self.amenity_bitmap or 0) | (1 << amenity.bit)
 
     def update(self, place_data):
         """
@@ -96,3 +124,28 @@ class Place(BaseModel):
             self.longitude = place_data["longitude"]
 
         self.save()
+
+
+@db.event.listens_for(Place, 'before_insert')
+@db.event.listens_for(Place, 'before_update')
+def _refresh_geohash(mapper, connection, place):
+    """Keep the geohash in sync with the coordinates on every flush."""
+    if place.latitude is not None and place.longitude is not None:
+        place.geohash = encode_geohash(place.latitude, place.longitude)
+
+
+def amenity_mask(amenities):
+    """Return the bitmap of a list of amenities (those without a bit are ignored)."""
+    mask = 0
+    for amenity in amenities:
+        if amenity.bit is not None:
+            mask |= 1 << amenity.bit
+    return mask
+
+
+@db.event.listens_for(Place, 'before_insert')
+@db.event.listens_for(Place, 'before_update')
+def _refresh_amenity_bitmap(mapper, connection, place):
+    """Keep the amenity bitmap in sync with the linked amenities on every flush."""
+    if 'amenities' not in inspect(place).unloaded:
+        place.amenity_bitmap = amenity_mask(place.amenities)
@@ -16,6 +16,13 @@ class Review(BaseModel):
     """
 
     __tablename__= 'reviews'
+    __table_args__ = (
+        # Serves "reviews of a place" lookups already sorted by date
+        db.Index('ix_reviews_place_id_created_at', 'place_id', 'created_at'),
+        # A user can review a given place only once
+        db.Index('uq_reviews_user_id_place_id', 'user_id', 'place_id', unique=True),
+    )
+
     text = db.Column(db.String(1000), nullable=False)
     rating = db.Column(db.Integer, nullable=False)
 
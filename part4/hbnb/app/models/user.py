@@ -1,6 +1,6 @@
 from app.models.base_model import BaseModel
 from app.validators import is_valid_email
-from app.extensions import db, bcrypt
+from app.extensions import db, hasher
 import uuid
 from .base_model import BaseModel  # Import BaseModel from its module
 
@@ -65,10 +65,12 @@ class User(BaseModel):
         """
         Hash and store the given password securely.
 
+        The bcrypt work runs in the hashing process pool.
+
         Args:
             password (str): Plain-text password to hash.
         """
-        self.password = bcrypt.generate_password_hash(password).decode('utf-8')
+        self.password = hasher.hash(password)
 
     def verify_password(self, password):
         """
@@ -80,4 +82,13 @@ class User(BaseModel):
         Returns:
             bool: True if password is correct, False otherwise.
         """
-        return bcrypt.check_password_hash(self.password, password)
+        return hasher.verify(self.password, password)
+
+    def password_needs_rehash(self):
+        """
+        Check if the stored hash uses a lower bcrypt cost than the configured one.
+
+        Returns:
+            bool: True if the password should be hashed again.
+        """
+        return hasher.needs_rehash(self.password)
@@ -0,0 +1,337 @@
+"""
+Read-through cache for hot entities.
+
+`CachedRepository` wraps a SQLAlchemy repository: `get`, `get_many` and
+lookups on unique attributes (e.g. a user's email) are served from a
+cache backend, and only misses reach the database. Cache entries hold
+the column values of a row, not the ORM object, so they outlive the
+request session; on a hit the values are attached to the current
+session with `merge(load=False)`, without any SELECT. Relationships are
+still loaded lazily from the database.
+
+Entries are invalidated whenever the session flushes or commits changes
+to a cached row, whether the write comes from the facade, a repository
+or `BaseModel.save`; bulk SQL UPDATEs must call `invalidate`/`clear`.
+Stale reads are further bounded by the entry TTL.
+
+Backends implement `CacheBackend`; `LRUCache` is the in-process default
+(bounded number of entries, TTL, hit/miss/eviction counters) and
+`NullCache` disables caching.
+
+Configuration keys:
+    CACHE_BACKEND: "lru" (default) or "null".
+    CACHE_MAX_ENTRIES: Maximum number of entries of the LRU backend.
+    CACHE_TTL: Lifetime of an entry, in seconds.
+"""
+
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+
+from sqlalchemy import event, inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+from sqlalchemy.orm.attributes import set_committed_value
+from sqlalchemy.orm.util import identity_key
+
+from app.extensions import db
+
+_PENDING_KEY = 'cache_invalidations'
+
+
+class CacheBackend(ABC):
+    """Interface of the key-value stores usable by `CachedRepository`."""
+
+    @abstractmethod
+    def get(self, key):
+        """Return the value stored under `key`, or None."""
+
+    @abstractmethod
+    def set(self, key, value):
+        """Store `value` under `key`."""
+
+    @abstractmethod
+    def delete(self, key):
+        """Remove `key`, if present."""
+
+    @abstractmethod
+    def clear(self):
+        """Remove every entry."""
+
+    @abstractmethod
+    def stats(self):
+        """Return a dict of counters."""
+
+
+class NullCache(CacheBackend):
+    """Backend storing nothing: every read is a miss."""
+
+    def __init__(self):
+        self._misses = 0
+
+    def get(self, key):
+        self._misses += 1
+        return None
+
+    def set(self, key, value):
+        pass
+
+    def delete(self, key):
+        pass
+
+    def clear(self):
+        pass
+
+    def stats(self):
+        return {'backend': 'null', 'size': 0, 'hits': 0, 'misses': self._misses}
+
+
+class LRUCache(CacheBackend):
+    """
+    Thread-safe in-process LRU cache with a time-to-live.
+
+    Holds at most `max_entries` entries: inserting into a full cache
+    evicts the least recently used one.
+    """
+
+    def __init__(self, max_entries=10000, ttl=60.0, clock=time.monotonic):
+        """
+        Args:
+            max_entries (int): Maximum number of entries.
+            ttl (float): Lifetime of an entry, in seconds.
+            clock (callable): Time source, replaceable in tests.
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._clock = clock
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._expirations = 0
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            value, expires_at = entry
+            if expires_at <= self._clock():
+                del self._entries[key]
+                self._expirations += 1
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return value
+
+    def set(self, key, value):
+        with self._lock:
+            self._entries[key] = (value, self._clock() + self.ttl)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._evictions += 1
+
+    def delete(self, key):
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self):
+        with self._lock:
+            return {
+                'backend': 'lru',
+                'size': len(self._entries),
+                'max_entries': self.max_entries,
+                'ttl': self.ttl,
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'expirations': self._expirations,
+            }
+
+
+BACKENDS = {
+    'lru': lambda config: LRUCache(config.get('CACHE_MAX_ENTRIES', 10000), config.get('CACHE_TTL', 60.0)),
+    'null': lambda config: NullCache(),
+}
+
+
+def _entity_key(table, obj_id):
+    return f'{table}:{obj_id}'
+
+
+class EntityCache:
+    """
+    Flask extension owning the cache backend and its invalidation hooks.
+
+    Methods:
+        init_app(app): Create the configured backend.
+        invalidate(table, obj_id): Drop the entry of one row.
+        clear(): Drop every entry.
+        stats(): Return the backend counters.
+    """
+
+    def __init__(self, backend=None):
+        self.backend = backend or LRUCache()
+        self.tables = set()
+        self._listening = False
+
+    def init_app(self, app):
+        """Create the backend selected by CACHE_BACKEND and listen to session writes."""
+        name = app.config.get('CACHE_BACKEND', 'lru')
+        if name not in BACKENDS:
+            raise ValueError(f"Unknown CACHE_BACKEND: {name}")
+        self.backend = BACKENDS[name](app.config)
+        if not self._listening:
+            event.listen(Session, 'after_flush', self._after_flush)
+            event.listen(Session, 'after_commit', self._after_commit)
+            self._listening = True
+        app.extensions['entity_cache'] = self
+
+    def get(self, key):
+        return self.backend.get(key)
+
+    def set(self, key, value):
+        self.backend.set(key, value)
+
+    def invalidate(self, table, obj_id):
+        """Drop the cached entry of a row."""
+        self.backend.delete(_entity_key(table, obj_id))
+
+    def clear(self):
+        """Drop every cached entry."""
+        self.backend.clear()
+
+    def stats(self):
+        """Return the backend counters."""
+        return self.backend.stats()
+
+    def _after_flush(self, session, flush_context):
+        """Drop the entries of the rows written by the flush."""
+        pending = session.info.setdefault(_PENDING_KEY, set())
+        for obj in list(session.dirty) + list(session.deleted):
+            table = getattr(obj, '__tablename__', None)
+            if table in self.tables:
+                pending.add((table, obj.id))
+                self.invalidate(table, obj.id)
+
+    def _after_commit(self, session):
+        """Drop them again once committed, in case a reader re-cached the old row meanwhile."""
+        if session.in_nested_transaction():
+            # Released SAVEPOINT: the outer transaction has not committed yet
+            return
+        for table, obj_id in session.info.pop(_PENDING_KEY, ()):
+            self.invalidate(table, obj_id)
+
+
+class CachedRepository:
+    """
+    Read-through caching wrapper around a SQLAlchemy repository.
+
+    `get` (without loading profile), `get_many` and `get_by_attribute` on
+    the attributes listed in `lookups` go through the cache; every other
+    method is delegated to the wrapped repository.
+    """
+
+    def __init__(self, repository, cache, lookups=()):
+        """
+        Args:
+            repository (SQLAlchemyRepository): Repository to wrap.
+            cache (EntityCache): Shared cache extension.
+            lookups (tuple[str]): Unique attributes whose lookups are cached.
+        """
+        self.repository = repository
+        self.cache = cache
+        self.lookups = set(lookups)
+        self.model = repository.model
+        self.table = self.model.__tablename__
+        self._columns = [attr.key for attr in inspect(self.model).column_attrs]
+        cache.tables.add(self.table)
+
+    def __getattr__(self, name):
+        return getattr(self.repository, name)
+
+    def _snapshot(self, obj):
+        return {key: getattr(obj, key) for key in self._columns}
+
+    def _restore(self, values):
+        """Attach cached column values to the current session without a query."""
+        obj = self.model.__mapper__.class_manager.new_instance()
+        for key, value in values.items():
+            set_committed_value(obj, key, value)
+        make_transient_to_detached(obj)
+        return db.session.merge(obj, load=False)
+
+    def _from_session(self, obj_id):
+        """Return the instance already loaded (and not expired) in the session, if any."""
+        obj = db.session.identity_map.get(identity_key(self.model, obj_id))
+        if obj is not None and not inspect(obj).expired_attributes:
+            return obj
+        return None
+
+    def get(self, obj_id, profile=None):
+        """Return the object by ID, from the session, the cache or the database."""
+        if profile:
+            return self.repository.get(obj_id, profile)
+        obj = self._from_session(obj_id)
+        if obj is not None:
+            return obj
+        values = self.cache.get(_entity_key(self.table, obj_id))
+        if values is not None:
+            return self._restore(values)
+        obj = self.repository.get(obj_id)
+        if obj is not None:
+            self.cache.set(_entity_key(self.table, obj_id), self._snapshot(obj))
+        return obj
+
+    def get_many(self, obj_ids, profile=None):
+        """Like `SQLAlchemyRepository.get_many`; only cache misses are queried."""
+        obj_ids = list(dict.fromkeys(obj_ids))
+        if profile:
+            return self.repository.get_many(obj_ids, profile)
+        found = {}
+        for obj_id in obj_ids:
+            obj = self._from_session(obj_id)
+            if obj is None:
+                values = self.cache.get(_entity_key(self.table, obj_id))
+                obj = self._restore(values) if values is not None else None
+            if obj is not None:
+                found[obj_id] = obj
+        loaded, missing = self.repository.get_many(obj_id for obj_id in obj_ids if obj_id not in found)
+        for obj_id, obj in loaded.items():
+            self.cache.set(_entity_key(self.table, obj_id), self._snapshot(obj))
+        found.update(loaded)
+        return {obj_id: found[obj_id] for obj_id in obj_ids if obj_id in found}, missing
+
+    def get_by_attribute(self, attr_name, attr_value):
+        """Fetch an object by attribute value, cached for the `lookups` attributes."""
+        if attr_name not in self.lookups:
+            return self.repository.get_by_attribute(attr_name, attr_value)
+        key = f'{self.table}:{attr_name}={attr_value}'
+        obj_id = self.cache.get(key)
+        if obj_id is not None:
+            obj = self.get(obj_id)
+            # The attribute may have changed since the lookup was cached
+            if obj is not None and getattr(obj, attr_name) == attr_value:
+                return obj
+            self.cache.backend.delete(key)
+        obj = self.repository.get_by_attribute(attr_name, attr_value)
+        if obj is not None:
+            self.cache.set(key, obj.id)
+            self.cache.set(_entity_key(self.table, obj.id), self._snapshot(obj))
+        return obj
+
+    def invalidate(self, obj_id):
+        """Drop the cached entry of one object."""
+        self.cache.invalidate(self.table, obj_id)
+
+
+# Shared by the facade repositories, configured by create_app
+entity_cache = EntityCache()
@@ -0,0 +1,263 @@
+"""
+In-memory snapshot of the amenity catalogue.
+
+Amenities are a small table that rarely changes but is read on almost
+every request: the amenity list, place creation (every amenity ID is
+checked), and name uniqueness checks. `AmenityCatalog` keeps all of it
+in memory as an immutable, versioned snapshot (ID -> name, name -> ID
+and the rows in page order), so these reads cost no query.
+
+The snapshot is rebuilt lazily, with one SELECT, after a committed
+transaction wrote to the amenities table (create, update or delete,
+whether through the facade or `BaseModel.save`). Until that transaction
+commits, the session that made the changes reads the table directly so
+it sees its own writes. Other processes' writes reach the snapshot after
+AMENITY_CATALOG_TTL seconds at most; until then, a lookup that misses
+the snapshot is checked against the table (one indexed query), and a
+hit drops the snapshot, so amenities created elsewhere are never
+reported missing and names are never wrongly reported free.
+
+Configuration keys:
+    AMENITY_CATALOG_TTL: Maximum age of a snapshot, in seconds.
+"""
+
+import threading
+import time
+from bisect import bisect_right
+from collections import namedtuple
+from datetime import datetime
+
+from sqlalchemy import event, select
+from sqlalchemy.orm import Session
+
+from app.extensions import db
+from app.persistence.repository import decode_cursor, encode_cursor
+
+_PENDING_KEY = 'amenity_catalog_changed'
+
+# One amenity row, as served from the catalogue
+AmenityEntry = namedtuple('AmenityEntry', 'id name created_at updated_at bit')
+
+
+class CatalogSnapshot:
+    """
+    Immutable view of the amenities table.
+
+    Attributes:
+        version (int): Incremented on every rebuild.
+        entries (list[AmenityEntry]): Rows ordered by (created_at, id).
+        names (dict): Amenity ID -> name.
+        ids (dict): Amenity name -> ID.
+        bits (dict): Amenity ID -> position in `Place.amenity_bitmap`,
+            for the amenities that have one.
+        last_update (datetime): Latest updated_at, or None if empty.
+    """
+
+    def __init__(self, version, entries):
+        self.version = version
+        self.entries = sorted(entries, key=_sort_key)
+        self.names = {entry.id: entry.name for entry in self.entries}
+        self.ids = {entry.name: entry.id for entry in self.entries}
+        self.bits = {entry.id: entry.bit for entry in self.entries if entry.bit is not None}
+        self.last_update = max((entry.updated_at for entry in self.entries if entry.updated_at), default=None)
+
+
+def _sort_key(entry):
+    """Page order, shared with the SQL repositories."""
+    return (entry.created_at or datetime.min, entry.id)
+
+
+class AmenityCatalog:
+    """
+    Flask extension serving amenity lookups from an in-memory snapshot.
+
+    Methods:
+        init_app(app): Read the TTL and drop the snapshot of a previous app.
+        snapshot(): Return the current snapshot, rebuilding it if needed.
+        name_of(amenity_id) / id_of(name): Lookups by ID or by name.
+        missing(amenity_ids): Return the IDs that are not in the catalogue.
+        taken(names): Return the names already used.
+        mask_of(amenity_ids): Return the amenity bitmap of a set of IDs.
+        get_page(limit, after): Return one page of entries.
+        get_collection_state(): Return (count, latest updated_at).
+        invalidate(): Force a rebuild on the next read.
+    """
+
+    def __init__(self, table='amenities', ttl=60.0, clock=time.monotonic):
+        """
+        Args:
+            table (str): Name of the cached table.
+            ttl (float): Maximum age of a snapshot, in seconds.
+            clock (callable): Time source, in seconds.
+        """
+        self.table = table
+        self.ttl = ttl
+        self.clock = clock
+        self.version = 0
+        self._snapshot = None
+        self._built_at = 0.0
+        self._lock = threading.Lock()
+        event.listen(Session, 'after_flush', self._after_flush)
+        event.listen(Session, 'after_commit', self._after_commit)
+        event.listen(Session, 'after_rollback', self._after_rollback)
+
+    def init_app(self, app):
+        """Read AMENITY_CATALOG_TTL; the snapshot is rebuilt from the app database."""
+        self.ttl = app.config.get('AMENITY_CATALOG_TTL', 60.0)
+        self.invalidate()
+        app.extensions['amenity_catalog'] = self
+
+    def invalidate(self):
+        """Drop the snapshot: the next read rebuilds it."""
+        self._snapshot = None
+
+    def _load(self, version):
+        table = db.metadata.tables[self.table]
+        rows = db.session.execute(
+            select(table.c.id, table.c.name, table.c.created_at, table.c.updated_at, table.c.bit)
+        ).all()
+        return CatalogSnapshot(version, [AmenityEntry(*row) for row in rows])
+
+    def _has_changes(self, session):
+        """Return True if the session holds amenity writes not committed yet."""
+        if session.info.get(_PENDING_KEY):
+            return True
+        if any(getattr(obj, '__tablename__', None) == self.table
+               for obj in (*session.new, *session.deleted)):
+            return True
+        # Linking a place only touches the `places` backref, not the row
+        return any(getattr(obj, '__tablename__', None) == self.table
+                   and session.is_modified(obj, include_collections=False)
+                   for obj in session.dirty)
+
+    def snapshot(self):
+        """
+        Return the current snapshot.
+
+        A session with uncommitted amenity writes gets a one-off snapshot
+        of its own view of the table, which is not kept.
+        """
+        if self._has_changes(db.session()):
+            return self._load(self.version)
+        snapshot = self._snapshot
+        if snapshot is None or self.clock() - self._built_at >= self.ttl:
+            with self._lock:
+                snapshot = self._snapshot
+                if snapshot is None or self.clock() - self._built_at >= self.ttl:
+                    self.version += 1
+                    snapshot = self._snapshot = self._load(self.version)
+                    self._built_at = self.clock()
+        return snapshot
+
+    def _find(self, key, values):
+        """
+        Look up snapshot misses in the table.
+
+        Args:
+            key (str): Column searched, 'id' or 'name'.
+            values (list): Values missing from the snapshot.
+
+        Returns:
+            dict: Value -> the other column, for the rows found. A hit
+            means the snapshot is stale: it is dropped.
+        """
+        if not values:
+            return {}
+        table = db.metadata.tables[self.table]
+        other = 'name' if key == 'id' else 'id'
+        found = dict(db.session.execute(
+            select(table.c[key], table.c[other]).where(table.c[key].in_(values))
+        ).all())
+        if found:
+            self.invalidate()
+        return found
+
+    def name_of(self, amenity_id):
+        """Return the name of an amenity, or None if it does not exist."""
+        name = self.snapshot().names.get(amenity_id)
+        if name is None:
+            name = self._find('id', [amenity_id]).get(amenity_id)
+        return name
+
+    def id_of(self, name):
+        """Return the ID of the amenity with this name, or None."""
+        amenity_id = self.snapshot().ids.get(name)
+        if amenity_id is None:
+            amenity_id = self._find('name', [name]).get(name)
+        return amenity_id
+
+    def missing(self, amenity_ids):
+        """Return the IDs of `amenity_ids` that are not in the amenities table, in order."""
+        names = self.snapshot().names
+        missing = [amenity_id for amenity_id in dict.fromkeys(amenity_ids) if amenity_id not in names]
+        found = self._find('id', missing)
+        return [amenity_id for amenity_id in missing if amenity_id not in found]
+
+    def taken(self, names):
+        """Return the set of `names` already used by an amenity."""
+        ids = self.snapshot().ids
+        names = set(names)
+        taken = names & ids.keys()
+        return taken | self._find('name', list(names - taken)).keys()
+
+    def mask_of(self, amenity_ids):
+        """
+        Return the `Place.amenity_bitmap` mask of a set of amenities.
+
+        Returns:
+            tuple: (mask, IDs without a bit), the latter in order; unknown
+            IDs are among them.
+        """
+        bits = self.snapshot().bits
+        mask, rest = 0, []
+        for amenity_id in dict.fromkeys(amenity_ids):
+            if amenity_id in bits:
+                mask |= 1 << bits[amenity_id]
+            else:
+                rest.append(amenity_id)
+        return mask, rest
+
+    def get_page(self, limit, after=None):
+        """
+        Return one page of entries ordered by (created_at, id).
+
+        Cursors are interchangeable with the repository ones; a `limit`
+        of None returns every entry after the cursor.
+
+        Returns:
+            tuple: (entries, next_cursor).
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        entries = self.snapshot().entries
+        start = 0
+        if after:
+            created_at, obj_id = decode_cursor(after)
+            start = bisect_right(entries, (created_at or datetime.min, obj_id), key=_sort_key)
+        end = len(entries) if limit is None else start + limit
+        page = entries[start:end]
+        has_more = end < len(entries)
+        return page, encode_cursor(page[-1]) if has_more and page else None
+
+    def get_collection_state(self):
+        """Return (number of amenities, latest updated_at), as the repositories do."""
+        snapshot = self.snapshot()
+        return len(snapshot.entries), snapshot.last_update
+
+    def _after_flush(self, session, flush_context):
+        if self._has_changes(session):
+            session.info[_PENDING_KEY] = True
+
+    def _after_commit(self, session):
+        # A released SAVEPOINT is not a commit: wait for the outer transaction
+        if not session.in_nested_transaction() and session.info.pop(_PENDING_KEY, False):
+            self.invalidate()
+
+    def _after_rollback(self, session):
+        if not session.in_nested_transaction():
+            session.info.pop(_PENDING_KEY, None)
+
+
+# Shared by the facade and the Amenity model, configured by create_app
+amenity_catalog = AmenityCatalog()
@@ -0,0 +1,150 @@
+"""
+Secondary indexes for the in-memory repository.
+
+An index maps the value of one attribute to the IDs of the objects
+holding it, so lookups on that attribute do not scan the whole storage:
+
+    HashIndex('email', unique=True)   # one object per value
+    HashIndex('owner_id')             # many objects per value
+    SortedIndex('price')              # equality and range lookups
+
+Each index remembers the value it indexed for every ID, so an object
+can be re-indexed after it was modified in place. Objects whose value
+is None are not indexed.
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from collections import namedtuple
+from operator import attrgetter
+
+# Inclusive bounds of a range criterion, None leaving the bound open
+Range = namedtuple('Range', 'low high', defaults=(None, None))
+
+
+class Index:
+    """
+    Base class of the secondary indexes.
+
+    Attributes:
+        attr (str): Name of the indexed attribute, used in criteria.
+        unique (bool): Whether two objects may share a value.
+    """
+
+    unique = False
+
+    def __init__(self, attr, key=None):
+        """
+        Args:
+            attr (str): Name of the indexed attribute.
+            key (callable, optional): Computes the value from an object,
+                defaults to reading `attr` (e.g. `lambda r: r.place.id`
+                to index a related object's ID).
+        """
+        self.attr = attr
+        self.key = key or attrgetter(attr)
+        self._values = {}
+
+    def value_of(self, obj):
+        """Return the value to index for `obj`."""
+        return self.key(obj)
+
+    def add(self, obj):
+        """
+        Index (or re-index) an object under its current value.
+
+        Raises:
+            ValueError: If a unique index already holds the value for
+                another object; the index is left unchanged.
+        """
+        value = self.value_of(obj)
+        if self.owner_of(value) not in (None, obj.id):
+            raise ValueError(f"{self.attr} already exists")
+        self.remove(obj.id)
+        if value is not None:
+            self._insert(obj.id, value)
+            self._values[obj.id] = value
+
+    def remove(self, obj_id):
+        """Forget an object, if indexed."""
+        if obj_id in self._values:
+            self._delete(obj_id, self._values.pop(obj_id))
+
+    def owner_of(self, value):
+        """Return the ID of another object already holding `value` (unique indexes)."""
+        return None
+
+    def lookup(self, criterion):
+        """
+        Return the IDs matching a criterion, in a stable order.
+
+        Args:
+            criterion: A value, or a `Range` for sorted indexes.
+        """
+        raise NotImplementedError
+
+    def _insert(self, obj_id, value):
+        raise NotImplementedError
+
+    def _delete(self, obj_id, value):
+        raise NotImplementedError
+
+
+class HashIndex(Index):
+    """Equality index backed by a dict, optionally unique."""
+
+    def __init__(self, attr, unique=False, key=None):
+        """
+        Args:
+            attr (str): Name of the indexed attribute.
+            unique (bool): Reject two objects with the same value.
+            key (callable, optional): See `Index`.
+        """
+        super().__init__(attr, key)
+        self.unique = unique
+        # value -> {id: None}, an insertion-ordered set
+        self._buckets = {}
+
+    def owner_of(self, value):
+        if not self.unique or value is None:
+            return None
+        return next(iter(self._buckets.get(value, ())), None)
+
+    def lookup(self, criterion):
+        if isinstance(criterion, Range):
+            raise ValueError(f"Range lookups need a sorted index on {self.attr}")
+        return list(self._buckets.get(criterion, ()))
+
+    def _insert(self, obj_id, value):
+        self._buckets.setdefault(value, {})[obj_id] = None
+
+    def _delete(self, obj_id, value):
+        bucket = self._buckets[value]
+        del bucket[obj_id]
+        if not bucket:
+            del self._buckets[value]
+
+
+class SortedIndex(Index):
+    """Ordered index answering equality and `Range` lookups with bisection."""
+
+    def __init__(self, attr, key=None):
+        super().__init__(attr, key)
+        # Sorted (value, id) pairs
+        self._entries = []
+
+    def lookup(self, criterion):
+        if not isinstance(criterion, Range):
+            criterion = Range(criterion, criterion)
+        start = 0
+        end = len(self._entries)
+        if criterion.low is not None:
+            start = bisect_left(self._entries, criterion.low, key=lambda entry: entry[0])
+        if criterion.high is not None:
+            end = bisect_right(self._entries, criterion.high, key=lambda entry: entry[0])
+        return [obj_id for _, obj_id in self._entries[start:end]]
+
+    def _insert(self, obj_id, value):
+        insort(self._entries, (value, obj_id))
+
+    def _delete(self, obj_id, value):
+        del self._entries[bisect_left(self._entries, (value, obj_id))]
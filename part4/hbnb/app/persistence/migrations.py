@@ -0,0 +1,57 @@
+"""
+In-place upgrade of an existing database to the current models.
+
+`db.create_all()` only creates missing tables: a database created before
+a column or an index was added to a model (e.g. `places.geohash`, the
+review aggregates, `places.amenity_bitmap`, `amenities.bit`) keeps its
+old tables and every query on the new columns fails with "no such
+column". `upgrade_schema` adds what is missing with ALTER TABLE /
+CREATE INDEX, without touching existing rows; the derived columns are
+then filled by the facade reconcile methods (see migrate_db.py).
+"""
+
+from sqlalchemy import inspect
+from sqlalchemy.schema import CreateColumn
+
+from app.extensions import db
+
+
+def upgrade_schema():
+    """
+    Create missing tables, columns and indexes of the models.
+
+    Added columns take their server default, or NULL. A UNIQUE column is
+    added as a plain column plus a unique index, since SQLite cannot add
+    a constrained column.
+
+    Returns:
+        list[str]: Description of each change, in order (empty if the
+        schema was already current).
+    """
+    engine = db.engine
+    changes = []
+    existing = set(inspect(engine).get_table_names())
+    with engine.begin() as connection:
+        for table in db.metadata.sorted_tables:
+            if table.name not in existing:
+                table.create(connection)
+                changes.append(f"created table {table.name}")
+                continue
+
+            columns = {column['name'] for column in inspect(connection).get_columns(table.name)}
+            for column in table.columns:
+                if column.name in columns:
+                    continue
+                ddl = CreateColumn(column).compile(dialect=engine.dialect)
+                connection.exec_driver_sql(f"ALTER TABLE {table.name} ADD COLUMN {ddl}")
+                changes.append(f"added column {table.name}.{column.name}")
+                if column.unique:
+                    connection.exec_driver_sql(
+                        f"CREATE UNIQUE INDEX uq_{table.name}_{column.name} ON {table.name} ({column.name})")
+
+            indexes = {index['name'] for index in inspect(connection).get_indexes(table.name)}
+            for index in table.indexes:
+                if index.name not in indexes:
+                    index.create(connection)
+                    changes.append(f"created index {index.name}")
+    return changes
@@ -1,5 +1,126 @@
 from abc import ABC, abstractmethod
+from base64 import urlsafe_b64decode, urlsafe_b64encode
+from bisect import bisect_left, bisect_right, insort
+from datetime import datetime
+import json
+from sqlalchemy import and_, func, or_
 from app.extensions import db
+from app.persistence.unit_of_work import commit
+from app.geo import GridIndex
+from app.persistence.indexes import Range
+
+
+def pack_cursor(values):
+    """
+    Encode a list of JSON-serializable sort key values as an opaque cursor.
+
+    Args:
+        values (list): Sort key of the last object of a page.
+
+    Returns:
+        str: URL-safe cursor string.
+    """
+    raw = json.dumps(values).encode('utf-8')
+    return urlsafe_b64encode(raw).decode('ascii').rstrip('=')
+
+
+def unpack_cursor(cursor, size):
+    """
+    Decode a cursor built by `pack_cursor`.
+
+    Args:
+        cursor (str): Cursor string received from a client.
+        size (int): Expected number of values.
+
+    Returns:
+        list: The decoded sort key values.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    try:
+        values = json.loads(urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4)))
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise ValueError("Invalid cursor")
+    return values
+
+
+def encode_cursor(obj):
+    """
+    Build an opaque pagination cursor pointing right after `obj`.
+
+    Args:
+        obj: The last object of a page (must have `created_at` and `id`).
+
+    Returns:
+        str: URL-safe cursor string.
+    """
+    created_at = obj.created_at.isoformat() if obj.created_at else None
+    return pack_cursor([created_at, obj.id])
+
+
+def decode_cursor(cursor):
+    """
+    Decode a cursor built by `encode_cursor`.
+
+    Args:
+        cursor (str): Cursor string received from a client.
+
+    Returns:
+        tuple: (created_at, id) of the last object of the previous page.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    created_at, obj_id = unpack_cursor(cursor, 2)
+    return _decode_key(created_at, obj_id)
+
+
+def _decode_key(created_at, obj_id):
+    """Check and convert the (created_at, id) values of a cursor."""
+    try:
+        created_at = datetime.fromisoformat(created_at) if created_at else None
+    except (TypeError, ValueError):
+        raise ValueError("Invalid cursor")
+    if not isinstance(obj_id, str):
+        raise ValueError("Invalid cursor")
+    return created_at, obj_id
+
+
+def encode_price_cursor(obj):
+    """
+    Build a cursor pointing right after `obj` in (price, created_at, id) order.
+
+    Used by the place listings filtered by price, which are ordered by
+    price first.
+
+    Args:
+        obj: The last place of a page (with `price`, `created_at` and `id`).
+
+    Returns:
+        str: URL-safe cursor string.
+    """
+    created_at = obj.created_at.isoformat() if obj.created_at else None
+    return pack_cursor([obj.price, created_at, obj.id])
+
+
+def decode_price_cursor(cursor):
+    """
+    Decode a cursor built by `encode_price_cursor`.
+
+    Returns:
+        tuple: (price, created_at, id) of the last place of the previous page.
+
+    Raises:
+        ValueError: If the cursor is malformed.
+    """
+    price, created_at, obj_id = unpack_cursor(cursor, 3)
+    if isinstance(price, bool) or not isinstance(price, (int, float)):
+        raise ValueError("Invalid cursor")
+    return (price, *_decode_key(created_at, obj_id))
+
 
 class Repository(ABC):
     """
@@ -17,6 +138,16 @@ class Repository(ABC):
         """
         pass
 
+    def add_all(self, objs):
+        """
+        Persist several new objects.
+
+        Args:
+            objs (list): The objects to be added.
+        """
+        for obj in objs:
+            self.add(obj)
+
     @abstractmethod
     def get(self, obj_id):
         """
@@ -30,6 +161,21 @@ class Repository(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_many(self, obj_ids):
+        """
+        Retrieve several objects by ID in one round-trip.
+
+        Args:
+            obj_ids (iterable): Identifiers of the objects.
+
+        Returns:
+            tuple: (found, missing) where `found` maps each found ID to its
+            object, in the order of `obj_ids`, and `missing` lists the IDs
+            that do not exist.
+        """
+        pass
+
     @abstractmethod
     def get_all(self):
         """
@@ -40,6 +186,24 @@ class Repository(ABC):
         """
         pass
 
+    @abstractmethod
+    def get_page(self, limit, after=None):
+        """
+        Retrieve one page of objects ordered by (created_at, id).
+
+        Args:
+            limit (int or None): Maximum number of objects to return;
+                None returns every object after the cursor.
+            after (str, optional): Cursor returned with the previous page.
+
+        Returns:
+            tuple: (objects, next_cursor), next_cursor being None on the last page.
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        pass
+
     @abstractmethod
     def update(self, obj_id, data):
         """
@@ -75,17 +239,45 @@ class Repository(ABC):
         """
         pass
 
+    @abstractmethod
+    def filter_by(self, **criteria):
+        """
+        Retrieve all objects matching every criterion.
+
+        Args:
+            **criteria: Attribute values to match; a `Range(low, high)`
+                value matches an inclusive range.
+
+        Returns:
+            list: The matching objects.
+        """
+        pass
+
 
 class InMemoryRepository(Repository):
     """
     In-memory implementation of the Repository interface using a dictionary.
 
-    Intended for testing or non-persistent environments.
+    Intended for testing or non-persistent environments. Objects carrying
+    `latitude`/`longitude` are also kept in a grid index for bounding-box
+    searches, and declared secondary indexes (see
+    `app.persistence.indexes`) serve `get_by_attribute` and `filter_by`.
+    Objects modified in place outside `update` must be passed to `reindex`.
     """
 
-    def __init__(self):
-        """Initialize with an empty internal dictionary."""
+    def __init__(self, indexes=()):
+        """
+        Initialize with an empty internal dictionary.
+
+        Args:
+            indexes (iterable[Index]): Secondary indexes to maintain.
+        """
         self._storage = {}
+        self._grid = GridIndex()
+        self._indexes = {index.attr: index for index in indexes}
+        # Page order: sorted (created_at, id) keys, and the key of each object
+        self._order = []
+        self._order_keys = {}
 
     def add(self, obj):
         """
@@ -93,28 +285,124 @@ class InMemoryRepository(Repository):
 
         Args:
             obj: The object (must have a unique 'id' attribute).
+
+        Raises:
+            ValueError: If a unique index already holds one of its values.
         """
+        self._check_unique(obj.id, {attr: index.value_of(obj) for attr, index in self._indexes.items()})
         self._storage[obj.id] = obj
+        self.reindex(obj)
+
+    def reindex(self, obj):
+        """Refresh the index entries of an object modified in place."""
+        self._index_position(obj)
+        self._index_order(obj)
+        for index in self._indexes.values():
+            index.add(obj)
+
+    def _index_order(self, obj):
+        """Insert the object in the page order, or move it if its key changed."""
+        key = self._sort_key(obj)
+        old = self._order_keys.get(obj.id)
+        if old == key:
+            return
+        if old is not None:
+            del self._order[bisect_left(self._order, old)]
+        insort(self._order, key)
+        self._order_keys[obj.id] = key
+
+    def _check_unique(self, obj_id, values):
+        """Raise ValueError if a unique index holds one of `values` for another object."""
+        for attr, value in values.items():
+            index = self._indexes.get(attr)
+            if index is not None and index.owner_of(value) not in (None, obj_id):
+                raise ValueError(f"{attr} already exists")
+
+    def _index_position(self, obj):
+        """Index the object in the spatial grid if it has coordinates."""
+        latitude = getattr(obj, 'latitude', None)
+        longitude = getattr(obj, 'longitude', None)
+        if latitude is not None and longitude is not None:
+            self._grid.add(obj.id, latitude, longitude)
 
     def get(self, obj_id):
         """Return the object by ID, or None if not found."""
         return self._storage.get(obj_id)
 
+    def get_many(self, obj_ids):
+        """Return ({id: object} for the found IDs, [missing IDs])."""
+        found, missing = {}, []
+        for obj_id in dict.fromkeys(obj_ids):
+            obj = self._storage.get(obj_id)
+            if obj is None:
+                missing.append(obj_id)
+            else:
+                found[obj_id] = obj
+        return found, missing
+
     def get_all(self):
         """Return all stored objects."""
         return list(self._storage.values())
 
+    def get_collection_state(self):
+        """Return (number of objects, latest updated_at)."""
+        return len(self._storage), max(
+            (obj.updated_at for obj in self._storage.values() if obj.updated_at), default=None)
+
+    def get_page(self, limit, after=None):
+        """
+        Return one page of objects ordered by (created_at, id).
+
+        The page order is kept sorted as objects are added, so a page is
+        found by bisection instead of sorting the storage.
+
+        Args:
+            limit (int or None): Maximum number of objects to return;
+                None returns every object after the cursor.
+            after (str, optional): Cursor returned with the previous page.
+
+        Returns:
+            tuple: (objects, next_cursor).
+        """
+        start = 0
+        if after:
+            created_at, obj_id = decode_cursor(after)
+            start = bisect_right(self._order, (created_at or datetime.min, obj_id))
+        end = len(self._order) if limit is None else start + limit
+        page = [self._storage[obj_id] for _, obj_id in self._order[start:end]]
+        has_more = end < len(self._order)
+        return page, encode_cursor(page[-1]) if has_more and page else None
+
+    @staticmethod
+    def _sort_key(obj):
+        """Ordering key shared by pages and cursors."""
+        return (getattr(obj, 'created_at', None) or datetime.min, obj.id)
+
     def update(self, obj_id, data):
         """
         Update the object with the given data if it exists.
 
+        Unique values are checked before the object is modified.
+
         Args:
             obj_id: Identifier of the object.
             data (dict): Data to update.
+
+        Returns:
+            The updated object, or None if not found.
+
+        Raises:
+            ValueError: If the data is invalid or breaks a unique index.
         """
         obj = self.get(obj_id)
         if obj:
-            obj.update(data)
+            self._check_unique(obj_id, data)
+            try:
+                obj.update(data)
+            finally:
+                # Validation may fail after some fields were already set
+                self.reindex(obj)
+        return obj
 
     def delete(self, obj_id):
         """
@@ -125,6 +413,30 @@ class InMemoryRepository(Repository):
         """
         if obj_id in self._storage:
             del self._storage[obj_id]
+            self._grid.remove(obj_id)
+            del self._order[bisect_left(self._order, self._order_keys.pop(obj_id))]
+            for index in self._indexes.values():
+                index.remove(obj_id)
+
+    def get_in_bbox(self, south, west, north, east, profile=None):
+        """
+        Return the objects located inside a bounding box.
+
+        Only the grid cells overlapping the box are visited.
+
+        Args:
+            south, west, north, east (float): Box bounds in degrees.
+            profile: Ignored, accepted for parity with SQL repositories.
+
+        Returns:
+            list: Objects whose coordinates fall inside the box.
+        """
+        found = []
+        for obj_id in self._grid.candidates(south, west, north, east):
+            obj = self._storage[obj_id]
+            if south <= obj.latitude <= north and west <= obj.longitude <= east:
+                found.append(obj)
+        return found
 
     def get_by_attribute(self, attr_name, attr_value):
         """
@@ -137,34 +449,149 @@ class InMemoryRepository(Repository):
         Returns:
             Matching object or None.
         """
+        index = self._indexes.get(attr_name)
+        if index is not None:
+            obj_ids = index.lookup(attr_value)
+            return self._storage[obj_ids[0]] if obj_ids else None
         return next((obj for obj in self._storage.values() if getattr(obj, attr_name) == attr_value), None)
 
+    def filter_by(self, **criteria):
+        """
+        Return all objects matching every criterion.
+
+        Indexed criteria are resolved first, starting from the most
+        selective one; the others are checked on the remaining candidates
+        only. Without any indexed criterion the whole storage is scanned.
+
+        Args:
+            **criteria: Attribute values to match; a `Range(low, high)`
+                value matches an inclusive range.
+
+        Returns:
+            list: The matching objects, in index (or insertion) order.
+        """
+        matches = sorted((self._indexes[attr].lookup(value) for attr, value in criteria.items()
+                          if attr in self._indexes), key=len)
+        others = [(attr, value) for attr, value in criteria.items() if attr not in self._indexes]
+        if matches:
+            first, rest = matches[0], [set(obj_ids) for obj_ids in matches[1:]]
+            candidates = (self._storage[obj_id] for obj_id in first
+                          if all(obj_id in obj_ids for obj_ids in rest))
+        else:
+            candidates = self._storage.values()
+        return [obj for obj in candidates if all(_matches(obj, attr, value) for attr, value in others)]
+
+
+def _matches(obj, attr, criterion):
+    """Check one `filter_by` criterion against an object."""
+    value = getattr(obj, attr)
+    if isinstance(criterion, Range):
+        return value is not None and (criterion.low is None or value >= criterion.low) \
+            and (criterion.high is None or value <= criterion.high)
+    return value == criterion
+
 
 class SQLAlchemyRepository(Repository):
     """
     SQLAlchemy-backed implementation of the Repository interface.
 
     Provides persistent storage using the configured database session.
+
+    Read methods accept an optional loading `profile`: the name of a set
+    of loader options (joinedload, selectinload...) registered for the
+    model, so callers fetch the relationships they are about to
+    serialize in a fixed number of queries instead of one lazy SELECT
+    per object.
     """
 
-    def __init__(self, model):
+    def __init__(self, model, profiles=None):
         """
         Initialize with a SQLAlchemy model.
 
         Args:
             model: The SQLAlchemy model class to manage.
+            profiles (dict, optional): Maps a profile name to a callable
+                returning the list of loader options to apply.
         """
         self.model = model
+        self.profiles = profiles or {}
+
+    def query(self, profile=None):
+        """
+        Build a query on the model with the loader options of a profile.
+
+        Args:
+            profile (str, optional): Name of a registered loading profile.
+
+        Returns:
+            Query: The base query for this model.
+
+        Raises:
+            KeyError: If the profile is not registered.
+        """
+        query = self.model.query
+        if profile:
+            query = query.options(*self.profiles[profile]())
+        return query
 
     def add(self, obj):
-        """Add and persist the object."""
+        """
+        Add and persist the object.
+
+        Inside a unit of work the commit is deferred to the end of it.
+
+        Raises:
+            SQLAlchemyError: If the commit fails (e.g. a unique constraint
+                is violated). The session is rolled back before re-raising.
+        """
         db.session.add(obj)
-        db.session.commit()
+        commit()
 
-    def get(self, obj_id):
-        """Fetch the object by primary key."""
+    def add_all(self, objs):
+        """
+        Add and persist several objects with batched INSERT statements.
+
+        The session is flushed so the objects get their IDs (and
+        constraint violations surface) even inside a unit of work.
+
+        Raises:
+            SQLAlchemyError: If the flush or commit fails. The session is
+                rolled back before re-raising.
+        """
+        db.session.add_all(objs)
+        try:
+            db.session.flush()
+        except Exception:
+            db.session.rollback()
+            raise
+        commit()
+
+    def get(self, obj_id, profile=None):
+        """Fetch the object by primary key, optionally with a loading profile."""
+        if profile:
+            return self.query(profile).filter(self.model.id == obj_id).first()
         return self.model.query.get(obj_id)
 
+    def get_many(self, obj_ids, profile=None):
+        """
+        Fetch several objects by primary key with a single IN query.
+
+        Args:
+            obj_ids (iterable): Primary keys to fetch (duplicates are ignored).
+            profile (str, optional): Name of a registered loading profile.
+
+        Returns:
+            tuple: (found, missing) where `found` maps each found ID to its
+            object, in the order of `obj_ids`, and `missing` lists the IDs
+            that do not exist.
+        """
+        obj_ids = list(dict.fromkeys(obj_ids))
+        if not obj_ids:
+            return {}, []
+        rows = {obj.id: obj for obj in self.query(profile).filter(self.model.id.in_(obj_ids))}
+        found = {obj_id: rows[obj_id] for obj_id in obj_ids if obj_id in rows}
+        return found, [obj_id for obj_id in obj_ids if obj_id not in rows]
+
     def get_with_options(self, obj_id, options=None):
         query = self.model.query
         if options:
@@ -172,9 +599,101 @@ class SQLAlchemyRepository(Repository):
                 query = query.options(option)
         return query.filter(self.model.id == obj_id).first()
 
-    def get_all(self):
+    def get_all(self, profile=None):
         """Return all rows from the table."""
-        return self.model.query.all()
+        return self.query(profile).all()
+
+    def get_collection_state(self):
+        """
+        Return (row count, latest updated_at) of the table in one query.
+
+        Any insert, update or delete changes the pair, which makes it a
+        cheap version marker for collection ETags.
+        """
+        count, last_update = db.session.query(
+            func.count(self.model.id), func.max(self.model.updated_at)
+        ).one()
+        return count, last_update
+
+    def get_page(self, limit, after=None, profile=None):
+        """
+        Return one page of rows ordered by (created_at, id).
+
+        Uses keyset pagination: the cursor is turned into a WHERE clause
+        on the indexed `created_at` column instead of an OFFSET, so deep
+        pages cost the same as the first one.
+
+        Args:
+            limit (int): Maximum number of rows to return.
+            after (str, optional): Cursor returned with the previous page.
+            profile (str, optional): Name of a registered loading profile.
+
+        Returns:
+            tuple: (rows, next_cursor).
+        """
+        return self.paginate(self.query(profile), limit, after)
+
+    def _page_order(self):
+        """Return the ORDER BY of pages and streams: (created_at, id), NULL created_at first."""
+        return self.model.created_at.nulls_first(), self.model.id
+
+    def _after(self, created_at, obj_id):
+        """Return the condition selecting the rows after (created_at, id) in page order."""
+        if created_at is None:
+            # Rows without created_at come first, as datetime.min in memory
+            return or_(
+                self.model.created_at.isnot(None),
+                and_(self.model.created_at.is_(None), self.model.id > obj_id)
+            )
+        return or_(
+            self.model.created_at > created_at,
+            and_(self.model.created_at == created_at, self.model.id > obj_id)
+        )
+
+    def paginate(self, query, limit, after=None):
+        """
+        Apply keyset pagination to an arbitrary query on this model.
+
+        Args:
+            query: SQLAlchemy query selecting rows of `self.model`.
+            limit (int or None): Maximum number of rows to return; None
+                returns every row after the cursor.
+            after (str, optional): Cursor returned with the previous page.
+
+        Returns:
+            tuple: (rows, next_cursor).
+        """
+        if after:
+            query = query.filter(self._after(*decode_cursor(after)))
+        query = query.order_by(*self._page_order())
+        if limit is None:
+            return query.all(), None
+        # Fetch one extra row to know whether another page exists
+        rows = query.limit(limit + 1).all()
+        if len(rows) > limit:
+            return rows[:limit], encode_cursor(rows[limit - 1])
+        return rows, None
+
+    def stream(self, query=None, batch_size=1000):
+        """
+        Iterate over rows ordered by (created_at, id) without loading them all.
+
+        Rows are fetched `batch_size` at a time from the database cursor
+        (`yield_per`), so memory use does not grow with the table size.
+        Collection loader options (selectinload) cannot be combined with it.
+
+        Args:
+            query (optional): Query selecting rows of `self.model`;
+                defaults to the whole table.
+            batch_size (int): Number of rows fetched per round-trip.
+
+        Yields:
+            Rows of the model, oldest first.
+        """
+        if query is None:
+            query = self.model.query
+        query = query.order_by(*self._page_order())
+        yield from query.yield_per(batch_size)
 
     def update(self, obj_id, data):
         """
@@ -188,7 +707,7 @@ class SQLAlchemyRepository(Repository):
         if obj:
             for key, value in data.items():
                 setattr(obj, key, value)
-            db.session.commit()
+            commit()
 
     def delete(self, obj_id):
         """
@@ -200,7 +719,7 @@ class SQLAlchemyRepository(Repository):
         obj = self.get(obj_id)
         if obj:
             db.session.delete(obj)
-            db.session.commit()
+            commit()
 
     def get_by_attribute(self, attr_name, attr_value):
         """
@@ -215,3 +734,39 @@ class SQLAlchemyRepository(Repository):
         """
         return self.model.query.filter(getattr(self.model, attr_name) == attr_value).first()
 
+    def filter_by(self, **criteria):
+        """
+        Return all rows matching every criterion, ordered by (created_at, id).
+
+        Args:
+            **criteria: Column values to match; a `Range(low, high)` value
+                matches an inclusive range.
+        """
+        query = self.model.query
+        for attr_name, value in criteria.items():
+            column = getattr(self.model, attr_name)
+            if isinstance(value, Range):
+                if value.low is not None:
+                    query = query.filter(column >= value.low)
+                if value.high is not None:
+                    query = query.filter(column <= value.high)
+            else:
+                query = query.filter(column == value)
+        return query.order_by(*self._page_order()).all()
+
+    def get_by_attribute_in(self, attr_name, values):
+        """
+        Fetch the objects whose attribute is one of `values` with one IN query.
+
+        Args:
+            attr_name (str): Column name.
+            values (iterable): Values to match.
+
+        Returns:
+            list: Matching rows (empty without querying if `values` is empty).
+        """
+        values = list(values)
+        if not values:
+            return []
+        return self.model.query.filter(getattr(self.model, attr_name).in_(values)).all()
+
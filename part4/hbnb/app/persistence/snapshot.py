@@ -0,0 +1,462 @@
+"""
+Memory-mapped, read-only snapshot of the places and amenities.
+
+Every worker process builds its own facade and would otherwise load the
+same place rows as Python objects. `export_snapshot` writes the tables
+once into a compact binary file that every worker maps with `mmap`: the
+pages are shared through the OS page cache, and the columns are read in
+place through `memoryview` casts, without copying or unpickling.
+
+File layout (little-endian, sections aligned on 8 bytes):
+
+    header       magic, format version, number of sections
+    directory    one (name, typecode, offset, item count) entry per section
+    sections     fixed-width columns (price, latitude, longitude, ...)
+
+Places are stored in page order (created_at, id). A string column is two
+sections: `name` holds the N + 1 offsets of each value in `name.data`,
+the concatenated UTF-8 bytes. Two permutations of the place rows, sorted
+by (price, row) and by latitude, answer price filters and bounding boxes
+by bisection: a price-filtered page starts at the bisected cursor
+position and is read in order, without sorting. The amenities of each
+place are stored the same way as the strings (offsets into a column of
+amenity row numbers).
+
+The snapshot only changes when it is exported again: writes made since
+then do not show up in listings and searches served from it. Exports
+replace the file atomically, and workers map the new file on their next
+read (processes still reading the old one keep their mapping).
+
+Configuration keys:
+    PLACE_SNAPSHOT_PATH: Snapshot to serve place listings and searches
+        from; unset, or while the file does not exist, they query the
+        database.
+"""
+
+import mmap
+import os
+import struct
+import sys
+import threading
+from array import array
+from bisect import bisect_left, bisect_right
+from collections import namedtuple
+from datetime import datetime, timedelta
+from itertools import islice
+
+from sqlalchemy import select
+
+from app.extensions import db
+from app.persistence.repository import decode_cursor, decode_price_cursor, encode_cursor, encode_price_cursor
+
+MAGIC = b'HBNBSNAP'
+FORMAT_VERSION = 1
+# magic, format version, number of sections
+_HEADER = struct.Struct('<8sII')
+# section name, typecode, offset, number of items
+_ENTRY = struct.Struct('<24sc7xQQ')
+_ALIGN = 8
+# Stored in the timestamp columns for NULL
+_NULL_TIME = -2 ** 63
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+class SnapshotPlace(namedtuple('SnapshotPlace', 'id title description price latitude longitude '
+                                                'owner_id review_count rating_sum created_at updated_at')):
+    """One place row read from a snapshot, with the attributes of the list views."""
+
+    __slots__ = ()
+
+    @property
+    def average_rating(self):
+        """Average review rating, or None when the place has no review."""
+        if not self.review_count:
+            return None
+        return self.rating_sum / self.review_count
+
+
+def _to_micros(value):
+    return _NULL_TIME if value is None else (value - _EPOCH) // _MICROSECOND
+
+
+def _from_micros(value):
+    return None if value == _NULL_TIME else _EPOCH + value * _MICROSECOND
+
+
+def _strings(name, values):
+    """Return the (offsets, data) sections of a string column."""
+    offsets = array('Q', [0])
+    data = bytearray()
+    for value in values:
+        data += value.encode('utf-8')
+        offsets.append(len(data))
+    return [(name, offsets), (name + '.data', array('B', data))]
+
+
+def _nested(name, groups):
+    """Return the (offsets, items) sections of a column of integer lists."""
+    offsets = array('I', [0])
+    items = array('I')
+    for group in groups:
+        items.extend(group)
+        offsets.append(len(items))
+    return [(name, offsets), (name + '.items', items)]
+
+
+def _sort_key(row):
+    """Page order, shared with the SQL repositories."""
+    return (row.created_at or datetime.min, row.id)
+
+
+def write_snapshot(path, places, amenities, links):
+    """
+    Write a snapshot file, atomically replacing `path`.
+
+    Args:
+        path (str): Destination file.
+        places (iterable): Rows with the `SnapshotPlace` fields.
+        amenities (iterable): Rows with id, name, created_at and updated_at.
+        links (iterable): (place_id, amenity_id) pairs.
+
+    Returns:
+        tuple: (number of places, number of amenities) written.
+    """
+    places = sorted(places, key=_sort_key)
+    amenities = sorted(amenities, key=_sort_key)
+    amenity_rows = {amenity.id: row for row, amenity in enumerate(amenities)}
+    place_amenities = {}
+    for place_id, amenity_id in links:
+        if amenity_id in amenity_rows:
+            place_amenities.setdefault(place_id, []).append(amenity_rows[amenity_id])
+    rows = range(len(places))
+
+    def timestamps(objs, attr):
+        return array('q', (_to_micros(getattr(obj, attr)) for obj in objs))
+
+    def last_update(objs):
+        return max((obj.updated_at for obj in objs if obj.updated_at), default=None)
+
+    sections = [
+        ('meta', array('q', [_to_micros(last_update(places)), _to_micros(last_update(amenities))])),
+        ('place.created_at', timestamps(places, 'created_at')),
+        ('place.updated_at', timestamps(places, 'updated_at')),
+        ('place.price', array('d', (place.price for place in places))),
+        ('place.latitude', array('d', (place.latitude for place in places))),
+        ('place.longitude', array('d', (place.longitude for place in places))),
+        ('place.review_count', array('q', (place.review_count or 0 for place in places))),
+        ('place.rating_sum', array('q', (place.rating_sum or 0 for place in places))),
+        # Rows are in page order, so ties on price stay in (created_at, id) order
+        ('place.by_price', array('I', sorted(rows, key=lambda row: (places[row].price, row)))),
+        ('place.by_latitude', array('I', sorted(rows, key=lambda row: places[row].latitude))),
+        *_strings('place.id', (place.id for place in places)),
+        *_strings('place.title', (place.title for place in places)),
+        *_strings('place.description', (place.description for place in places)),
+        *_strings('place.owner_id', (place.owner_id for place in places)),
+        *_nested('place.amenities', (sorted(place_amenities.get(place.id, ())) for place in places)),
+        *_strings('amenity.id', (amenity.id for amenity in amenities)),
+        *_strings('amenity.name', (amenity.name for amenity in amenities)),
+        ('amenity.created_at', timestamps(amenities, 'created_at')),
+        ('amenity.updated_at', timestamps(amenities, 'updated_at')),
+    ]
+
+    offset = _HEADER.size + _ENTRY.size * len(sections)
+    directory = []
+    for name, values in sections:
+        offset += -offset % _ALIGN
+        directory.append(_ENTRY.pack(name.encode('ascii'), values.typecode.encode('ascii'), offset, len(values)))
+        offset += len(values) * values.itemsize
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as snapshot:
+        snapshot.write(_HEADER.pack(MAGIC, FORMAT_VERSION, len(sections)))
+        snapshot.write(b''.join(directory))
+        for _, values in sections:
+            snapshot.write(b'\0' * (-snapshot.tell() % _ALIGN))
+            if sys.byteorder != 'little':
+                values.byteswap()
+            values.tofile(snapshot)
+        snapshot.flush()
+        os.fsync(snapshot.fileno())
+    os.replace(tmp_path, path)
+    return len(places), len(amenities)
+
+
+def export_snapshot(path):
+    """
+    Export the places and amenities of the app database to a snapshot file.
+
+    Must run inside an application context.
+
+    Returns:
+        tuple: (number of places, number of amenities) exported.
+    """
+    tables = db.metadata.tables
+    places, amenities, links = tables['places'], tables['amenities'], tables['place_amenities']
+    place_rows = db.session.execute(select(*(places.c[field] for field in SnapshotPlace._fields))).all()
+    amenity_rows = db.session.execute(
+        select(amenities.c.id, amenities.c.name, amenities.c.created_at, amenities.c.updated_at)
+    ).all()
+    link_rows = db.session.execute(select(links.c.place_id, links.c.amenity_id)).all()
+    return write_snapshot(path, place_rows, amenity_rows, link_rows)
+
+
+class _StringColumn:
+    """Read-only sequence of the strings of a column, decoded on access."""
+
+    def __init__(self, offsets, data):
+        self._offsets = offsets
+        self._data = data
+
+    def __len__(self):
+        return len(self._offsets) - 1
+
+    def __getitem__(self, row):
+        return str(self._data[self._offsets[row]:self._offsets[row + 1]], 'utf-8')
+
+
+class MappedSnapshot:
+    """
+    Zero-copy reader of a snapshot file.
+
+    The columns are `memoryview`s over the mapped file: reading a price
+    or a coordinate touches the shared page, and only the rows returned
+    to the caller become Python objects.
+
+    Methods:
+        place(row): Return the `SnapshotPlace` at a row.
+        get_page(limit, after, **filters): One page in (created_at, id) order.
+        get_in_bbox(south, west, north, east, **filters): Places in a box.
+        get_collection_state(): Return (place count, latest updated_at).
+        close(): Unmap the file.
+    """
+
+    def __init__(self, path):
+        """
+        Args:
+            path (str): Snapshot written by `write_snapshot`.
+
+        Raises:
+            ValueError: If the file is not a snapshot of this format.
+        """
+        if sys.byteorder != 'little':
+            raise ValueError("Snapshots can only be mapped on little-endian hosts")
+        with open(path, 'rb') as snapshot:
+            self._mmap = mmap.mmap(snapshot.fileno(), 0, access=mmap.ACCESS_READ)
+        view = memoryview(self._mmap)
+        magic, version, count = _HEADER.unpack_from(view)
+        if magic != MAGIC or version != FORMAT_VERSION:
+            view.release()
+            self._mmap.close()
+            raise ValueError(f"Not a version {FORMAT_VERSION} snapshot: {path}")
+        self._views = [view]
+        self._sections = {}
+        for position in range(count):
+            name, typecode, offset, length = _ENTRY.unpack_from(view, _HEADER.size + position * _ENTRY.size)
+            typecode = typecode.decode('ascii')
+            size = array(typecode).itemsize
+            section = view[offset:offset + length * size].cast(typecode)
+            self._views.append(section)
+            self._sections[name.rstrip(b'\0').decode('ascii')] = section
+
+        self.size = len(self._sections['place.price'])
+        self.price = self._sections['place.price']
+        self.latitude = self._sections['place.latitude']
+        self.longitude = self._sections['place.longitude']
+        self.review_count = self._sections['place.review_count']
+        self.rating_sum = self._sections['place.rating_sum']
+        self.ids = self._string_column('place.id')
+        self._titles = self._string_column('place.title')
+        self._descriptions = self._string_column('place.description')
+        self._owner_ids = self._string_column('place.owner_id')
+        self._created_at = self._sections['place.created_at']
+        self._updated_at = self._sections['place.updated_at']
+        self._by_price = self._sections['place.by_price']
+        self._by_latitude = self._sections['place.by_latitude']
+        self._amenities = self._sections['place.amenities']
+        self._amenity_items = self._sections['place.amenities.items']
+        self._amenity_ids = self._string_column('amenity.id')
+        # Few rows: a dict turns filter IDs into row numbers
+        self._amenity_rows = {self._amenity_ids[row]: row for row in range(len(self._amenity_ids))}
+
+    def _string_column(self, name):
+        return _StringColumn(self._sections[name], self._sections[name + '.data'])
+
+    def __len__(self):
+        return self.size
+
+    def place(self, row):
+        """Return the place stored at `row`."""
+        return SnapshotPlace(
+            self.ids[row],
+            self._titles[row],
+            self._descriptions[row],
+            self.price[row],
+            self.latitude[row],
+            self.longitude[row],
+            self._owner_ids[row],
+            self.review_count[row],
+            self.rating_sum[row],
+            _from_micros(self._created_at[row]),
+            _from_micros(self._updated_at[row]),
+        )
+
+    def amenity_ids(self, row):
+        """Return the amenity IDs of the place at `row`."""
+        return [self._amenity_ids[item] for item in self._amenity_items[self._amenities[row]:self._amenities[row + 1]]]
+
+    def _row_key(self, row):
+        created_at = _from_micros(self._created_at[row])
+        return (created_at or datetime.min, self.ids[row])
+
+    def _price_rows(self, min_price, max_price, after=None):
+        """Return the rows within a price range, after a price cursor, in (price, created_at, id) order."""
+        start, end = 0, self.size
+        if min_price is not None:
+            start = bisect_left(self._by_price, min_price, key=self.price.__getitem__)
+        if max_price is not None:
+            end = bisect_right(self._by_price, max_price, key=self.price.__getitem__)
+        if after:
+            price, created_at, obj_id = decode_price_cursor(after)
+            start = bisect_right(self._by_price, (price, created_at or datetime.min, obj_id), start, max(start, end),
+                                 key=lambda row: (self.price[row], *self._row_key(row)))
+        return self._by_price[start:end]
+
+    def _matches(self, rows, min_price=None, max_price=None, amenity_ids=None, min_rating=None):
+        """
+        Yield the rows accepted by the filters of the place repository.
+
+        Places must have every amenity of `amenity_ids`; an unknown
+        amenity ID matches nothing.
+        """
+        wanted = None
+        if amenity_ids:
+            try:
+                wanted = {self._amenity_rows[amenity_id] for amenity_id in amenity_ids}
+            except KeyError:
+                return
+        price, review_count, rating_sum = self.price, self.review_count, self.rating_sum
+        for row in rows:
+            if min_price is not None and price[row] < min_price:
+                continue
+            if max_price is not None and price[row] > max_price:
+                continue
+            if min_rating is not None and (not review_count[row]
+                                           or rating_sum[row] / review_count[row] < min_rating):
+                continue
+            if wanted and not wanted.issubset(self._amenity_items[self._amenities[row]:self._amenities[row + 1]]):
+                continue
+            yield row
+
+    def get_page(self, limit, after=None, **filters):
+        """
+        Return one page of places ordered by (created_at, id), or by
+        (price, created_at, id) when a price bound is given.
+
+        Cursors are interchangeable with the place repository ones.
+
+        Args:
+            limit (int or None): Maximum number of places to return (None: all).
+            after (str, optional): Cursor returned with the previous page.
+            **filters: min_price, max_price, amenity_ids and min_rating.
+
+        Returns:
+            tuple: (places, next_cursor).
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        if filters.get('min_price') is not None or filters.get('max_price') is not None:
+            rows = self._price_rows(filters.get('min_price'), filters.get('max_price'), after)
+            encode = encode_price_cursor
+        else:
+            start = 0
+            if after:
+                created_at, obj_id = decode_cursor(after)
+                start = bisect_right(range(self.size), (created_at or datetime.min, obj_id), key=self._row_key)
+            rows = range(start, self.size)
+            encode = encode_cursor
+        page = [self.place(row) for row in islice(self._matches(rows, **filters),
+                                                  None if limit is None else limit + 1)]
+        if limit is not None and len(page) > limit:
+            return page[:limit], encode(page[limit - 1])
+        return page, None
+
+    def get_in_bbox(self, south, west, north, east, **filters):
+        """
+        Return the places inside a bounding box.
+
+        Candidates come from bisecting the latitude order; longitudes and
+        filters are then checked on the mapped columns.
+
+        Args:
+            south, west, north, east (float): Box bounds in degrees.
+            **filters: min_price, max_price, amenity_ids and min_rating.
+
+        Returns:
+            list[SnapshotPlace]: Places inside the box.
+        """
+        start = bisect_left(self._by_latitude, south, key=self.latitude.__getitem__)
+        end = bisect_right(self._by_latitude, north, key=self.latitude.__getitem__)
+        longitude = self.longitude
+        rows = sorted(row for row in self._by_latitude[start:end] if west <= longitude[row] <= east)
+        return [self.place(row) for row in self._matches(rows, **filters)]
+
+    def get_collection_state(self):
+        """Return (number of places, latest updated_at) at export time."""
+        return self.size, _from_micros(self._sections['meta'][0])
+
+    def close(self):
+        """Release the column views and unmap the file."""
+        for view in reversed(self._views):
+            view.release()
+        self._views = []
+        self._sections = {}
+        self._mmap.close()
+
+
+class PlaceSnapshot:
+    """
+    Flask extension serving place reads from the configured snapshot file.
+
+    Methods:
+        init_app(app): Read PLACE_SNAPSHOT_PATH.
+        current(): Return the `MappedSnapshot` to read from, or None.
+    """
+
+    def __init__(self):
+        self.path = None
+        self._mapped = None
+        self._stamp = None
+        self._lock = threading.Lock()
+
+    def init_app(self, app):
+        """Read PLACE_SNAPSHOT_PATH; the file is mapped on first use."""
+        self.path = app.config.get('PLACE_SNAPSHOT_PATH')
+        self._mapped = self._stamp = None
+        app.extensions['place_snapshot'] = self
+
+    def current(self):
+        """
+        Return the mapped snapshot, or None to read from the database.
+
+        The file is mapped again when an export replaced it. The previous
+        mapping is not closed: requests still reading it keep it alive.
+        """
+        if not self.path:
+            return None
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        stamp = (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+        if stamp != self._stamp:
+            with self._lock:
+                if stamp != self._stamp:
+                    self._mapped = MappedSnapshot(self.path)
+                    self._stamp = stamp
+        return self._mapped
+
+
+# Shared by the facade, configured by create_app
+place_snapshot = PlaceSnapshot()
@@ -0,0 +1,95 @@
+"""
+Unit of work for the SQLAlchemy session.
+
+Repositories and `BaseModel.save` used to commit after every write, so a
+single facade operation (e.g. create a review and update the place
+aggregates) issued several commits, each one an fsync, and could leave
+half of its writes behind on error.
+
+Inside `unit_of_work()` those intermediate commits are skipped: the
+session commits once when the outermost block exits, or rolls back if it
+raises. Blocks can be nested; only the outermost one commits.
+
+SAVEPOINTs (`session.begin_nested()`) need SQLite transactions to be
+started by SQLAlchemy: pysqlite only emits BEGIN before the first write,
+so a SAVEPOINT issued first would open the transaction itself, and
+releasing it would commit. The engine hooks below turn off pysqlite's
+own transaction handling and emit BEGIN when SQLAlchemy begins.
+"""
+
+import sqlite3
+from contextlib import contextmanager
+from functools import wraps
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.extensions import db
+
+_DEPTH_KEY = 'unit_of_work_depth'
+
+
+@event.listens_for(Engine, 'connect')
+def _sqlite_connect(dbapi_connection, connection_record):
+    """Stop pysqlite from starting transactions on its own."""
+    if isinstance(dbapi_connection, sqlite3.Connection):
+        dbapi_connection.isolation_level = None
+
+
+@event.listens_for(Engine, 'begin')
+def _sqlite_begin(connection):
+    """Start the SQLite transaction when SQLAlchemy begins one."""
+    if connection.dialect.name == 'sqlite':
+        connection.connection.driver_connection.execute('BEGIN')
+
+
+def in_unit_of_work():
+    """Return True if the current session is inside a unit of work."""
+    return db.session.info.get(_DEPTH_KEY, 0) > 0
+
+
+def commit():
+    """
+    Commit the session, unless a unit of work will commit it later.
+
+    Raises:
+        SQLAlchemyError: If the commit fails. The session is rolled back
+            before re-raising.
+    """
+    if in_unit_of_work():
+        return
+    try:
+        db.session.commit()
+    except Exception:
+        db.session.rollback()
+        raise
+
+
+@contextmanager
+def unit_of_work():
+    """
+    Group the writes of a block into a single transaction.
+
+    Commits once on exit of the outermost block, rolls back if the
+    block raises (e.g. a ValueError from validation).
+    """
+    info = db.session.info
+    depth = info.get(_DEPTH_KEY, 0)
+    info[_DEPTH_KEY] = depth + 1
+    try:
+        yield
+        if depth == 0:
+            db.session.commit()
+    except Exception:
+        if depth == 0:
+            db.session.rollback()
+        raise
+    finally:
+        info[_DEPTH_KEY] = depth
+
+
+def transactional(method):
+    """Decorator running a (facade) method inside a unit of work."""
+    @wraps(method)
+    def wrapper(*args, **kwargs):
+        with unit_of_work():
+            return method(*args, **kwargs)
+    return wrapper
@@ -1,11 +1,25 @@
-from app.persistence.repository import SQLAlchemyRepository
+import math
+from app.persistence.repository import SQLAlchemyRepository, pack_cursor, unpack_cursor
 from app.services.repositories.user_repository import UserRepository
+from app.services.repositories.review_repository import ReviewRepository
+from app.services.repositories.place_repository import PlaceRepository
 from app.models.user import User
-from app.models.amenity import Amenity
+from app.models.amenity import Amenity, assign_bits, insert_amenities
 from app.models.place import Place
 from app.models.review import Review
 from sqlalchemy.orm import joinedload
 from app.validators import is_valid_email
+from app.geo import haversine_km, radius_bbox
+from app.extensions import db
+from app.persistence.unit_of_work import transactional
+from app.persistence.cache import CachedRepository, entity_cache
+from app.persistence.catalog import amenity_catalog
+from app.persistence.snapshot import place_snapshot
+
+# Columns copied from the payload when creating places in bulk
+PLACE_FIELDS = ('title', 'description', 'price', 'latitude', 'longitude')
+# First search radius of search_places: this fraction of the area diagonal
+SEARCH_RADIUS_STEPS = 16
 
 
 class HBnBFacade:
@@ -18,21 +32,51 @@ class HBnBFacade:
         - Place creation and updating
         - Amenity management
         - Review handling
+
+    Write methods are @transactional: all their changes are committed
+    once at the end, or rolled back together if they raise.
     """
 
     def __init__(self):
         """
         Initialize repositories for each model.
+
+        Users, places and amenities are read through the entity cache;
+        amenity listings, ID checks and name lookups are served by the
+        in-memory amenity catalogue. Place listings and searches read the
+        memory-mapped place snapshot instead of the database when one is
+        configured.
         """
-        self.user_repo = UserRepository()
-        self.place_repo = SQLAlchemyRepository(Place)
-        self.review_repo = SQLAlchemyRepository(Review)
-        self.amenity_repo = SQLAlchemyRepository(Amenity)
+        self.user_repo = CachedRepository(UserRepository(), entity_cache, lookups=('email',))
+        self.place_repo = CachedRepository(PlaceRepository(), entity_cache)
+        self.review_repo = ReviewRepository()
+        self.amenity_repo = CachedRepository(SQLAlchemyRepository(Amenity), entity_cache)
+        self.amenity_catalog = amenity_catalog
+        self.place_snapshot = place_snapshot
+
+    def get_collection_state(self, collection):
+        """
+        Return (row count, latest updated_at) of a collection.
+
+        Args:
+            collection (str): "users", "places", "reviews" or "amenities".
+        """
+        snapshot = self.place_snapshot.current()
+        if collection == 'places' and snapshot is not None:
+            return snapshot.get_collection_state()
+        repos = {
+            'users': self.user_repo,
+            'places': self.place_repo,
+            'reviews': self.review_repo,
+            'amenities': self.amenity_catalog,
+        }
+        return repos[collection].get_collection_state()
 
     # -------------------------------
     # User Methods
     # -------------------------------
 
+    @transactional
     def create_user(self, user_data):
         """
         Create and persist a new user after hashing the password.
@@ -56,18 +100,46 @@ class HBnBFacade:
         self.user_repo.add(user)
         return user
 
-    def get_user(self, user_id):
-        """Retrieve a user by ID."""
+    def get_user(self, user_id, fresh=False):
+        """
+        Retrieve a user by ID.
+
+        Args:
+            user_id (str): Target user ID.
+            fresh (bool): Read the row from the database rather than the
+                entity cache, which may lag behind writes made by other
+                workers (e.g. to check an If-Match precondition).
+        """
+        if fresh:
+            return self.user_repo.repository.get(user_id)
         return self.user_repo.get(user_id)
 
-    def get_user_by_email(self, email):
-        """Retrieve a user by their email."""
-        return self.user_repo.get_user_by_email(email)
+    def get_user_by_email(self, email, fresh=False):
+        """
+        Retrieve a user by their email (cached lookup).
+
+        Args:
+            email (str): Email to look up.
+            fresh (bool): Read the row from the database rather than the
+                entity cache (e.g. to verify the current password hash).
+        """
+        if fresh:
+            return self.user_repo.repository.get_by_attribute('email', email)
+        return self.user_repo.get_by_attribute('email', email)
 
     def get_all_users(self):
         """Return all registered users."""
         return self.user_repo.get_all()
 
+    def get_users_page(self, limit, after=None):
+        """Return one page of users and the cursor of the next page."""
+        return self.user_repo.get_page(limit, after)
+
+    def stream_users(self, batch_size=1000):
+        """Iterate over all users, fetched `batch_size` rows at a time."""
+        return self.user_repo.stream(batch_size=batch_size)
+
+    @transactional
     def update_user(self, user_id, user_data):
         """
         Update user attributes.
@@ -89,28 +161,103 @@ class HBnBFacade:
     # Amenity Methods
     # -------------------------------
 
+    @transactional
     def create_amenity(self, amenity_data):
         """Create and save a new amenity."""
 
         if 'name' not in amenity_data or not amenity_data['name']:
             raise ValueError("Amenity name is required")
 
-        existing = self.amenity_repo.get_by_attribute('name', amenity_data.get('name'))
-        if existing:
+        if self.amenity_catalog.id_of(amenity_data['name']) is not None:
             raise ValueError("Amenity with this name already exists")
 
         amenity = Amenity(**amenity_data)
-        self.amenity_repo.add(amenity)
+        insert_amenities(db.session, [amenity])
         return amenity
 
-    def get_amenity(self, amenity_id):
-        """Retrieve an amenity by ID."""
+    @transactional
+    def create_amenities_bulk(self, amenities_data):
+        """
+        Create many amenities in one transaction.
+
+        Existing names are looked up in the amenity catalogue (one query for
+        the names it does not know); names repeated inside the batch are
+        rejected after their first occurrence.
+
+        Args:
+            amenities_data (list[dict]): Amenity data, as for create_amenity.
+
+        Returns:
+            list[dict]: One result per item, in order: {'index', 'id'} if
+            the amenity was created, {'index', 'error'} otherwise.
+        """
+        results = [{'index': index} for index in range(len(amenities_data))]
+        names = [data.get('name') for data in amenities_data]
+        taken = self.amenity_catalog.taken(name for name in names if isinstance(name, str))
+
+        amenities = []
+        for index, name in enumerate(names):
+            if not name:
+                results[index]['error'] = "Amenity name is required"
+            elif not isinstance(name, str) or len(name) > 50:
+                results[index]['error'] = "Invalid name"
+            elif name in taken:
+                results[index]['error'] = "Amenity with this name already exists"
+            else:
+                taken.add(name)
+                amenities.append((index, Amenity(name=name)))
+
+        insert_amenities(db.session, [amenity for _, amenity in amenities])
+        for index, amenity in amenities:
+            results[index]['id'] = amenity.id
+        return results
+
+    def get_amenity(self, amenity_id, fresh=False):
+        """
+        Retrieve an amenity by ID (checked against the catalogue, then the table).
+
+        Args:
+            amenity_id (str): Target amenity ID.
+            fresh (bool): Read the row from the database rather than the
+                entity cache (e.g. to check an If-Match precondition).
+        """
+        if fresh:
+            return self.amenity_repo.repository.get(amenity_id)
+        if self.amenity_catalog.name_of(amenity_id) is None:
+            return None
         return self.amenity_repo.get(amenity_id)
 
+    def _get_amenities(self, amenity_ids):
+        """
+        Fetch amenities by ID, in the given order.
+
+        IDs are checked against the catalogue first (and the table for the
+        IDs it does not know); the objects come from the entity cache.
+
+        Raises:
+            ValueError: If an amenity is not found.
+        """
+        missing = self.amenity_catalog.missing(amenity_ids)
+        if not missing:
+            amenities, missing = self.amenity_repo.get_many(amenity_ids)
+        if missing:
+            raise ValueError(f"Amenity not found: {missing[0]}")
+        return list(amenities.values())
+
     def get_all_amenities(self):
         """Return all amenities."""
         return self.amenity_repo.get_all()
 
+    def get_amenities_page(self, limit, after=None):
+        """
+        Return one page of amenities and the cursor of the next page.
+
+        Served from the catalogue: items are `AmenityEntry` rows (id, name,
+        created_at, updated_at, bit), not ORM objects.
+        """
+        return self.amenity_catalog.get_page(limit, after)
+
+    @transactional
     def update_amenity(self, amenity_id, amenity_data):
         """Update an amenity's data by ID."""
         amenity = self.get_amenity(amenity_id)
@@ -123,6 +270,7 @@ class HBnBFacade:
     # Place Methods
     # -------------------------------
 
+    @transactional
     def create_place(self, place_data):
         """
         Create a new place associated with an owner and optional amenities.
@@ -130,23 +278,8 @@ class HBnBFacade:
         Raises:
             ValueError: If owner or an amenity is not found.
         """
-        # Vérification des champs obligatoires
-        required_fields = ['title', 'description', 'price', 'latitude', 'longitude']
-        for field in required_fields:
-            if field not in place_data or place_data[field] in [None, '']:
-                raise ValueError(f"{field} is required")
-
-        # Validation des champs
-        if not isinstance(place_data['title'], str) or len(place_data['title']) > 50:
-            raise ValueError("Invalid title")
-        if not isinstance(place_data['description'], str) or len(place_data['description']) > 3000:
-            raise ValueError("Invalid description")
-        if not isinstance(place_data['price'], (int, float)) or place_data['price'] <= 0:
-            raise ValueError("Invalid price")
-        if not isinstance(place_data['latitude'], (int, float)) or not (-90 <= place_data['latitude'] <= 90):
-            raise ValueError("Invalid latitude")
-        if not isinstance(place_data['longitude'], (int, float)) or not (-180 <= place_data['longitude'] <= 180):
-            raise ValueError("Invalid longitude")
+        # Vérification des champs
+        self._validate_place_data(place_data)
 
         # 1. Extraire les IDs
         owner_id = place_data.get("owner_id")
@@ -157,13 +290,8 @@ class HBnBFacade:
         if not owner:
             raise ValueError("Owner not found")
 
-        # 3. Récupérer les objets amenity (et valider)
-        amenities = []
-        for amenity_id in amenity_ids:
-            amenity = self.amenity_repo.get(amenity_id)
-            if not amenity:
-                raise ValueError(f"Amenity not found: {amenity_id}")
-            amenities.append(amenity)
+        # 3. Récupérer les objets amenity en une requête (et valider)
+        amenities = self._get_amenities(amenity_ids)
 
         # 4. Nettoyer les données à passer à Place (on retire owner_id et amenities)
         place_fields = place_data.copy()
@@ -182,14 +310,250 @@ class HBnBFacade:
 
         return place
 
-    def get_place(self, place_id):
-        """Retrieve a place by ID."""
-        return self.place_repo.get(place_id)
+    @staticmethod
+    def _validate_place_data(place_data):
+        """
+        Check the fields required to create a place.
+
+        Raises:
+            ValueError: If a field is missing or invalid.
+        """
+        # Vérification des champs obligatoires
+        required_fields = ['title', 'description', 'price', 'latitude', 'longitude']
+        for field in required_fields:
+            if field not in place_data or place_data[field] in [None, '']:
+                raise ValueError(f"{field} is required")
+
+        # Validation des champs
+        if not isinstance(place_data['title'], str) or len(place_data['title']) > 50:
+            raise ValueError("Invalid title")
+        if not isinstance(place_data['description'], str) or len(place_data['description']) > 3000:
+            raise ValueError("Invalid description")
+        if not isinstance(place_data['price'], (int, float)) or place_data['price'] <= 0:
+            raise ValueError("Invalid price")
+        if not isinstance(place_data['latitude'], (int, float)) or not (-90 <= place_data['latitude'] <= 90):
+            raise ValueError("Invalid latitude")
+        if not isinstance(place_data['longitude'], (int, float)) or not (-180 <= place_data['longitude'] <= 180):
+            raise ValueError("Invalid longitude")
+        amenity_ids = place_data.get('amenities', [])
+        if not isinstance(amenity_ids, list) or not all(isinstance(a, str) for a in amenity_ids):
+            raise ValueError("amenities must be a list of IDs")
+        HBnBFacade._validate_ids(place_data, ('owner_id',))
+
+    @staticmethod
+    def _validate_ids(data, fields):
+        """
+        Check that the IDs referenced by `fields` are strings.
+
+        They are used as lookup keys: a list or an object would raise a
+        TypeError (unhashable) instead of a validation error.
+
+        Raises:
+            ValueError: If one of the fields is present but not a string.
+        """
+        for field in fields:
+            if data.get(field) is not None and not isinstance(data[field], str):
+                raise ValueError(f"Invalid {field}")
+
+    @transactional
+    def create_places_bulk(self, places_data):
+        """
+        Create many places in one transaction.
+
+        The whole batch is validated first; owners and amenities referenced
+        by the valid items are then fetched with one IN query each (unknown
+        amenity IDs are filtered out by the catalogue), and the places are
+        inserted together. Invalid items are reported and skipped.
+
+        Args:
+            places_data (list[dict]): Place data, as for create_place.
+
+        Returns:
+            list[dict]: One result per item, in order: {'index', 'id'} if
+            the place was created, {'index', 'error'} otherwise.
+        """
+        results = [{'index': index} for index in range(len(places_data))]
+        valid = []
+        for index, place_data in enumerate(places_data):
+            try:
+                self._validate_place_data(place_data)
+            except ValueError as e:
+                results[index]['error'] = str(e)
+            else:
+                valid.append(index)
+
+        # Une requête IN par type d'objet référencé, pour tout le lot
+        owners, _ = self.user_repo.get_many(places_data[i].get('owner_id') for i in valid)
+        requested = [amenity_id for i in valid for amenity_id in places_data[i].get('amenities', [])]
+        unknown = set(self.amenity_catalog.missing(requested))
+        amenities, _ = self.amenity_repo.get_many(
+            amenity_id for amenity_id in requested if amenity_id not in unknown)
+
+        places = []
+        for index in valid:
+            place_data = places_data[index]
+            owner = owners.get(place_data.get('owner_id'))
+            if not owner:
+                results[index]['error'] = "Owner not found"
+                continue
+            amenity_ids = list(dict.fromkeys(place_data.get('amenities', [])))
+            missing = [amenity_id for amenity_id in amenity_ids if amenity_id not in amenities]
+            if missing:
+                results[index]['error'] = f"Amenity not found: {missing[0]}"
+                continue
+            place = Place(owner=owner, **{field: place_data[field] for field in PLACE_FIELDS})
+            place.amenities = [amenities[amenity_id] for amenity_id in amenity_ids]
+            places.append((index, place))
+
+        self.place_repo.add_all([place for _, place in places])
+        for index, place in places:
+            results[index]['id'] = place.id
+        return results
+
+    def get_place(self, place_id, profile=None):
+        """
+        Retrieve a place by ID.
+
+        Args:
+            place_id (str): Target place ID.
+            profile (str, optional): Loading profile ("list" or "detail")
+                selecting which relationships are fetched eagerly.
+        """
+        return self.place_repo.get(place_id, profile)
+
+    def get_all_places(self, profile='list'):
+        """Return all places, with their owner loaded by default."""
+        return self.place_repo.get_all(profile)
+
+    def get_places_page(self, limit, after=None, profile='list', **filters):
+        """
+        Return one page of places and the cursor of the next page.
+
+        Places are listed oldest first, or cheapest first when a price
+        bound is given.
+
+        Args:
+            limit (int or None): Maximum number of places to return (None: all).
+            after (str, optional): Cursor returned with the previous page.
+            profile (str): Loading profile to apply.
+            **filters: Optional min_price, max_price and amenity_ids
+                (places must have all listed amenities).
+        """
+        snapshot = self.place_snapshot.current()
+        if profile == 'list' and snapshot is not None:
+            return snapshot.get_page(limit, after, **filters)
+        return self.place_repo.get_page(limit, after, profile, **filters)
+
+    def stream_places(self, batch_size=1000, **filters):
+        """
+        Iterate over all places matching optional filters, oldest first.
+
+        Args:
+            batch_size (int): Number of rows fetched per round-trip.
+            **filters: Optional min_price, max_price, amenity_ids and min_rating.
+        """
+        return self.place_repo.stream(batch_size=batch_size, **filters)
+
+    def search_places(self, limit, after=None, bbox=None, near=None, radius_km=None, **filters):
+        """
+        Search places by location, nearest first.
+
+        Either `bbox` or `near` + `radius_km` must be given. Candidates
+        come from the spatial index of the place repository; distances
+        are measured from `near`, or from the center of `bbox`.
+
+        A page only reads the places near its own position: candidates are
+        fetched within a search radius starting at the cursor distance,
+        doubled until one more result than `limit` is found past the
+        cursor (or the radius covers the whole area). Places closer than
+        the radius are all fetched, so the page is exact; its cost depends
+        on how far the page is from the center, not on the area size.
+
+        Args:
+            limit (int or None): Maximum number of places to return (None: all).
+            after (str, optional): Cursor returned with the previous page.
+            bbox (tuple, optional): (south, west, north, east) in degrees.
+            near (tuple, optional): (latitude, longitude) of the center.
+            radius_km (float, optional): Search radius around `near`.
+            **filters: Optional min_price, max_price and amenity_ids.
+
+        Returns:
+            tuple: ([(place, distance_km), ...], next_cursor).
+
+        Raises:
+            ValueError: If the search arguments or the cursor are invalid.
+        """
+        if (bbox is None) == (near is None):
+            raise ValueError("Provide either bbox or near")
+        if near is not None:
+            if not isinstance(radius_km, (int, float)) or radius_km <= 0:
+                raise ValueError("radius_km must be a positive number")
+            center = near
+            bbox = radius_bbox(near[0], near[1], radius_km)
+        else:
+            radius_km = None
+            center = ((bbox[0] + bbox[2]) / 2, (bbox[1] + bbox[3]) / 2)
+
+        last = None
+        if after:
+            last_distance, last_id = unpack_cursor(after, 2)
+            if (isinstance(last_distance, bool) or not isinstance(last_distance, (int, float))
+                    or not isinstance(last_id, str)):
+                raise ValueError("Invalid cursor")
+            # A distance is never negative: a forged one would widen the search radius from far below 0
+            if not (math.isfinite(last_distance) and last_distance >= 0):
+                raise ValueError("Invalid cursor")
+            last = (last_distance, last_id)
+
+        # Le snapshot mappé, s'il existe, évite la base pour les recherches
+        source = self.place_snapshot.current()
+        if source is None:
+            source = self.place_repo
+
+        # Premier rayon : une fraction de la zone, puis doublé à chaque tour
+        south, west, north, east = bbox
+        step = haversine_km(south, west, north, east) / SEARCH_RADIUS_STEPS or 1.0
+        start = last[0] if last else 0.0
+        while True:
+            # Sans limite, toute la zone est lue en un seul tour
+            reach = start + step if limit is not None else math.inf
+            ring = radius_bbox(center[0], center[1], reach)
+            covers = ring[0] <= south and ring[1] <= west and ring[2] >= north and ring[3] >= east
+            box = (max(ring[0], south), max(ring[1], west), min(ring[2], north), min(ring[3], east))
+            results = []
+            for place in source.get_in_bbox(*box, **filters):
+                distance = haversine_km(center[0], center[1], place.latitude, place.longitude)
+                if radius_km is not None and distance > radius_km:
+                    continue
+                # Au-delà du rayon, des places plus proches n'ont peut-être pas été lues : tour suivant
+                if not covers and distance > reach:
+                    continue
+                if last is None or (distance, place.id) > last:
+                    results.append((distance, place.id, place))
+            if covers or (limit is not None and len(results) > limit):
+                break
+            step *= 2
+
+        results.sort(key=lambda result: result[:2])
+        page = results[:limit]
+        next_cursor = pack_cursor(list(page[-1][:2])) if limit is not None and len(results) > limit else None
+        return [(place, distance) for distance, _, place in page], next_cursor
+
+    def get_amenity_facets(self, **filters):
+        """
+        Count the places matching optional filters that have each amenity.
+
+        Args:
+            **filters: Optional min_price, max_price, amenity_ids and min_rating.
 
-    def get_all_places(self):
-        """Return all places."""
-        return self.place_repo.get_all()
+        Returns:
+            list[tuple]: (AmenityEntry, count) for every amenity, in the
+            order of the amenity listing.
+        """
+        counts = self.place_repo.amenity_facets(**filters)
+        return [(entry, counts.get(entry.id, 0)) for entry in self.amenity_catalog.snapshot().entries]
 
+    @transactional
     def update_place(self, place_id, place_data):
         """
         Update place attributes and amenities.
@@ -223,14 +587,7 @@ class HBnBFacade:
 
         # Si des amenities sont fournies : les mettre à jour aussi
         if "amenities" in place_data:
-            new_amenity_ids = place_data.pop("amenities")
-            new_amenities = []
-            for amenity_id in new_amenity_ids:
-                amenity = self.get_amenity(amenity_id)
-                if not amenity:
-                    raise ValueError(f"Amenity not found: {amenity_id}")
-                new_amenities.append(amenity)
-            place.amenities = new_amenities
+            place.amenities = self._get_amenities(place_data.pop("amenities"))
 
         # Mise à jour des autres champs
         place.update(place_data)
@@ -241,6 +598,7 @@ class HBnBFacade:
     # Review Methods
     # -------------------------------
 
+    @transactional
     def create_review(self, review_data):
         """
         Create a review for a given place and user.
@@ -249,6 +607,7 @@ class HBnBFacade:
             ValueError: If user/place not found or data invalid.
         """
         # 1. Extraire les IDs
+        self._validate_ids(review_data, ('user_id', 'place_id'))
         user_id = review_data.get("user_id")
         place_id = review_data.get("place_id")
         rating = review_data.get("rating")
@@ -263,21 +622,19 @@ class HBnBFacade:
         if not place:
             raise ValueError("Place not found")
 
-        # 4. Vérifier que le rating existe
-        if rating is None or not isinstance(rating, int) or not (1 <= rating <= 5):
-            raise ValueError("Rating must be an integer between 1 and 5")
+        # 4. Vérifier le rating et le texte
+        self._validate_review_data(review_data)
 
         # 5. Récupérer le texte
         text = review_data.get("text")
-        if not text or not isinstance(text, str):
-            raise ValueError("Invalid review text")
 
         # 6. Créer le Review
         review = Review(text=text, rating=rating, user_id=user.id, place_id=place.id)
 
-
-        # 7. Ajouter à la place
-        place.reviews.append(review)
+        # 7. Mettre à jour les agrégats de la place (même transaction)
+        #    Les expressions SQL évitent de perdre des mises à jour concurrentes
+        place.review_count = Place.review_count + 1
+        place.rating_sum = Place.rating_sum + rating
 
         # 8. Ajouter au repo
         self.review_repo.add(review)
@@ -285,6 +642,84 @@ class HBnBFacade:
         # 9. Retourner
         return review
 
+    @staticmethod
+    def _validate_review_data(review_data):
+        """
+        Check the rating and text of a new review.
+
+        Raises:
+            ValueError: If the rating or the text is invalid.
+        """
+        rating = review_data.get("rating")
+        if rating is None or not isinstance(rating, int) or not (1 <= rating <= 5):
+            raise ValueError("Rating must be an integer between 1 and 5")
+        text = review_data.get("text")
+        if not text or not isinstance(text, str):
+            raise ValueError("Invalid review text")
+
+    @transactional
+    def create_reviews_bulk(self, reviews_data):
+        """
+        Create many reviews in one transaction.
+
+        Users, places and already reviewed (user, place) pairs are looked
+        up with one query each for the whole batch. A user cannot review
+        their own place nor review a place twice. The rating aggregates
+        of each affected place are updated once.
+
+        Args:
+            reviews_data (list[dict]): Review data, as for create_review.
+
+        Returns:
+            list[dict]: One result per item, in order: {'index', 'id'} if
+            the review was created, {'index', 'error'} otherwise.
+        """
+        results = [{'index': index} for index in range(len(reviews_data))]
+        valid = []
+        for index, review_data in enumerate(reviews_data):
+            try:
+                self._validate_ids(review_data, ('user_id', 'place_id'))
+                self._validate_review_data(review_data)
+            except ValueError as e:
+                results[index]['error'] = str(e)
+            else:
+                valid.append(index)
+
+        users, _ = self.user_repo.get_many(reviews_data[i].get('user_id') for i in valid)
+        places, _ = self.place_repo.get_many(reviews_data[i].get('place_id') for i in valid)
+        reviewed = self.review_repo.get_reviewed_pairs(users, places)
+
+        reviews = []
+        for index in valid:
+            review_data = reviews_data[index]
+            user_id, place_id = review_data.get('user_id'), review_data.get('place_id')
+            if user_id not in users:
+                results[index]['error'] = "User not found"
+            elif place_id not in places:
+                results[index]['error'] = "Place not found"
+            elif places[place_id].owner_id == user_id:
+                results[index]['error'] = "You cannot review your own place."
+            elif (user_id, place_id) in reviewed:
+                results[index]['error'] = "You have already reviewed this place."
+            else:
+                reviewed.add((user_id, place_id))
+                reviews.append((index, Review(text=review_data['text'], rating=review_data['rating'],
+                                              user_id=user_id, place_id=place_id)))
+
+        # Agrégats : une mise à jour par place concernée (même transaction)
+        totals = {}
+        for _, review in reviews:
+            count, rating_sum = totals.get(review.place_id, (0, 0))
+            totals[review.place_id] = (count + 1, rating_sum + review.rating)
+        for place_id, (count, rating_sum) in totals.items():
+            places[place_id].review_count = Place.review_count + count
+            places[place_id].rating_sum = Place.rating_sum + rating_sum
+
+        self.review_repo.add_all([review for _, review in reviews])
+        for index, review in reviews:
+            results[index]['id'] = review.id
+        return results
+
     def get_review(self, review_id):
         """Retrieve a review by ID."""
         return self.review_repo.get_with_options(review_id, options=[joinedload(Review.place)])
@@ -293,10 +728,74 @@ class HBnBFacade:
         """Return all reviews."""
         return self.review_repo.get_all()
 
-    def get_reviews_by_place(self, place_id):
-        """Return all reviews for a given place ID."""
-        return [review for review in self.review_repo.get_all() if review.place.id == place_id]
+    def get_reviews_page(self, limit, after=None):
+        """Return one page of reviews and the cursor of the next page."""
+        return self.review_repo.get_page(limit, after)
+
+    def stream_reviews(self, batch_size=1000):
+        """Iterate over all reviews, fetched `batch_size` rows at a time."""
+        return self.review_repo.stream(batch_size=batch_size)
+
+    def get_reviews_by_place(self, place_id, limit, after=None):
+        """
+        Return one page of the reviews of a given place ID, oldest first.
+
+        Args:
+            place_id (str): Target place ID.
+            limit (int or None): Maximum number of reviews to return (None: all).
+            after (str, optional): Cursor returned with the previous page.
+
+        Returns:
+            tuple: (reviews, next_cursor).
+        """
+        return self.review_repo.get_reviews_by_place(place_id, limit, after)
+
+    def has_user_reviewed_place(self, user_id, place_id):
+        """Return True if the user already reviewed the given place."""
+        return self.review_repo.has_user_reviewed_place(user_id, place_id)
+
+    @transactional
+    def reconcile_geohashes(self):
+        """
+        Recompute the geohash of every place from its coordinates.
+
+        Returns:
+            int: Number of places updated.
+        """
+        updated = self.place_repo.recompute_geohashes()
+        # Bulk UPDATE: the session events do not see which rows changed
+        entity_cache.clear()
+        return updated
+
+    @transactional
+    def reconcile_amenity_bitmaps(self):
+        """
+        Give a bit to the amenities that have none and rebuild the amenity
+        bitmap of every place from the place_amenities table.
+
+        Returns:
+            tuple: (number of amenities given a bit, number of places updated).
+        """
+        assigned = assign_bits(db.session, Amenity.query.filter(Amenity.bit.is_(None)).all())
+        updated = self.place_repo.recompute_amenity_bitmaps()
+        # Bulk UPDATE: the session events do not see which rows changed
+        entity_cache.clear()
+        return assigned, updated
+
+    @transactional
+    def reconcile_place_ratings(self):
+        """
+        Rebuild the review aggregates of every place from the reviews table.
 
+        Returns:
+            int: Number of places updated.
+        """
+        updated = self.place_repo.recompute_rating_aggregates()
+        # Bulk UPDATE: the session events do not see which rows changed
+        entity_cache.clear()
+        return updated
+
+    @transactional
     def update_review(self, review_id, review_data):
         """
         Update a review's content and rating.
@@ -311,10 +810,17 @@ class HBnBFacade:
         review_data.pop("user_id", None)
         review_data.pop("place_id", None)
 
+        # Répercute le changement de note sur les agrégats de la place,
+        # commités avec la review (annulés par le unit of work si la validation échoue)
+        new_rating = review_data.get("rating", review.rating)
+        if isinstance(new_rating, int) and new_rating != review.rating:
+            review.place.rating_sum = Place.rating_sum + (new_rating - review.rating)
+
         # Mise à jour des champs valides
         review.update(review_data)
         return review
 
+    @transactional
     def delete_review(self, review_id):
         """
         Delete a review and remove it from its associated place.
@@ -326,6 +832,10 @@ class HBnBFacade:
         if not review:
             return False
 
+        # Retirer la review des agrégats de la place (même transaction)
+        review.place.review_count = Place.review_count - 1
+        review.place.rating_sum = Place.rating_sum - review.rating
+
         # Retirer la review du repo
         self.review_repo.delete(review_id)
 
@@ -0,0 +1,263 @@
+from sqlalchemy import and_, bindparam, func, literal, or_, select, update
+from sqlalchemy.orm import joinedload, selectinload
+from app.geo import PREFIX_END, cover_bbox, encode_geohash
+from app.models.amenity import Amenity
+from app.models.place import Place, place_amenities
+from app.models.review import Review
+from app.extensions import db
+from app.persistence.catalog import amenity_catalog
+from app.persistence.repository import SQLAlchemyRepository, decode_price_cursor, encode_price_cursor
+from app.persistence.unit_of_work import commit
+
+class PlaceRepository(SQLAlchemyRepository):
+    """
+    Repository class for managing Place entities in the database.
+
+    Inherits:
+        SQLAlchemyRepository: Provides basic CRUD operations.
+
+    Loading profiles:
+        list: Owner joined in the same SELECT, for place listings.
+        detail: Owner, amenities, reviews and review authors, loaded in
+            a constant number of queries for the place detail view.
+    """
+    def __init__(self):
+        """
+        Initialize the PlaceRepository with the Place model and its loading profiles.
+        """
+        super().__init__(Place, profiles={
+            'list': lambda: [joinedload(Place.owner)],
+            'detail': lambda: [
+                joinedload(Place.owner),
+                selectinload(Place.amenities),
+                selectinload(Place.reviews).joinedload(Review.user),
+            ],
+        })
+
+    def filter(self, query, min_price=None, max_price=None, amenity_ids=None, min_rating=None):
+        """
+        Restrict a place query by price range, required amenities and rating.
+
+        Places must have every amenity of `amenity_ids`: amenities with a
+        bit in the catalogue are checked together with one bitwise test on
+        `amenity_bitmap`; the others (not assigned a bit, or unknown) with
+        one GROUP BY ... HAVING COUNT query on the indexed
+        `place_amenities.amenity_id` column.
+
+        Args:
+            query: Query selecting places.
+            min_price (float, optional): Lowest accepted price.
+            max_price (float, optional): Highest accepted price.
+            amenity_ids (list[str], optional): Amenities a place must all have.
+            min_rating (float, optional): Lowest accepted average rating,
+                read from the denormalized aggregates.
+
+        Returns:
+            Query: The filtered query.
+        """
+        if min_rating is not None:
+            query = query.filter(self.model.average_rating >= min_rating)
+        if min_price is not None:
+            query = query.filter(self.model.price >= min_price)
+        if max_price is not None:
+            query = query.filter(self.model.price <= max_price)
+        if amenity_ids:
+            mask, amenity_ids = amenity_catalog.mask_of(amenity_ids)
+            if mask:
+                query = query.filter(self.model.amenity_bitmap.op('&')(mask) == mask)
+        if amenity_ids:
+            with_all = select(place_amenities.c.place_id) \
+                .where(place_amenities.c.amenity_id.in_(amenity_ids)) \
+                .group_by(place_amenities.c.place_id) \
+                .having(func.count() == len(amenity_ids))
+            query = query.filter(self.model.id.in_(with_all))
+        return query
+
+    def amenity_facets(self, **filters):
+        """
+        Count, for each amenity, the places matching optional filters that have it.
+
+        The counts of the amenities with a bit are summed from
+        `amenity_bitmap` in a single pass over the matching places; the
+        others are counted on `place_amenities`.
+
+        Args:
+            **filters: min_price, max_price, amenity_ids and min_rating (see `filter`).
+
+        Returns:
+            dict: Amenity ID -> number of matching places, for every
+            amenity of the catalogue.
+        """
+        snapshot = amenity_catalog.snapshot()
+        counts = dict.fromkeys(snapshot.names, 0)
+        if snapshot.bits:
+            bitmap = self.model.amenity_bitmap
+            sums = [func.coalesce(func.sum(bitmap.op('>>')(bit).self_group().op('&')(1)), 0)
+                    for bit in snapshot.bits.values()]
+            row = self.filter(self.model.query.with_entities(*sums), **filters).one()
+            counts.update(zip(snapshot.bits, row))
+
+        rest = [amenity_id for amenity_id in counts if amenity_id not in snapshot.bits]
+        if rest:
+            matching = self.filter(select(self.model.id), **filters)
+            counts.update(db.session.execute(
+                select(place_amenities.c.amenity_id, func.count())
+                .where(place_amenities.c.amenity_id.in_(rest),
+                       place_amenities.c.place_id.in_(matching))
+                .group_by(place_amenities.c.amenity_id)
+            ).all())
+        return counts
+
+    def get_page(self, limit, after=None, profile=None, **filters):
+        """
+        Return one page of places matching optional filters.
+
+        Places are ordered by (created_at, id), or by (price, created_at,
+        id) when a price bound is given, so the page is read in order
+        from the `price` index; the two orders use different cursors.
+
+        Args:
+            limit (int or None): Maximum number of places to return; None
+                returns every place after the cursor.
+            after (str, optional): Cursor returned with the previous page.
+            profile (str, optional): Loading profile to apply.
+            **filters: min_price, max_price, amenity_ids and min_rating (see `filter`).
+
+        Returns:
+            tuple: (places, next_cursor).
+
+        Raises:
+            ValueError: If the cursor is malformed.
+        """
+        query = self.filter(self.query(profile), **filters)
+        if filters.get('min_price') is None and filters.get('max_price') is None:
+            return self.paginate(query, limit, after)
+        if after:
+            price, created_at, obj_id = decode_price_cursor(after)
+            query = query.filter(or_(
+                self.model.price > price,
+                and_(self.model.price == price, self._after(created_at, obj_id))
+            ))
+        query = query.order_by(self.model.price, *self._page_order())
+        if limit is None:
+            return query.all(), None
+        # Fetch one extra row to know whether another page exists
+        rows = query.limit(limit + 1).all()
+        if len(rows) > limit:
+            return rows[:limit], encode_price_cursor(rows[limit - 1])
+        return rows, None
+
+    def stream(self, query=None, batch_size=1000, **filters):
+        """
+        Iterate over the places matching optional filters, oldest first.
+
+        Args:
+            query (optional): Query selecting places; defaults to all places.
+            batch_size (int): Number of rows fetched per round-trip.
+            **filters: min_price, max_price, amenity_ids and min_rating (see `filter`).
+
+        Yields:
+            Place: Matching places, fetched `batch_size` at a time.
+        """
+        query = self.filter(query if query is not None else self.query(), **filters)
+        return super().stream(query, batch_size)
+
+    def get_in_bbox(self, south, west, north, east, profile='list', **filters):
+        """
+        Retrieve the places located inside a bounding box.
+
+        The box is covered by a few geohash prefixes, each turned into a
+        range scan on the indexed `geohash` column; exact bounds are then
+        checked on latitude/longitude.
+
+        Args:
+            south, west, north, east (float): Box bounds in degrees.
+            profile (str, optional): Loading profile to apply.
+            **filters: min_price, max_price, amenity_ids and min_rating (see `filter`).
+
+        Returns:
+            list[Place]: Places inside the box.
+        """
+        query = self.filter(self.query(profile), **filters).filter(
+            self.model.latitude.between(south, north),
+            self.model.longitude.between(west, east)
+        )
+        prefixes = cover_bbox(south, west, north, east)
+        if prefixes != ['']:
+            query = query.filter(or_(*[
+                and_(self.model.geohash >= prefix, self.model.geohash < prefix + PREFIX_END)
+                for prefix in prefixes
+            ]))
+        return query.all()
+
+    def recompute_geohashes(self, batch_size=1000):
+        """
+        Recompute the geohash of every place from its coordinates.
+
+        The geohash is computed in Python, so rows are read `batch_size`
+        at a time and only the places whose stored geohash differs (e.g.
+        rows inserted by the SQL scripts, with a NULL geohash) are
+        written back, with one executemany UPDATE per batch.
+
+        Returns:
+            int: Number of places updated.
+        """
+        table = self.model.__table__
+        rows = db.session.execute(
+            select(table.c.id, table.c.latitude, table.c.longitude, table.c.geohash)
+            .execution_options(yield_per=batch_size)
+        )
+        statement = update(table).where(table.c.id == bindparam('place_id')) \
+            .values(geohash=bindparam('new_geohash'))
+        stale = []
+        for batch in rows.partitions():
+            for place_id, latitude, longitude, geohash in batch:
+                new_geohash = encode_geohash(latitude, longitude)
+                if new_geohash != geohash:
+                    stale.append({'place_id': place_id, 'new_geohash': new_geohash})
+        for start in range(0, len(stale), batch_size):
+            db.session.execute(statement, stale[start:start + batch_size])
+        commit()
+        return len(stale)
+
+    def recompute_amenity_bitmaps(self):
+        """
+        Recompute amenity_bitmap of every place from the place_amenities table.
+
+        Runs as one UPDATE with a correlated subquery summing the bits of
+        the linked amenities (bits are distinct, so the sum is the OR).
+
+        Returns:
+            int: Number of places updated.
+        """
+        bit = Amenity.__table__.c.bit
+        result = db.session.execute(
+            update(self.model).values(
+                amenity_bitmap=select(func.coalesce(func.sum(literal(1).op('<<')(bit)), 0))
+                .select_from(place_amenities.join(Amenity.__table__))
+                .where(place_amenities.c.place_id == self.model.id, bit.isnot(None))
+                .scalar_subquery()
+            )
+        )
+        commit()
+        return result.rowcount
+
+    def recompute_rating_aggregates(self):
+        """
+        Recompute review_count and rating_sum of every place from the reviews table.
+
+        Runs as one UPDATE with correlated subqueries, served by the
+        (place_id, created_at) index on reviews.
+
+        Returns:
+            int: Number of places updated.
+        """
+        per_place = Review.place_id == self.model.id
+        result = db.session.execute(
+            update(self.model).values(
+                review_count=select(func.count(Review.id)).where(per_place).scalar_subquery(),
+                rating_sum=select(func.coalesce(func.sum(Review.rating), 0)).where(per_place).scalar_subquery()
+            )
+        )
+        commit()
+        return result.rowcount
@@ -0,0 +1,80 @@
+from sqlalchemy import exists
+from app.models.review import Review
+from app.extensions import db
+from app.persistence.repository import SQLAlchemyRepository
+
+class ReviewRepository(SQLAlchemyRepository):
+    """
+    Repository class for managing Review entities in the database.
+
+    Inherits:
+        SQLAlchemyRepository: Provides basic CRUD operations.
+
+    Methods:
+        get_reviews_by_place(place_id, limit, after): Retrieve a page of reviews of a place.
+        has_user_reviewed_place(user_id, place_id): Check for an existing review.
+        get_reviewed_pairs(user_ids, place_ids): (user_id, place_id) pairs already reviewed.
+    """
+    def __init__(self):
+        """
+        Initialize the ReviewRepository with the Review model.
+        """
+        super().__init__(Review)
+
+    def get_reviews_by_place(self, place_id, limit, after=None):
+        """
+        Retrieve one page of the reviews of a place, oldest first.
+
+        The filter and keyset pagination run in SQL and are served by the
+        (place_id, created_at) index, so the cost depends on the size
+        of the page and not on the size of the reviews table.
+
+        Args:
+            place_id (str): ID of the reviewed place.
+            limit (int or None): Maximum number of reviews to return (None: all).
+            after (str, optional): Cursor returned with the previous page.
+
+        Returns:
+            tuple: (reviews, next_cursor).
+        """
+        query = self.model.query.filter(self.model.place_id == place_id)
+        return self.paginate(query, limit, after)
+
+    def has_user_reviewed_place(self, user_id, place_id):
+        """
+        Check whether a user already reviewed a place.
+
+        Runs a single EXISTS query on the (user_id, place_id) unique index.
+
+        Args:
+            user_id (str): ID of the reviewing user.
+            place_id (str): ID of the reviewed place.
+
+        Returns:
+            bool: True if a review already exists, False otherwise.
+        """
+        return db.session.query(
+            exists().where(self.model.user_id == user_id, self.model.place_id == place_id)
+        ).scalar()
+
+    def get_reviewed_pairs(self, user_ids, place_ids):
+        """
+        Return the (user_id, place_id) pairs that already have a review.
+
+        Used to check a batch of new reviews with a single query.
+
+        Args:
+            user_ids (iterable): IDs of the reviewing users.
+            place_ids (iterable): IDs of the reviewed places.
+
+        Returns:
+            set: Existing (user_id, place_id) pairs among those users and places.
+        """
+        user_ids, place_ids = list(user_ids), list(place_ids)
+        if not user_ids or not place_ids:
+            return set()
+        rows = db.session.query(self.model.user_id, self.model.place_id).filter(
+            self.model.user_id.in_(user_ids),
+            self.model.place_id.in_(place_ids)
+        )
+        return {tuple(row) for row in rows}
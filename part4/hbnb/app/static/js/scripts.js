@@ -60,6 +60,12 @@ document.addEventListener('DOMContentLoaded', () => {
       return null;
     }
 
+    // Filtre courant et curseur de la page suivante (header X-Next-Cursor)
+    let currentMaxPrice = 'All';
+    let nextCursor = null;
+    // Nombre de places par page ("Voir plus" charge la suivante)
+    const PAGE_SIZE = 50;
+
     function checkAuthentication({ fetchPlaces = false } = {}) {
       const token = getCookie('token');
       const loginLink = document.getElementById('login-link');
@@ -76,8 +82,18 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
 
-    async function fetchPlacesFromAPI(token) {
-      const response = await fetch('/api/v1/places', {
+    // Le filtrage par prix est fait côté serveur : on ne demande que
+    // la page de places qui correspond au filtre courant
+    async function fetchPlacesFromAPI(token, { append = false } = {}) {
+      const params = new URLSearchParams({ limit: PAGE_SIZE });
+      if (currentMaxPrice !== 'All') {
+        params.set('max_price', currentMaxPrice);
+      }
+      if (append && nextCursor) {
+        params.set('after', nextCursor);
+      }
+
+      const response = await fetch(`/api/v1/places/?${params.toString()}`, {
         method: 'GET',
         headers: {
           'Content-Type': 'application/json',
@@ -90,16 +106,24 @@ document.addEventListener('DOMContentLoaded', () => {
         return;
       }
 
+      nextCursor = response.headers.get('X-Next-Cursor');
       const data = await response.json();
-      displayPlaces(data);
+      displayPlaces(data, { append });
+
+      const loadMoreButton = document.getElementById('load-more');
+      if (loadMoreButton) {
+        loadMoreButton.style.display = nextCursor ? 'block' : 'none';
+      }
     }
 
 
-    function displayPlaces(places) {
+    function displayPlaces(places, { append = false } = {}) {
       const placesList = document.getElementById('places-list');
       if (!placesList) return;
 
-      placesList.innerHTML = '';
+      if (!append) {
+        placesList.innerHTML = '';
+      }
 
       const imageMap = {
         1: "Charmante-maison-à-Evron.jpg"
@@ -141,21 +165,25 @@ document.addEventListener('DOMContentLoaded', () => {
         priceFilterElement.appendChild(option);
       });
 
-      // Applique le filtre lors du changement
+      // Redemande la première page filtrée lors du changement
       priceFilterElement.addEventListener('change', (event) => {
-        const selectPrice = event.target.value;
-        const places = document.querySelectorAll('.place');
-
-        places.forEach(place => {
-          const priceText = place.querySelector('p:last-of-type').textContent;
-          const price = parseInt(priceText.replace(/\D/g, ''), 10);
+        currentMaxPrice = event.target.value;
+        nextCursor = null;
+        const token = getCookie('token');
+        if (token) {
+          fetchPlacesFromAPI(token);
+        }
+      });
+    }
 
-          if (selectPrice === 'All' || price <= parseInt(selectPrice)) {
-            place.style.display = 'block';
-          } else {
-            place.style.display = 'none';
-          }
-        });
+    // Charge la page suivante avec le même filtre
+    const loadMoreButton = document.getElementById('load-more');
+    if (loadMoreButton) {
+      loadMoreButton.addEventListener('click', () => {
+        const token = getCookie('token');
+        if (token && nextCursor) {
+          fetchPlacesFromAPI(token, { append: true });
+        }
       });
     }
 
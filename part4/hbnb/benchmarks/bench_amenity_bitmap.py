@@ -0,0 +1,127 @@
+"""
+Benchmark "must have all amenities" filters: GROUP BY join vs amenity bitmap.
+
+Seeds an in-memory SQLite database with N places, each linked to a few
+of 20 amenities, then times the same filter two ways:
+
+    join     place IDs from GROUP BY ... HAVING COUNT on place_amenities
+             (what the repository does for amenities without a bit)
+    bitmap   one bitwise test on places.amenity_bitmap
+
+and the per-amenity facet counts of the places under FACET_FILTERS.
+
+Usage (from part4/hbnb):
+    python -m benchmarks.bench_amenity_bitmap [size ...]
+"""
+
+import random
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+
+from sqlalchemy import func, select
+
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.place import Place, place_amenities
+from app.models.user import User
+from app.persistence.catalog import amenity_catalog
+from app.services import facade
+
+AMENITIES = 20
+BATCH = 50000
+DEFAULT_SIZES = [10000, 100000]
+REPEAT = 10
+FACET_FILTERS = {'max_price': 100.0}
+
+
+def seed(size):
+    """Insert one owner, AMENITIES amenities and `size` places with bulk statements."""
+    rng = random.Random(42)
+    now = datetime(2025, 1, 1)
+    owner_id = str(uuid.uuid4())
+    db.session.execute(User.__table__.insert(), [{
+        'id': owner_id, 'first_name': 'Bench', 'last_name': 'User',
+        'email': 'owner@bench.io', 'password': 'x', 'is_admin': False,
+        'created_at': now, 'updated_at': now
+    }])
+    amenities = [str(uuid.uuid4()) for _ in range(AMENITIES)]
+    db.session.execute(Amenity.__table__.insert(), [
+        {'id': amenity_id, 'name': f'Amenity {bit}', 'bit': bit, 'created_at': now, 'updated_at': now}
+        for bit, amenity_id in enumerate(amenities)
+    ])
+    for start in range(0, size, BATCH):
+        rows, links = [], []
+        for i in range(start, min(start + BATCH, size)):
+            place_id = str(uuid.uuid4())
+            bits = rng.sample(range(AMENITIES), rng.randint(0, 6))
+            rows.append({
+                'id': place_id, 'title': f'Place {i}', 'description': 'desc',
+                'price': round(rng.uniform(20.0, 500.0), 2), 'latitude': 45.0, 'longitude': 5.0,
+                'owner_id': owner_id, 'amenity_bitmap': sum(1 << bit for bit in bits),
+                'created_at': now + timedelta(seconds=i), 'updated_at': now
+            })
+            links.extend({'place_id': place_id, 'amenity_id': amenities[bit]} for bit in bits)
+        db.session.execute(Place.__table__.insert(), rows)
+        db.session.execute(place_amenities.insert(), links)
+    db.session.commit()
+    return amenities
+
+
+def join_count(amenity_ids):
+    """Count the places with all `amenity_ids` through the association table."""
+    with_all = select(place_amenities.c.place_id) \
+        .where(place_amenities.c.amenity_id.in_(amenity_ids)) \
+        .group_by(place_amenities.c.place_id) \
+        .having(func.count() == len(amenity_ids))
+    return Place.query.filter(Place.id.in_(with_all)).count()
+
+
+def join_facets(**filters):
+    """Count the matching places of each amenity through the association table."""
+    matching = facade.place_repo.filter(select(Place.id), **filters)
+    return dict(db.session.execute(
+        select(place_amenities.c.amenity_id, func.count())
+        .where(place_amenities.c.place_id.in_(matching))
+        .group_by(place_amenities.c.amenity_id)
+    ).all())
+
+
+def timed_ms(read):
+    """Return (mean milliseconds of `read` over REPEAT runs, result of the last run)."""
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        result = read()
+    return (time.perf_counter() - start) * 1000 / REPEAT, result
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    app = create_app("config.TestingConfig")
+    repo = facade.place_repo
+
+    with app.app_context():
+        print(f"{'places':>8} | {'query':>11} | {'matches':>7} | {'join ms':>8} | {'bitmap ms':>9} | {'speedup':>7}")
+        for size in sizes:
+            db.drop_all()
+            db.create_all()
+            amenities = seed(size)
+            # Bulk inserts bypass the session events that refresh the catalogue
+            amenity_catalog.invalidate()
+            for label, amenity_ids in (('1 amenity', amenities[:1]), ('3 amenities', amenities[:3])):
+                join_ms, expected = timed_ms(lambda: join_count(amenity_ids))
+                bitmap_ms, found = timed_ms(lambda: repo.filter(Place.query, amenity_ids=amenity_ids).count())
+                assert found == expected, label
+                print(f"{size:>8} | {label:>11} | {found:>7} | {join_ms:>8.2f} | {bitmap_ms:>9.2f} | "
+                      f"{join_ms / bitmap_ms:>6.1f}x")
+            join_ms, expected = timed_ms(lambda: join_facets(**FACET_FILTERS))
+            bitmap_ms, found = timed_ms(lambda: repo.amenity_facets(**FACET_FILTERS))
+            assert found == expected
+            print(f"{size:>8} | {'facets':>11} | {sum(found.values()):>7} | {join_ms:>8.2f} | {bitmap_ms:>9.2f} | "
+                  f"{join_ms / bitmap_ms:>6.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,83 @@
+"""
+Benchmark the serialization of API payloads with each JSON encoder.
+
+Seeds an in-memory SQLite database, fetches the place-detail payload
+(place with its owner, 30 amenities and 500 reviews) and the list of
+every place through the API, then times encoding those payloads with the
+stdlib encoder and with orjson.
+
+Usage (from part4/hbnb):
+    python -m benchmarks.bench_json_encoder [places]
+"""
+
+import sys
+import timeit
+import uuid
+from datetime import datetime, timedelta
+
+from app import create_app
+from app.extensions import db
+from app.json_encoder import ENCODERS, orjson
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.models.amenity import Amenity
+
+AMENITIES = 30
+REVIEWS = 500
+
+
+def seed(size):
+    """Insert `size` places; the first one gets amenities and reviews."""
+    now = datetime(2025, 1, 1)
+    users = [{
+        'id': str(uuid.uuid4()), 'first_name': 'Bench', 'last_name': f'User {i}',
+        'email': f'user{i}@bench.io', 'password': 'x', 'is_admin': False,
+        'created_at': now, 'updated_at': now
+    } for i in range(REVIEWS + 1)]
+    db.session.execute(User.__table__.insert(), users)
+    owner_id = users[0]['id']
+    db.session.execute(Place.__table__.insert(), [{
+        'id': str(uuid.uuid4()), 'title': f'Place {i}', 'description': 'A quiet flat near the sea. ' * 4,
+        'price': 50.0 + i % 200, 'latitude': 43.3 + i / size, 'longitude': 5.4 - i / size,
+        'owner_id': owner_id, 'created_at': now + timedelta(seconds=i), 'updated_at': now
+    } for i in range(size)])
+    db.session.commit()
+
+    place = Place.query.order_by(Place.created_at).first()
+    place.amenities = [Amenity(name=f'Amenity {i}') for i in range(AMENITIES)]
+    db.session.execute(Review.__table__.insert(), [{
+        'id': str(uuid.uuid4()), 'text': 'Great stay, would come back!', 'rating': 1 + i % 5,
+        'user_id': user['id'], 'place_id': place.id,
+        'created_at': now + timedelta(seconds=i), 'updated_at': now
+    } for i, user in enumerate(users[1:])])
+    db.session.commit()
+    return place.id
+
+
+def main():
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    app = create_app("config.TestingConfig")
+    app.config['PAGE_SIZE_MAX'] = size
+    client = app.test_client()
+
+    with app.app_context():
+        db.create_all()
+        place_id = seed(size)
+        payloads = {
+            'place detail': client.get(f'/api/v1/places/{place_id}').get_json(),
+            f'{size} places': client.get(f'/api/v1/places/?limit={size}').get_json(),
+        }
+
+        encoders = [name for name in ENCODERS if name != 'orjson' or orjson is not None]
+        print(f"{'payload':>14} | " + ' | '.join(f'{name + " (ms)":>13}' for name in encoders))
+        for label, payload in payloads.items():
+            timings = []
+            for name in encoders:
+                runs, total = timeit.Timer(lambda: ENCODERS[name](payload)).autorange()
+                timings.append(total / runs * 1000)
+            print(f"{label:>14} | " + ' | '.join(f'{ms:>13.3f}' for ms in timings))
+
+
+if __name__ == '__main__':
+    main()
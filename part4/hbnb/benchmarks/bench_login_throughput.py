@@ -0,0 +1,79 @@
+"""
+Benchmark login throughput with bcrypt run inline vs in the process pool.
+
+Each scenario fires concurrent POST /api/v1/auth/login requests from
+client threads and reports logins per second. Inline hashing holds the
+GIL, so it stays flat whatever the thread count; the process pool
+should scale with the number of workers up to the number of cores.
+
+Usage (from part4/hbnb):
+    python -m benchmarks.bench_login_throughput [rounds] [logins]
+"""
+
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from app import create_app
+from app.extensions import db, hasher
+from app.models.user import User
+
+EMAIL = 'bench@hbnb.io'
+PASSWORD = 'bench-password'
+
+
+def scenarios():
+    """Yield (label, executor mode, worker count)."""
+    cores = os.cpu_count() or 1
+    yield 'inline', 'inline', 1
+    workers = 1
+    while workers < cores:
+        yield f'process x{workers}', 'process', workers
+        workers *= 2
+    yield f'process x{cores}', 'process', cores
+
+
+def run(app, mode, workers, logins):
+    """Return logins per second for one hashing configuration."""
+    app.config.update(HASHING_EXECUTOR=mode, HASHING_WORKERS=workers,
+                      HASHING_MAX_PENDING=4 * workers, HASHING_QUEUE_TIMEOUT=60)
+    hasher.init_app(app)
+    # Warm up the worker processes
+    hasher.verify(User.query.filter_by(email=EMAIL).first().password, PASSWORD)
+
+    def login(_):
+        response = app.test_client().post('/api/v1/auth/login',
+                                          json={'email': EMAIL, 'password': PASSWORD})
+        assert response.status_code == 200, response.status_code
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=2 * workers) as pool:
+        list(pool.map(login, range(logins)))
+    elapsed = time.perf_counter() - start
+    hasher.shutdown()
+    return logins / elapsed
+
+
+def main():
+    rounds = int(sys.argv[1]) if len(sys.argv) > 1 else 12
+    logins = int(sys.argv[2]) if len(sys.argv) > 2 else 64
+    app = create_app("config.TestingConfig")
+    app.config['BCRYPT_LOG_ROUNDS'] = rounds
+    hasher.init_app(app)
+
+    with app.app_context():
+        db.create_all()
+        user = User(first_name='Bench', last_name='User', email=EMAIL)
+        user.hash_password(PASSWORD)
+        db.session.add(user)
+        db.session.commit()
+
+        print(f"bcrypt cost {rounds}, {logins} logins per scenario")
+        print(f"{'scenario':>12} | {'logins/s':>9}")
+        for label, mode, workers in scenarios():
+            print(f"{label:>12} | {run(app, mode, workers, logins):>9.1f}")
+
+
+if __name__ == '__main__':
+    main()
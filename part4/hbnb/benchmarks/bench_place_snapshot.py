@@ -0,0 +1,116 @@
+"""
+Benchmark serving place reads from the memory-mapped snapshot vs the database.
+
+Seeds an in-memory SQLite database with N places spread over France,
+exports the snapshot, then reports:
+
+    objects MiB   Python heap of holding every place as ORM objects,
+                  what each worker pays to keep the places warm
+    mapped MiB    Python heap of mapping the snapshot (the file itself
+                  lives in the page cache, shared by all workers)
+    page ms       one filtered page (price range) from each source
+    bbox ms       one bounding-box search from each source
+
+Usage (from part4/hbnb):
+    python -m benchmarks.bench_place_snapshot [size ...]
+"""
+
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+from app import create_app
+from app.extensions import db
+from app.geo import encode_geohash
+from app.models.user import User
+from app.models.place import Place
+from app.persistence.snapshot import MappedSnapshot, export_snapshot
+from app.services import facade
+
+BATCH = 50000
+DEFAULT_SIZES = [10000, 100000]
+REPEAT = 20
+# (south, west, north, east) around Paris
+BBOX = (48.7, 2.2, 49.0, 2.5)
+FILTERS = {'min_price': 100.0, 'max_price': 101.0}
+
+
+def seed(size):
+    """Insert one owner and `size` places with bulk executemany statements."""
+    rng = random.Random(42)
+    now = datetime(2025, 1, 1)
+    owner_id = str(uuid.uuid4())
+    db.session.execute(User.__table__.insert(), [{
+        'id': owner_id, 'first_name': 'Bench', 'last_name': 'User',
+        'email': 'owner@bench.io', 'password': 'x', 'is_admin': False,
+        'created_at': now, 'updated_at': now
+    }])
+    for start in range(0, size, BATCH):
+        rows = []
+        for i in range(start, min(start + BATCH, size)):
+            lat, lng = rng.uniform(42.0, 51.0), rng.uniform(-4.5, 8.0)
+            rows.append({
+                'id': str(uuid.uuid4()), 'title': f'Place {i}', 'description': 'desc',
+                'price': round(rng.uniform(20.0, 500.0), 2), 'latitude': lat, 'longitude': lng,
+                'geohash': encode_geohash(lat, lng), 'owner_id': owner_id,
+                'created_at': now + timedelta(seconds=i), 'updated_at': now
+            })
+        db.session.execute(Place.__table__.insert(), rows)
+    db.session.commit()
+
+
+def heap_mib(load):
+    """Return the Python heap MiB still held by the result of `load`."""
+    db.session.expunge_all()
+    tracemalloc.start()
+    held = load()
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del held
+    return size / 2 ** 20
+
+
+def timed_ms(read):
+    """Return the mean milliseconds of `read` over REPEAT runs."""
+    start = time.perf_counter()
+    for _ in range(REPEAT):
+        read()
+        db.session.expunge_all()
+    return (time.perf_counter() - start) * 1000 / REPEAT
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    app = create_app("config.TestingConfig")
+
+    with app.app_context(), tempfile.TemporaryDirectory() as tmpdir:
+        path = os.path.join(tmpdir, 'places.snapshot')
+        print(f"{'places':>8} | {'file MiB':>8} | {'objects MiB':>11} | {'mapped MiB':>10} | "
+              f"{'db page ms':>10} | {'map page ms':>11} | {'db bbox ms':>10} | {'map bbox ms':>11}")
+        for size in sizes:
+            db.drop_all()
+            db.create_all()
+            seed(size)
+            export_snapshot(path)
+            snapshot = MappedSnapshot(path)
+
+            objects_mib = heap_mib(lambda: facade.get_all_places(profile=None))
+            mapped_mib = heap_mib(lambda: MappedSnapshot(path))
+            repo = facade.place_repo
+            db_page = timed_ms(lambda: repo.get_page(50, **FILTERS))
+            map_page = timed_ms(lambda: snapshot.get_page(50, **FILTERS))
+            db_bbox = timed_ms(lambda: repo.get_in_bbox(*BBOX))
+            map_bbox = timed_ms(lambda: snapshot.get_in_bbox(*BBOX))
+            print(f"{size:>8} | {os.path.getsize(path) / 2 ** 20:>8.1f} | {objects_mib:>11.1f} | "
+                  f"{mapped_mib:>10.2f} | {db_page:>10.2f} | {map_page:>11.2f} | "
+                  f"{db_bbox:>10.2f} | {map_bbox:>11.2f}")
+            snapshot.close()
+
+
+if __name__ == '__main__':
+    main()
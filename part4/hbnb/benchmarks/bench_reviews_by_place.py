@@ -0,0 +1,87 @@
+"""
+Benchmark the place-scoped review lookup as the reviews table grows.
+
+Seeds an in-memory SQLite database with N reviews spread over N / 50
+places, then times `facade.get_reviews_by_place` for a page of reviews
+of a single place. With the (place_id, created_at) index the latency
+should stay flat from 1k to 1M rows.
+
+Usage (from part4/hbnb):
+    python -m benchmarks.bench_reviews_by_place [size ...]
+"""
+
+import sys
+import time
+import uuid
+from datetime import datetime, timedelta
+from statistics import median
+
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.services import facade
+
+REVIEWS_PER_PLACE = 50
+PAGE_SIZE = 20
+RUNS = 200
+BATCH = 50000
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+
+
+def seed(size):
+    """Insert `size` reviews with bulk executemany statements."""
+    now = datetime(2025, 1, 1)
+    # One author per review of a place keeps (user_id, place_id) unique
+    user_ids = [str(uuid.uuid4()) for _ in range(REVIEWS_PER_PLACE + 1)]
+    owner_id = user_ids[0]
+    db.session.execute(User.__table__.insert(), [{
+        'id': user_id, 'first_name': 'Bench', 'last_name': 'User',
+        'email': f'user{i}@bench.io', 'password': 'x', 'is_admin': False,
+        'created_at': now, 'updated_at': now
+    } for i, user_id in enumerate(user_ids)])
+
+    place_ids = [str(uuid.uuid4()) for _ in range(max(1, size // REVIEWS_PER_PLACE))]
+    db.session.execute(Place.__table__.insert(), [{
+        'id': place_id, 'title': 'Place', 'description': 'desc', 'price': 100.0,
+        'latitude': 0.0, 'longitude': 0.0, 'owner_id': owner_id,
+        'created_at': now, 'updated_at': now
+    } for place_id in place_ids])
+
+    for start in range(0, size, BATCH):
+        db.session.execute(Review.__table__.insert(), [{
+            'id': str(uuid.uuid4()), 'text': 'Nice', 'rating': 4,
+            'user_id': user_ids[i // len(place_ids)], 'place_id': place_ids[i % len(place_ids)],
+            'created_at': now + timedelta(seconds=i), 'updated_at': now
+        } for i in range(start, min(start + BATCH, size))])
+    db.session.commit()
+    return place_ids[len(place_ids) // 2]
+
+
+def run(size):
+    """Seed a fresh database and return the median lookup latency in ms."""
+    db.drop_all()
+    db.create_all()
+    place_id = seed(size)
+
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        facade.get_reviews_by_place(place_id, limit=PAGE_SIZE)
+        timings.append(time.perf_counter() - start)
+        db.session.expunge_all()
+    return median(timings) * 1000
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    app = create_app("config.TestingConfig")
+    with app.app_context():
+        print(f"{'reviews':>10} | {'median (ms)':>12}")
+        for size in sizes:
+            print(f"{size:>10} | {run(size):>12.3f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark peak memory of exporting every place: JSON list vs NDJSON stream.
+
+Seeds an in-memory SQLite database with N places, then measures the
+Python heap peak (tracemalloc) of building the whole list in one
+response, and of consuming GET /api/v1/places/?stream=1 chunk by chunk.
+The list peak grows with N; the stream peak should stay flat.
+
+Usage (from part4/hbnb):
+    python -m benchmarks.bench_stream_export [size ...]
+"""
+
+import json
+import sys
+import time
+import tracemalloc
+import uuid
+from datetime import datetime, timedelta
+
+from app import create_app
+from app.api.v1.places import place_summary
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.services import facade
+
+BATCH = 50000
+DEFAULT_SIZES = [10000, 100000, 500000]
+
+
+def seed(size):
+    """Insert one owner and `size` places with bulk executemany statements."""
+    now = datetime(2025, 1, 1)
+    owner_id = str(uuid.uuid4())
+    db.session.execute(User.__table__.insert(), [{
+        'id': owner_id, 'first_name': 'Bench', 'last_name': 'User',
+        'email': 'owner@bench.io', 'password': 'x', 'is_admin': False,
+        'created_at': now, 'updated_at': now
+    }])
+    for start in range(0, size, BATCH):
+        db.session.execute(Place.__table__.insert(), [{
+            'id': str(uuid.uuid4()), 'title': f'Place {i}', 'description': 'desc',
+            'price': 100.0, 'latitude': 0.0, 'longitude': 0.0, 'owner_id': owner_id,
+            'created_at': now + timedelta(seconds=i), 'updated_at': now
+        } for i in range(start, min(start + BATCH, size))])
+    db.session.commit()
+
+
+def measure(export):
+    """Return (seconds, peak MiB) of running `export`."""
+    db.session.expunge_all()
+    tracemalloc.start()
+    start = time.perf_counter()
+    export()
+    elapsed = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return elapsed, peak / 2 ** 20
+
+
+def main():
+    sizes = [int(arg) for arg in sys.argv[1:]] or DEFAULT_SIZES
+    app = create_app("config.TestingConfig")
+    client = app.test_client()
+
+    def export_list():
+        json.dumps([place_summary(p) for p in facade.get_all_places(profile=None)])
+
+    def export_stream():
+        response = client.get('/api/v1/places/?stream=1')
+        for _ in response.response:
+            pass
+        response.close()
+
+    with app.app_context():
+        print(f"{'places':>8} | {'list s':>7} | {'list MiB':>8} | {'stream s':>8} | {'stream MiB':>10}")
+        for size in sizes:
+            db.drop_all()
+            db.create_all()
+            seed(size)
+            list_s, list_mib = measure(export_list)
+            stream_s, stream_mib = measure(export_stream)
+            print(f"{size:>8} | {list_s:>7.2f} | {list_mib:>8.1f} | {stream_s:>8.2f} | {stream_mib:>10.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,13 @@
+import sys
+
+from app import create_app
+from app.hashing import PasswordHasher
+
+# Run once on the production hardware and give every worker the printed setting
+if len(sys.argv) != 2:
+    sys.exit("Usage: python calibrate_bcrypt.py TARGET_MS")
+
+app = create_app()
+rounds = PasswordHasher.calibrate(float(sys.argv[1]),
+                                  app.config['BCRYPT_MIN_ROUNDS'], app.config['BCRYPT_MAX_ROUNDS'])
+print(f"BCRYPT_LOG_ROUNDS={rounds}")
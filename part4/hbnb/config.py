@@ -9,6 +9,39 @@ class Config:
     """
     SECRET_KEY = os.getenv('SECRET_KEY', 'default_secret_key')
     DEBUG = False
+    # Page size of collection endpoints when ?after= is sent without ?limit=, and the
+    # upper bound of ?limit=; without either, the whole collection is returned
+    PAGE_SIZE_DEFAULT = 50
+    PAGE_SIZE_MAX = 500
+    # Maximum number of items accepted by the /batch endpoints
+    BATCH_SIZE_MAX = 1000
+    # Rows fetched per round-trip (and written per chunk) by streaming exports
+    STREAM_BATCH_SIZE = 1000
+    # Response JSON encoder: "auto" (orjson if installed), "orjson" or "stdlib"
+    JSON_ENCODER = os.getenv('JSON_ENCODER', 'auto')
+    # Read-through entity cache (see app/persistence/cache.py)
+    CACHE_BACKEND = os.getenv('CACHE_BACKEND', 'lru')
+    CACHE_MAX_ENTRIES = 10000
+    CACHE_TTL = 60.0
+    # In-memory amenity catalogue (see app/persistence/catalog.py)
+    AMENITY_CATALOG_TTL = 60.0
+    # Memory-mapped place snapshot written by export_snapshot.py (see app/persistence/snapshot.py)
+    PLACE_SNAPSHOT_PATH = os.getenv('PLACE_SNAPSHOT_PATH')
+    # Response compression (see app/compression.py)
+    COMPRESS_ENABLED = True
+    COMPRESS_MIN_SIZE = 500
+    COMPRESS_LEVEL = int(os.getenv('COMPRESS_LEVEL', 6))
+    COMPRESS_BROTLI_QUALITY = int(os.getenv('COMPRESS_BROTLI_QUALITY', 4))
+    # bcrypt cost factor of new password hashes; cheaper hashes are upgraded at login.
+    # Set it from a latency budget with calibrate_bcrypt.py, within these bounds
+    BCRYPT_LOG_ROUNDS = int(os.getenv('BCRYPT_LOG_ROUNDS', 12))
+    BCRYPT_MIN_ROUNDS = 10
+    BCRYPT_MAX_ROUNDS = 16
+    # Password hashing pool (see app/hashing.py); None means one worker per core
+    HASHING_EXECUTOR = os.getenv('HASHING_EXECUTOR', 'process')
+    HASHING_WORKERS = int(os.getenv('HASHING_WORKERS', 0)) or None
+    HASHING_MAX_PENDING = None
+    HASHING_QUEUE_TIMEOUT = 1.0
 
 class DevelopmentConfig(Config):
     """
@@ -19,9 +52,22 @@ class DevelopmentConfig(Config):
     SQLALCHEMY_DATABASE_URI = f"sqlite:///{os.path.join(basedir, 'development.db')}"
     SQLALCHEMY_TRACK_MODIFICATIONS = False
 
+class TestingConfig(Config):
+    """
+    Configuration class for automated tests and benchmarks.
+    Uses a private in-memory SQLite database.
+    """
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = "sqlite:///:memory:"
+    SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # Cheap hashes computed in-thread keep the test suite fast
+    BCRYPT_LOG_ROUNDS = 4
+    HASHING_EXECUTOR = 'inline'
+
 
 # Dictionary to map environment names to their corresponding config classes
 config = {
     'development': DevelopmentConfig,
+    'testing': TestingConfig,
     'default': DevelopmentConfig
 }
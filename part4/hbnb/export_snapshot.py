@@ -0,0 +1,13 @@
+import sys
+
+from app import create_app
+from app.persistence.snapshot import export_snapshot
+
+app = create_app()
+
+with app.app_context():
+    path = sys.argv[1] if len(sys.argv) > 1 else app.config['PLACE_SNAPSHOT_PATH']
+    if not path:
+        sys.exit("Usage: python export_snapshot.py PATH (or set PLACE_SNAPSHOT_PATH)")
+    places, amenities = export_snapshot(path)
+    print(f"Snapshot of {places} places and {amenities} amenities written to {path}.")
@@ -0,0 +1,17 @@
+from app import create_app
+from app.persistence.migrations import upgrade_schema
+from app.services import facade
+
+app = create_app()
+
+with app.app_context():
+    changes = upgrade_schema()
+    for change in changes:
+        print(change.capitalize() + ".")
+    print(f"Schema upgraded ({len(changes)} changes).")
+
+    # Colonnes dérivées : recalculées depuis les données existantes
+    print(f"Geohash recomputed for {facade.reconcile_geohashes()} places.")
+    print(f"Rating aggregates recomputed for {facade.reconcile_place_ratings()} places.")
+    assigned, updated = facade.reconcile_amenity_bitmaps()
+    print(f"{assigned} amenities given a bit, amenity bitmaps recomputed for {updated} places.")
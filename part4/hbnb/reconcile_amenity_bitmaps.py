@@ -0,0 +1,8 @@
+from app import create_app
+from app.services import facade
+
+app = create_app()
+
+with app.app_context():
+    assigned, updated = facade.reconcile_amenity_bitmaps()
+    print(f"{assigned} amenities given a bit, amenity bitmaps recomputed for {updated} places.")
@@ -0,0 +1,8 @@
+from app import create_app
+from app.services import facade
+
+app = create_app()
+
+with app.app_context():
+    updated = facade.reconcile_place_ratings()
+    print(f"Rating aggregates recomputed for {updated} places.")
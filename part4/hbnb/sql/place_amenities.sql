@@ -4,4 +4,6 @@ CREATE TABLE IF NOT EXISTS place_amenities(
 	FOREIGN KEY (place_id) REFERENCES places(id),
 	FOREIGN KEY (amenity_id) REFERENCES amenities(id),
 	PRIMARY KEY (place_id, amenity_id)
-)
+);
+
+CREATE INDEX IF NOT EXISTS ix_place_amenities_amenity_id ON place_amenities (amenity_id);
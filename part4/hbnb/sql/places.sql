@@ -5,6 +5,13 @@ CREATE TABLE IF NOT EXISTS places(
 	price DECIMAL(10, 2) NOT NULL,
 	latitude FLOAT NOT NULL,
 	longitude FLOAT NOT NULL,
+	geohash VARCHAR(12),
+	review_count INT NOT NULL DEFAULT 0,
+	rating_sum INT NOT NULL DEFAULT 0,
+	amenity_bitmap BIGINT NOT NULL DEFAULT 0,
 	owner_id CHAR(36) NOT NULL,
 	FOREIGN KEY (owner_id) REFERENCES users(id)
-)
+);
+
+CREATE INDEX IF NOT EXISTS ix_places_geohash ON places (geohash);
+CREATE INDEX IF NOT EXISTS ix_places_price ON places (price);
@@ -4,8 +4,12 @@ CREATE TABLE IF NOT EXISTS reviews (
 	rating INT CHECK (rating BETWEEN 1 AND 5),
 	user_id CHAR(36),
 	place_id CHAR(36),
+	created_at DATETIME,
+	updated_at DATETIME,
 	PRIMARY KEY (id),
 	FOREIGN KEY (user_id) REFERENCES users(id),
 	FOREIGN KEY (place_id) REFERENCES places(id),
 	UNIQUE (user_id, place_id)
 );
+
+CREATE INDEX IF NOT EXISTS ix_reviews_place_id_created_at ON reviews (place_id, created_at);
@@ -0,0 +1,144 @@
+import unittest
+from sqlalchemy import event, text
+from sqlalchemy.exc import IntegrityError
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity, MAX_AMENITY_BITS, insert_amenities, is_unique_violation
+from app.models.user import User
+from app.models.place import Place
+from app.services import facade
+
+
+class TestAmenityBitmap(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        self.owner = User(first_name="Owner", last_name="User", email="owner@hbnb.io", password="x")
+        self.wifi = Amenity(name="WiFi")
+        self.pool = Amenity(name="Pool")
+        self.places = {}
+        for title, price, amenities in [
+            ("Cabin", 40.0, []),
+            ("Flat", 80.0, [self.wifi]),
+            ("Villa", 250.0, [self.wifi, self.pool]),
+            ("Resort", 120.0, [self.pool]),
+        ]:
+            place = Place(title=title, description="desc", price=price,
+                          latitude=45.0, longitude=5.0, owner=self.owner)
+            for amenity in amenities:
+                place.add_amenity(amenity)
+            db.session.add(place)
+            self.places[title] = place
+        db.session.commit()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def statements(self, action):
+        """Run `action` and return (its result, the SQL statements it executed)."""
+        executed = []
+
+        def record(conn, cursor, statement, *args):
+            executed.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            result = action()
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        return result, executed
+
+    def titles(self, **filters):
+        places, _ = facade.get_places_page(10, profile=None, **filters)
+        return sorted(place.title for place in places)
+
+    def test_bits_are_assigned_in_name_order_and_never_reused(self):
+        self.assertEqual((self.pool.bit, self.wifi.bit), (0, 1))
+        parking = Amenity(name="Parking")
+        db.session.add(parking)
+        db.session.commit()
+        self.assertEqual(parking.bit, 2)
+
+    def test_bit_taken_by_a_concurrent_insert_is_retried(self):
+        # Bit read from MAX(bit) before another transaction committed it
+        sauna = Amenity(name="Sauna")
+        sauna.bit = self.wifi.bit
+        insert_amenities(db.session, [sauna])
+        db.session.commit()
+        self.assertEqual(sauna.bit, 2)
+
+        with self.assertRaises(IntegrityError) as raised:
+            insert_amenities(db.session, [Amenity(name="WiFi")])
+        self.assertTrue(is_unique_violation(raised.exception, "name"))
+        self.assertFalse(is_unique_violation(raised.exception, "bit"))
+        db.session.rollback()
+        self.assertEqual(Amenity.query.count(), 3)
+
+    def test_bitmap_follows_the_amenities(self):
+        villa = self.places["Villa"]
+        self.assertEqual(villa.amenity_bitmap, 0b11)
+        self.assertEqual(self.places["Cabin"].amenity_bitmap, 0)
+
+        facade.update_place(villa.id, {"amenities": [self.pool.id]})
+        db.session.expire_all()
+        self.assertEqual(villa.amenity_bitmap, 1 << self.pool.bit)
+
+        cabin = self.places["Cabin"]
+        cabin.amenities = [self.wifi]
+        db.session.commit()
+        db.session.expire_all()
+        self.assertEqual(cabin.amenity_bitmap, 1 << self.wifi.bit)
+
+    def test_filter_is_one_bitwise_predicate(self):
+        ids = [self.wifi.id, self.pool.id]
+        titles, executed = self.statements(lambda: self.titles(amenity_ids=ids))
+        self.assertEqual(titles, ["Villa"])
+        self.assertFalse(any("place_amenities" in statement for statement in executed))
+        self.assertEqual(self.titles(amenity_ids=[self.wifi.id]), ["Flat", "Villa"])
+        self.assertEqual(self.titles(amenity_ids=[self.pool.id], max_price=200), ["Resort"])
+        self.assertEqual(self.titles(amenity_ids=["unknown"]), [])
+
+    def test_amenities_without_bit_use_the_join(self):
+        db.session.execute(text("UPDATE amenities SET bit = :bit WHERE id = :id"),
+                           {"bit": MAX_AMENITY_BITS - 1, "id": self.pool.id})
+        sauna = Amenity(name="Sauna")
+        db.session.add(sauna)
+        db.session.commit()
+        self.assertIsNone(sauna.bit)
+
+        villa = self.places["Villa"]
+        villa.add_amenity(sauna)
+        db.session.commit()
+        self.assertEqual(self.titles(amenity_ids=[sauna.id, self.wifi.id]), ["Villa"])
+        counts = {entry.name: count for entry, count in facade.get_amenity_facets()}
+        self.assertEqual(counts["Sauna"], 1)
+
+    def test_facets(self):
+        counts = {entry.name: count for entry, count in facade.get_amenity_facets()}
+        self.assertEqual(counts, {"WiFi": 2, "Pool": 2})
+        counts = {entry.name: count for entry, count in facade.get_amenity_facets(max_price=100)}
+        self.assertEqual(counts, {"WiFi": 1, "Pool": 0})
+
+        response = self.client.get(f"/api/v1/places/facets?amenities={self.pool.id}")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual({a['name']: a['count'] for a in response.get_json()}, {"WiFi": 1, "Pool": 2})
+
+    def test_reconcile(self):
+        db.session.execute(text("UPDATE amenities SET bit = NULL"))
+        db.session.execute(text("UPDATE places SET amenity_bitmap = 0"))
+        db.session.commit()
+        self.assertEqual(facade.reconcile_amenity_bitmaps(), (2, 4))
+        db.session.expire_all()
+        self.assertEqual(self.titles(amenity_ids=[self.wifi.id, self.pool.id]), ["Villa"])
+        self.assertEqual(self.places["Villa"].amenity_bitmap, 0b11)
+
+
+if __name__ == "__main__":
+    unittest.main()
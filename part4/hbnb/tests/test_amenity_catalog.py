@@ -0,0 +1,138 @@
+import unittest
+from unittest.mock import patch
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.models.amenity import Amenity
+from app.persistence.catalog import AmenityCatalog, amenity_catalog
+from app.persistence.unit_of_work import unit_of_work
+from app.services import facade
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestAmenityCatalog(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        owner = User(first_name="Owner", last_name="User", email="owner@hbnb.io", password="x")
+        wifi, pool = Amenity(name="Wifi"), Amenity(name="Pool")
+        db.session.add_all([owner, wifi, pool])
+        db.session.commit()
+        self.owner_id, self.wifi_id, self.pool_id = owner.id, wifi.id, pool.id
+        amenity_catalog.snapshot()
+
+        self.statements = []
+        event.listen(db.engine, "before_cursor_execute", self.record)
+
+    def tearDown(self):
+        event.remove(db.engine, "before_cursor_execute", self.record)
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def place_data(self, amenities):
+        return {"title": "Flat", "description": "desc", "price": 100.0, "latitude": 45.0,
+                "longitude": 5.0, "owner_id": self.owner_id, "amenities": amenities}
+
+    def test_list_and_checks_cost_no_query(self):
+        response = self.client.get("/api/v1/amenities/?limit=1")
+        self.assertEqual(response.get_json(), [{"id": self.wifi_id, "name": "Wifi"}])
+        response = self.client.get(f"/api/v1/amenities/?limit=1&after={response.headers['X-Next-Cursor']}")
+        self.assertEqual(response.get_json(), [{"id": self.pool_id, "name": "Pool"}])
+        self.assertIsNone(facade.get_amenity("missing"))
+        with self.assertRaises(ValueError) as error:
+            facade.create_amenity({"name": "Wifi"})
+        self.assertEqual(str(error.exception), "Amenity with this name already exists")
+        with self.assertRaises(ValueError) as error:
+            facade.create_place(self.place_data([self.wifi_id, "missing"]))
+        self.assertEqual(str(error.exception), "Amenity not found: missing")
+        with self.assertRaises(ValueError):
+            db.session.get(Amenity, self.pool_id).update({"name": "Wifi"})
+        self.assertFalse([s for s in self.statements if "FROM amenities" in s and "WHERE" not in s])
+        self.assertFalse([s for s in self.statements if "amenities.name =" in s])
+
+    def test_rebuilt_after_committed_writes(self):
+        version = amenity_catalog.version
+        amenity = facade.create_amenity({"name": "Parking"})
+        self.assertEqual(amenity_catalog.id_of("Parking"), amenity.id)
+        facade.update_amenity(self.wifi_id, {"name": "Fiber"})
+        self.assertEqual(amenity_catalog.name_of(self.wifi_id), "Fiber")
+        self.assertIsNone(amenity_catalog.id_of("Wifi"))
+        self.assertEqual(amenity_catalog.version, version + 2)
+
+        # Linking amenities to a place does not touch the catalogue
+        facade.create_place(self.place_data([self.wifi_id, self.pool_id]))
+        amenity_catalog.snapshot()
+        self.assertEqual(amenity_catalog.version, version + 2)
+
+    def test_unit_of_work_sees_its_own_writes(self):
+        with unit_of_work():
+            amenity = facade.create_amenity({"name": "Parking"})
+            db.session.flush()
+            place = facade.create_place(self.place_data([amenity.id]))
+        self.assertEqual([a.name for a in place.amenities], ["Parking"])
+
+        with self.assertRaises(ValueError):
+            with unit_of_work():
+                facade.create_amenity({"name": "Sauna"})
+                raise ValueError("abort")
+        self.assertIsNone(amenity_catalog.id_of("Sauna"))
+
+    def test_snapshot_expires(self):
+        clock = FakeClock()
+        catalog = AmenityCatalog(ttl=10, clock=clock)
+        self.assertEqual(catalog.get_collection_state()[0], 2)
+        db.session.execute(Amenity.__table__.insert().values(id="raw", name="Raw"))
+        self.assertEqual(catalog.get_collection_state()[0], 2)
+        clock.now = 10
+        self.assertEqual(catalog.get_collection_state()[0], 3)
+        self.assertEqual(catalog.version, 2)
+
+    def test_misses_are_checked_in_the_table(self):
+        # Written by another worker: this process' snapshot has not expired yet
+        amenity_catalog.snapshot()
+        db.session.execute(Amenity.__table__.insert().values(id="raw", name="Raw"))
+        db.session.commit()
+        version = amenity_catalog.version
+        self.assertEqual(facade.get_amenity("raw").name, "Raw")
+        self.assertEqual(amenity_catalog.missing([self.wifi_id, "raw", "unknown"]), ["unknown"])
+        place = facade.create_place(self.place_data(["raw"]))
+        self.assertEqual([a.name for a in place.amenities], ["Raw"])
+        with self.assertRaises(ValueError) as error:
+            facade.create_amenity({"name": "Raw"})
+        self.assertEqual(str(error.exception), "Amenity with this name already exists")
+        self.assertGreater(amenity_catalog.version, version)
+        self.assertEqual(amenity_catalog.name_of("raw"), "Raw")
+
+    def test_duplicate_name_from_a_race_is_a_400(self):
+        # The name is free in the snapshot and the table when checked
+        with patch.object(amenity_catalog, "id_of", return_value=None):
+            response = self.client.post("/api/v1/amenities/", json={"name": "Wifi"})
+            self.assertEqual(response.status_code, 400)
+            response = self.client.put(f"/api/v1/amenities/{self.pool_id}", json={"name": "Wifi"})
+            self.assertEqual(response.status_code, 400)
+        with patch.object(amenity_catalog, "taken", return_value=set()):
+            response = self.client.post("/api/v1/amenities/batch", json=[{"name": "Wifi"}])
+            self.assertEqual(response.status_code, 400)
+        self.assertEqual(facade.get_amenity(self.pool_id).name, "Pool")
+
+
+if __name__ == "__main__":
+    unittest.main()
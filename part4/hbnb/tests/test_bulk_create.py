@@ -0,0 +1,134 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.models.amenity import Amenity
+from app.persistence.cache import entity_cache
+from app.persistence.catalog import amenity_catalog
+from app.services import facade
+
+
+class TestBulkCreate(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        # Count database round-trips, not cache hits
+        self.app.config["CACHE_BACKEND"] = "null"
+        entity_cache.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        self.owner = User(first_name="Owner", last_name="User", email="owner@hbnb.io", password="x")
+        self.guests = [User(first_name="Guest", last_name=str(i), email=f"guest{i}@hbnb.io", password="x")
+                       for i in range(2)]
+        self.amenities = [Amenity(name=f"Amenity {i}") for i in range(3)]
+        db.session.add_all([self.owner, *self.guests, *self.amenities])
+        db.session.commit()
+        self.owner_id = self.owner.id
+        # Built once per process in production, not part of the measured requests
+        amenity_catalog.snapshot()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def post(self, url, body, is_admin=False):
+        token = create_access_token(identity={'id': self.owner_id, 'is_admin': is_admin})
+        return self.client.post(url, json=body, headers={"Authorization": f"Bearer {token}"})
+
+    def place_item(self, title, amenities=()):
+        return {"title": title, "description": "desc", "price": 80.0,
+                "latitude": 48.85, "longitude": 2.35, "amenities": list(amenities)}
+
+    def test_places_batch_uses_constant_queries(self):
+        amenity_ids = [amenity.id for amenity in self.amenities]
+        db.session.expunge_all()
+        statements = []
+        listener = lambda *args: statements.append(args[2])
+        event.listen(db.engine, "before_cursor_execute", listener)
+        try:
+            response = self.post("/api/v1/places/batch",
+                                 [self.place_item(f"Place {i}", amenity_ids) for i in range(20)])
+        finally:
+            event.remove(db.engine, "before_cursor_execute", listener)
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.get_json()["created"], 20)
+        self.assertEqual(Place.query.count(), 20)
+        self.assertEqual(len(Place.query.first().amenities), 3)
+        amenity_selects = [s for s in statements if s.startswith("SELECT") and "FROM amenities" in s]
+        self.assertEqual(len(amenity_selects), 1)
+        inserts = [s for s in statements if s.startswith("INSERT INTO places")]
+        self.assertLessEqual(len(inserts), 1)
+
+    def test_places_batch_reports_invalid_items(self):
+        response = self.post("/api/v1/places/batch", [
+            self.place_item("Valid"),
+            self.place_item(""),
+            self.place_item("Unknown amenity", ["missing-id"]),
+        ])
+        self.assertEqual(response.status_code, 207)
+        results = response.get_json()["results"]
+        self.assertIn("id", results[0])
+        self.assertEqual(results[1]["error"], "title is required")
+        self.assertEqual(results[2]["error"], "Amenity not found: missing-id")
+        self.assertEqual(Place.query.count(), 1)
+
+        # The API sets owner_id from the token; other callers may pass anything
+        results = facade.create_places_bulk([dict(self.place_item("Listed owner"), owner_id=[self.owner_id])])
+        self.assertEqual(results, [{"index": 0, "error": "Invalid owner_id"}])
+
+    def test_batch_body_must_be_a_list(self):
+        response = self.post("/api/v1/amenities/batch", {"name": "Pool"})
+        self.assertEqual(response.status_code, 400)
+        self.app.config["BATCH_SIZE_MAX"] = 2
+        response = self.post("/api/v1/amenities/batch", [{"name": str(i)} for i in range(3)])
+        self.assertEqual(response.status_code, 400)
+
+    def test_amenities_batch_rejects_duplicate_names(self):
+        response = self.post("/api/v1/amenities/batch",
+                             [{"name": "Pool"}, {"name": "Amenity 0"}, {"name": "Pool"}, {}])
+        self.assertEqual(response.status_code, 207)
+        body = response.get_json()
+        self.assertEqual((body["created"], body["failed"]), (1, 3))
+        self.assertEqual(body["results"][1]["error"], "Amenity with this name already exists")
+        self.assertEqual(body["results"][2]["error"], "Amenity with this name already exists")
+        self.assertEqual(body["results"][3]["error"], "Amenity name is required")
+
+    def test_admin_reviews_batch(self):
+        place = Place(title="Flat", description="desc", price=100.0, latitude=45.0, longitude=5.0, owner=self.owner)
+        db.session.add(place)
+        db.session.commit()
+        items = [
+            {"text": "Great", "rating": 5, "user_id": self.guests[0].id, "place_id": place.id},
+            {"text": "Fine", "rating": 3, "user_id": self.guests[1].id, "place_id": place.id},
+            {"text": "Again", "rating": 1, "user_id": self.guests[1].id, "place_id": place.id},
+            {"text": "Mine", "rating": 5, "user_id": self.owner.id, "place_id": place.id},
+            {"text": "Bad", "rating": 7, "user_id": self.guests[0].id, "place_id": place.id},
+            {"text": "List", "rating": 4, "user_id": [self.guests[0].id], "place_id": place.id},
+            {"text": "Object", "rating": 4, "user_id": self.guests[0].id, "place_id": {"id": place.id}},
+        ]
+
+        self.assertEqual(self.post("/api/v1/admins/reviews/batch", items).status_code, 403)
+
+        response = self.post("/api/v1/admins/reviews/batch", items, is_admin=True)
+        self.assertEqual(response.status_code, 207)
+        errors = [result.get("error") for result in response.get_json()["results"]]
+        self.assertEqual(errors, [None, None, "You have already reviewed this place.",
+                                  "You cannot review your own place.",
+                                  "Rating must be an integer between 1 and 5",
+                                  "Invalid user_id", "Invalid place_id"])
+        self.assertEqual(Review.query.count(), 2)
+        db.session.refresh(place)
+        self.assertEqual((place.review_count, place.rating_sum), (2, 8))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,105 @@
+import gzip
+import json
+import unittest
+import zlib
+from app import create_app
+from app.compression import GZIP_WBITS, brotli
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.user import User
+
+
+class TestCompression(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        db.session.add_all([Amenity(name=f"Amenity number {i}") for i in range(50)])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def get(self, url, encoding="gzip", **headers):
+        return self.client.get(url, headers={"Accept-Encoding": encoding, **headers})
+
+    def test_large_json_is_gzipped(self):
+        response = self.get("/api/v1/amenities/?limit=50")
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertIn("Accept-Encoding", response.headers["Vary"])
+        body = json.loads(gzip.decompress(response.get_data()))
+        self.assertEqual(len(body), 50)
+        self.assertLess(int(response.headers["Content-Length"]), len(json.dumps(body)))
+
+    def test_small_body_and_identity_are_not_compressed(self):
+        response = self.get("/api/v1/amenities/?limit=1")
+        self.assertNotIn("Content-Encoding", response.headers)
+        response = self.get("/api/v1/amenities/?limit=50", encoding="identity")
+        self.assertNotIn("Content-Encoding", response.headers)
+        self.assertEqual(len(response.get_json()), 50)
+
+    def test_static_files(self):
+        response = self.get("/static/images/default.jpg")
+        self.assertNotIn("Content-Encoding", response.headers)
+        response.close()
+        response = self.get("/static/css/styles.css")
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        with open("app/static/css/styles.css", "rb") as css:
+            self.assertEqual(gzip.decompress(response.get_data()), css.read())
+
+    def test_stream_is_compressed_chunk_by_chunk(self):
+        self.app.config["STREAM_BATCH_SIZE"] = 10
+        db.session.add_all([User(first_name="User", last_name=str(i), email=f"user{i}@hbnb.io", password="x")
+                            for i in range(25)])
+        db.session.commit()
+
+        response = self.get("/api/v1/users/?stream=1")
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.headers["Content-Encoding"], "gzip")
+        self.assertNotIn("Content-Length", response.headers)
+        chunks = list(response.response)
+        self.assertGreaterEqual(len(chunks), 3)
+        # Every chunk is flushed: the rows received so far decompress on their own
+        self.assertEqual(zlib.decompressobj(GZIP_WBITS).decompress(chunks[0]).count(b"\n"), 10)
+        lines = gzip.decompress(b"".join(chunks)).splitlines()
+        self.assertEqual(len(lines), 25)
+
+    def test_compressed_etag_stays_strong_and_revalidates(self):
+        url = "/api/v1/amenities/?limit=50"
+        etag = self.get(url).headers["ETag"]
+        self.assertTrue(etag.startswith('"') and etag.endswith('-gzip"'))
+        self.assertEqual(self.get(url, **{"If-None-Match": etag}).status_code, 304)
+        self.assertEqual(self.get(url, "identity", **{"If-None-Match": etag}).status_code, 304)
+
+    def test_static_file_revalidates_with_compressed_etag(self):
+        etag = self.get("/static/css/styles.css").headers["ETag"]
+        self.assertTrue(etag.endswith('-gzip"'))
+        response = self.get("/static/css/styles.css", **{"If-None-Match": etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_data(), b"")
+
+    def test_if_match_uses_strong_comparison(self):
+        amenity = db.session.query(Amenity).first()
+        url = f"/api/v1/amenities/{amenity.id}"
+        etag = self.get(url, "identity").headers["ETag"]
+        gzip_etag = etag[:-1] + '-gzip"'
+        response = self.client.put(url, json={"name": "Renamed"}, headers={"If-Match": f"W/{etag}"})
+        self.assertEqual(response.status_code, 412)
+        response = self.client.put(url, json={"name": "Renamed"}, headers={"If-Match": gzip_etag})
+        self.assertEqual(response.status_code, 200)
+
+    @unittest.skipIf(brotli is None, "brotli is not installed")
+    def test_brotli_preferred_when_available(self):
+        response = self.get("/api/v1/amenities/?limit=50", encoding="gzip, br")
+        self.assertEqual(response.headers["Content-Encoding"], "br")
+        self.assertEqual(len(json.loads(brotli.decompress(response.get_data()))), 50)
+
+
+if __name__ == "__main__":
+    unittest.main()
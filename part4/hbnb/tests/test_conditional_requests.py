@@ -0,0 +1,118 @@
+import unittest
+from sqlalchemy import event
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.services import facade
+
+
+class TestConditionalRequests(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        self.owner = User(first_name="Owner", last_name="User", email="owner@hbnb.io", password="x")
+        self.guest = User(first_name="Guest", last_name="User", email="guest@hbnb.io", password="x")
+        self.amenity = Amenity(name="Wifi")
+        self.place = Place(title="Flat", description="desc", price=100.0, latitude=45.0, longitude=5.0,
+                           owner=self.owner, amenities=[self.amenity])
+        db.session.add_all([self.owner, self.guest, self.amenity, self.place])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def get(self, url, etag=None):
+        return self.client.get(url, headers={"If-None-Match": etag} if etag else {})
+
+    def test_item_revalidation(self):
+        url = f"/api/v1/amenities/{self.amenity.id}"
+        response = self.get(url)
+        etag = response.headers["ETag"]
+
+        response = self.get(url, etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.get_data(), b"")
+        self.assertEqual(response.headers["ETag"], etag)
+
+        facade.update_amenity(self.amenity.id, {"name": "Fiber"})
+        response = self.get(url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+    def test_place_detail_etag_covers_related_objects(self):
+        url = f"/api/v1/places/{self.place.id}"
+        etag = self.get(url).headers["ETag"]
+        self.assertEqual(self.get(url, etag).status_code, 304)
+
+        facade.create_review({"text": "Nice", "rating": 4, "user_id": self.guest.id, "place_id": self.place.id})
+        response = self.get(url, etag)
+        self.assertEqual(response.status_code, 200)
+        etag = response.headers["ETag"]
+
+        facade.update_user(self.guest.id, {"first_name": "Renamed"})
+        self.assertEqual(self.get(url, etag).status_code, 200)
+
+    def test_collection_revalidation(self):
+        url = "/api/v1/amenities/?limit=10"
+        etag = self.get(url).headers["ETag"]
+        self.assertEqual(self.get(url, etag).status_code, 304)
+        self.assertEqual(self.get("/api/v1/amenities/?limit=5", etag).status_code, 200)
+
+        facade.create_amenity({"name": "Pool"})
+        response = self.get(url, etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()), 2)
+
+    def test_if_match_on_put(self):
+        url = f"/api/v1/amenities/{self.amenity.id}"
+        etag = self.get(url).headers["ETag"]
+
+        response = self.client.put(url, json={"name": "Fiber"}, headers={"If-Match": etag})
+        self.assertEqual(response.status_code, 200)
+        self.assertNotEqual(response.headers["ETag"], etag)
+
+        response = self.client.put(url, json={"name": "Cable"}, headers={"If-Match": etag})
+        self.assertEqual(response.status_code, 412)
+        self.assertEqual(facade.get_amenity(self.amenity.id).name, "Fiber")
+
+    def test_if_match_on_place_put(self):
+        url = f"/api/v1/places/{self.place.id}"
+        token = create_access_token(identity={"id": self.owner.id, "is_admin": False})
+        headers = {"Authorization": f"Bearer {token}", "If-Match": self.get(url).headers["ETag"]}
+        body = {"title": "Loft", "price": 120.0, "latitude": 45.0, "longitude": 5.0}
+
+        self.assertEqual(self.client.put(url, json=body, headers=headers).status_code, 200)
+        self.assertEqual(self.client.put(url, json=body, headers=headers).status_code, 412)
+
+    def test_place_put_without_if_match_skips_detail_etag(self):
+        facade.create_review({"text": "Nice", "rating": 4, "user_id": self.guest.id, "place_id": self.place.id})
+        url = f"/api/v1/places/{self.place.id}"
+        token = create_access_token(identity={"id": self.owner.id, "is_admin": False})
+        body = {"title": "Loft", "price": 120.0, "latitude": 45.0, "longitude": 5.0}
+        executed = []
+
+        def record(conn, cursor, statement, *args):
+            executed.append(statement)
+
+        event.listen(db.engine, 'before_cursor_execute', record)
+        try:
+            response = self.client.put(url, json=body, headers={"Authorization": f"Bearer {token}"})
+        finally:
+            event.remove(db.engine, 'before_cursor_execute', record)
+        self.assertEqual(response.status_code, 200)
+        self.assertFalse(any("FROM reviews" in statement or "FROM place_amenities" in statement
+                             for statement in executed))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,176 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event, text
+from app import create_app
+from app.extensions import db, hasher
+from app.models.user import User
+from app.models.place import Place
+from app.models.amenity import Amenity
+from app.api.v1.conditional import object_etag
+from app.persistence.cache import LRUCache, entity_cache
+from app.services import facade
+
+
+class FakeClock:
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestLRUCache(unittest.TestCase):
+
+    def test_evicts_least_recently_used(self):
+        cache = LRUCache(max_entries=2)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+        self.assertIsNone(cache.get("b"))
+        self.assertEqual((cache.get("a"), cache.get("c")), (1, 3))
+        stats = cache.stats()
+        self.assertEqual((stats["size"], stats["hits"], stats["misses"], stats["evictions"]), (2, 3, 1, 1))
+
+    def test_entries_expire(self):
+        clock = FakeClock()
+        cache = LRUCache(ttl=10, clock=clock)
+        cache.set("a", 1)
+        clock.now = 9.9
+        self.assertEqual(cache.get("a"), 1)
+        clock.now = 10
+        self.assertIsNone(cache.get("a"))
+        self.assertEqual(cache.stats()["expirations"], 1)
+
+
+class TestCachedRepositories(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        owner = User(first_name="Owner", last_name="User", email="owner@hbnb.io", password="x")
+        amenity = Amenity(name="Wifi")
+        place = Place(title="Flat", description="desc", price=100.0, latitude=45.0, longitude=5.0, owner=owner)
+        db.session.add_all([owner, amenity, place])
+        db.session.commit()
+        self.owner_id, self.amenity_id, self.place_id = owner.id, amenity.id, place.id
+        self.new_request()
+
+        self.statements = []
+        event.listen(db.engine, "before_cursor_execute", self.record)
+
+    def tearDown(self):
+        event.remove(db.engine, "before_cursor_execute", self.record)
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def new_request(self):
+        """Drop the session identity map, as at the end of a request."""
+        db.session.remove()
+
+    def test_second_read_is_served_from_cache(self):
+        self.assertEqual(facade.get_place(self.place_id).title, "Flat")
+        self.assertEqual(len(self.statements), 1)
+        self.new_request()
+
+        place = facade.get_place(self.place_id)
+        self.assertEqual((place.title, place.price), ("Flat", 100.0))
+        self.assertEqual(len(self.statements), 1)
+        self.assertEqual(entity_cache.stats()["hits"], 1)
+        # Relationships still load lazily from the database
+        self.assertEqual(place.owner.first_name, "Owner")
+
+    def test_writes_invalidate(self):
+        facade.get_amenity(self.amenity_id)
+        self.new_request()
+        # Updated outside the facade, through the model
+        facade.get_amenity(self.amenity_id).update({"name": "Fiber"})
+        self.new_request()
+        self.assertEqual(facade.get_amenity(self.amenity_id).name, "Fiber")
+
+        facade.update_place(self.place_id, {"price": 80.0})
+        self.new_request()
+        self.assertEqual(facade.get_place(self.place_id).price, 80.0)
+
+        db.session.delete(facade.get_amenity(self.amenity_id))
+        db.session.commit()
+        self.new_request()
+        self.assertIsNone(facade.get_amenity(self.amenity_id))
+
+    def test_email_lookup(self):
+        self.assertEqual(facade.get_user_by_email("owner@hbnb.io").id, self.owner_id)
+        self.new_request()
+        self.statements.clear()
+        self.assertEqual(facade.get_user_by_email("owner@hbnb.io").id, self.owner_id)
+        self.assertEqual(self.statements, [])
+
+        user = facade.get_user(self.owner_id)
+        user.email = "renamed@hbnb.io"
+        db.session.commit()
+        self.new_request()
+        self.assertIsNone(facade.get_user_by_email("owner@hbnb.io"))
+        self.assertEqual(facade.get_user_by_email("renamed@hbnb.io").id, self.owner_id)
+
+    def test_get_many_queries_misses_only(self):
+        facade.get_amenity(self.amenity_id)
+        other = Amenity(name="Pool")
+        db.session.add(other)
+        db.session.commit()
+        other_id = other.id
+        self.new_request()
+        self.statements.clear()
+
+        found, missing = facade.amenity_repo.get_many([self.amenity_id, other_id, "missing"])
+        self.assertEqual(list(found), [self.amenity_id, other_id])
+        self.assertEqual(missing, ["missing"])
+        self.assertEqual(len(self.statements), 1)
+        self.assertNotIn(self.amenity_id, str(self.statements))
+
+    def test_preconditions_and_login_read_the_table(self):
+        client = self.app.test_client()
+        user = facade.get_user(self.owner_id)
+        user.hash_password("old")
+        db.session.commit()
+        old_etag = object_etag(facade.get_amenity(self.amenity_id))
+        self.assertTrue(facade.get_user_by_email("owner@hbnb.io").verify_password("old"))
+        # Written by another worker: this process keeps the cached rows
+        db.session.execute(text("UPDATE amenities SET name = 'Fiber', updated_at = '2030-01-01 00:00:00'"))
+        db.session.execute(text("UPDATE users SET password = :password"), {"password": hasher.hash("new")})
+        db.session.commit()
+        self.new_request()
+        self.assertEqual(facade.get_amenity(self.amenity_id).name, "Wifi")
+        self.new_request()
+
+        response = client.put(f"/api/v1/amenities/{self.amenity_id}", json={"name": "Pool"},
+                              headers={"If-Match": old_etag})
+        self.assertEqual(response.status_code, 412)
+        self.new_request()
+        response = client.post("/api/v1/auth/login", json={"email": "owner@hbnb.io", "password": "old"})
+        self.assertEqual(response.status_code, 401)
+        response = client.post("/api/v1/auth/login", json={"email": "owner@hbnb.io", "password": "new"})
+        self.assertEqual(response.status_code, 200)
+
+    def test_null_backend_and_metrics(self):
+        self.app.config["CACHE_BACKEND"] = "null"
+        entity_cache.init_app(self.app)
+        facade.get_place(self.place_id)
+        self.new_request()
+        facade.get_place(self.place_id)
+        self.assertEqual(len(self.statements), 2)
+
+        token = create_access_token(identity={"id": self.owner_id, "is_admin": True})
+        response = self.app.test_client().get("/api/v1/admins/metrics/cache",
+                                               headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.get_json()["backend"], "null")
+
+
+if __name__ == "__main__":
+    unittest.main()
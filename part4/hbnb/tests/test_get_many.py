@@ -0,0 +1,91 @@
+import unittest
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.persistence.cache import entity_cache
+from app.persistence.catalog import amenity_catalog
+from app.models.user import User
+from app.persistence.repository import InMemoryRepository
+from app.services import facade
+
+
+class TestGetMany(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        # Count database round-trips, not cache hits
+        self.app.config["CACHE_BACKEND"] = "null"
+        entity_cache.init_app(self.app)
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        self.owner = User(first_name="Owner", last_name="User", email="owner@hbnb.io", password="x")
+        self.amenities = [Amenity(name=f"Amenity {i}") for i in range(30)]
+        db.session.add_all([self.owner, *self.amenities])
+        db.session.commit()
+        self.owner_id = self.owner.id
+        self.amenity_ids = [amenity.id for amenity in self.amenities]
+        # Start from an empty session, as a new request would
+        db.session.expunge_all()
+        # Built once per process in production, not part of the measured requests
+        amenity_catalog.snapshot()
+
+        self.statements = []
+        event.listen(db.engine, "before_cursor_execute", self.record)
+
+    def tearDown(self):
+        event.remove(db.engine, "before_cursor_execute", self.record)
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def record(self, conn, cursor, statement, parameters, context, executemany):
+        self.statements.append(statement)
+
+    def amenity_queries(self):
+        # Lookups by ID, not the load of a place's current amenities collection
+        return [s for s in self.statements
+                if s.startswith("SELECT") and "FROM amenities" in s and "place_amenities" not in s]
+
+    def test_sqlalchemy_get_many(self):
+        ids = [self.amenity_ids[2], "missing", self.amenity_ids[0], self.amenity_ids[2]]
+        found, missing = facade.amenity_repo.get_many(ids)
+        self.assertEqual(list(found), [self.amenity_ids[2], self.amenity_ids[0]])
+        self.assertEqual(missing, ["missing"])
+        self.assertEqual(len(self.amenity_queries()), 1)
+        self.assertEqual(facade.amenity_repo.get_many([]), ({}, []))
+
+    def test_in_memory_get_many(self):
+        repo = InMemoryRepository()
+        for amenity in self.amenities[:2]:
+            repo.add(amenity)
+        found, missing = repo.get_many([self.amenities[1].id, "missing"])
+        self.assertEqual(found, {self.amenities[1].id: self.amenities[1]})
+        self.assertEqual(missing, ["missing"])
+
+    def test_place_with_30_amenities_costs_one_amenity_query(self):
+        amenity_ids = self.amenity_ids
+        place = facade.create_place({"title": "Flat", "description": "desc", "price": 100.0,
+                                     "latitude": 45.0, "longitude": 5.0,
+                                     "owner_id": self.owner_id, "amenities": amenity_ids})
+        self.assertEqual(len(self.amenity_queries()), 1)
+        place_id = place.id
+
+        db.session.expunge_all()
+        self.statements.clear()
+        place = facade.update_place(place_id, {"amenities": amenity_ids[::-1]})
+        self.assertEqual(len(self.amenity_queries()), 1)
+        self.assertEqual({amenity.id for amenity in place.amenities}, set(amenity_ids))
+
+    def test_missing_amenity_is_reported(self):
+        with self.assertRaises(ValueError) as error:
+            facade.create_place({"title": "Flat", "description": "desc", "price": 100.0,
+                                 "latitude": 45.0, "longitude": 5.0, "owner_id": self.owner_id,
+                                 "amenities": [self.amenity_ids[0], "missing"]})
+        self.assertEqual(str(error.exception), "Amenity not found: missing")
+
+
+if __name__ == "__main__":
+    unittest.main()
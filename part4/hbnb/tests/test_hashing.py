@@ -0,0 +1,105 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from app import create_app
+from app.extensions import db, hasher
+from app.hashing import HashingBusyError, PasswordHasher
+from app.models.user import User
+
+
+class TestPasswordHasher(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        hasher.init_app(self.app)
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_hash_uses_configured_cost(self):
+        user = User(first_name="John", last_name="Doe", email="john@hbnb.io")
+        user.hash_password("secret")
+        self.assertTrue(user.password.startswith("$2b$04$"))
+        self.assertTrue(user.verify_password("secret"))
+        self.assertFalse(user.verify_password("wrong"))
+
+    def test_needs_rehash(self):
+        self.assertFalse(hasher.needs_rehash(hasher.hash("secret")))
+        # A worker configured with a higher cost keeps its hashes
+        self.assertFalse(hasher.needs_rehash("$2b$12$rYAeW1nlTrvgo9XW6gSuU.zJ5QZrFt6R/KybMB94brmdyLxgQwODm"))
+        hasher.rounds = 13
+        self.assertTrue(hasher.needs_rehash("$2b$12$rYAeW1nlTrvgo9XW6gSuU.zJ5QZrFt6R/KybMB94brmdyLxgQwODm"))
+        self.assertTrue(hasher.needs_rehash("not a hash"))
+
+    def test_login_upgrades_hash_cost(self):
+        user = User(first_name="John", last_name="Doe", email="john@hbnb.io")
+        user.hash_password("secret")
+        db.session.add(user)
+        db.session.commit()
+        hasher.rounds = 5
+
+        response = self.client.post("/api/v1/auth/login", json={"email": "john@hbnb.io", "password": "secret"})
+        self.assertEqual(response.status_code, 200)
+        db.session.refresh(user)
+        self.assertTrue(user.password.startswith("$2b$05$"))
+        self.assertTrue(user.verify_password("secret"))
+
+        # Back on a worker with a lower cost: the stronger hash is not rewritten
+        hasher.rounds = 4
+        upgraded = user.password
+        response = self.client.post("/api/v1/auth/login", json={"email": "john@hbnb.io", "password": "secret"})
+        self.assertEqual(response.status_code, 200)
+        db.session.refresh(user)
+        self.assertEqual(user.password, upgraded)
+
+    def test_calibrate_respects_bounds(self):
+        self.assertEqual(PasswordHasher.calibrate(0.001, 4, 8), 4)
+        self.assertEqual(PasswordHasher.calibrate(60000, 4, 6), 6)
+
+    def test_process_pool(self):
+        pool = PasswordHasher()
+        self.app.config.update(HASHING_EXECUTOR='process', HASHING_WORKERS=1)
+        pool.init_app(self.app)
+        try:
+            password_hash = pool.hash("secret")
+            self.assertTrue(pool.verify(password_hash, "secret"))
+            self.assertEqual(pool.stats()['completed'], 2)
+        finally:
+            pool.shutdown()
+
+    def test_full_queue_returns_503(self):
+        user = User(first_name="John", last_name="Doe", email="john@hbnb.io")
+        user.hash_password("secret")
+        db.session.add(user)
+        db.session.commit()
+
+        self.app.config.update(HASHING_EXECUTOR='process', HASHING_MAX_PENDING=1, HASHING_QUEUE_TIMEOUT=0)
+        hasher.init_app(self.app)
+        hasher._slots.acquire()
+        try:
+            with self.assertRaises(HashingBusyError):
+                hasher.verify(user.password, "secret")
+            response = self.client.post("/api/v1/auth/login", json={"email": "john@hbnb.io", "password": "secret"})
+            self.assertEqual(response.status_code, 503)
+            self.assertEqual(hasher.stats()['rejected'], 2)
+        finally:
+            hasher._slots.release()
+
+    def test_metrics_endpoint_requires_admin(self):
+        token = create_access_token(identity={'id': 'x', 'is_admin': False})
+        response = self.client.get("/api/v1/admins/metrics/hashing", headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, 403)
+
+        token = create_access_token(identity={'id': 'x', 'is_admin': True})
+        response = self.client.get("/api/v1/admins/metrics/hashing", headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('queued', response.get_json())
+
+
+if __name__ == "__main__":
+    unittest.main()
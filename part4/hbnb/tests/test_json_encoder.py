@@ -0,0 +1,74 @@
+import json
+import unittest
+from datetime import datetime
+from uuid import UUID
+from app import create_app
+from app.extensions import db, json_encoder
+from app.json_encoder import ResponseEncoder, orjson, orjson_dumps, stdlib_dumps
+from app.models.amenity import Amenity
+
+
+class TestResponseEncoder(unittest.TestCase):
+
+    payload = {
+        "id": UUID("12345678-1234-5678-1234-567812345678"),
+        "created_at": datetime(2025, 1, 2, 3, 4, 5),
+        "price": 99.5,
+        "title": "Chambre près de la mer",
+        "amenities": [{"id": "a", "name": "Wifi"}],
+        "owner": None,
+    }
+
+    def test_stdlib_encoder(self):
+        expected = {
+            "id": "12345678-1234-5678-1234-567812345678",
+            "created_at": "2025-01-02T03:04:05",
+            "price": 99.5,
+            "title": "Chambre près de la mer",
+            "amenities": [{"id": "a", "name": "Wifi"}],
+            "owner": None,
+        }
+        self.assertEqual(json.loads(stdlib_dumps(self.payload)), expected)
+
+    @unittest.skipUnless(orjson, "orjson is not installed")
+    def test_encoders_write_identical_bytes(self):
+        for pretty in (False, True):
+            self.assertEqual(orjson_dumps(self.payload, pretty),
+                             stdlib_dumps(self.payload, pretty))
+
+    def test_unknown_types_are_rejected(self):
+        with self.assertRaises(TypeError):
+            stdlib_dumps({"value": object()})
+
+    @unittest.skipUnless(orjson, "orjson is not installed")
+    def test_orjson_rejects_unknown_types(self):
+        with self.assertRaises(TypeError):
+            orjson_dumps({"value": object()})
+
+    def test_resolve(self):
+        self.assertEqual(ResponseEncoder.resolve("auto"),
+                         "orjson" if orjson else "stdlib")
+        self.assertEqual(ResponseEncoder.resolve("stdlib"), "stdlib")
+        with self.assertRaises(ValueError):
+            ResponseEncoder.resolve("yaml")
+
+    def test_api_responses_use_configured_encoder(self):
+        for name in ("stdlib", "orjson") if orjson else ("stdlib",):
+            app = create_app("config.TestingConfig")
+            app.config["JSON_ENCODER"] = name
+            json_encoder.init_app(app)
+            with app.app_context():
+                db.create_all()
+                db.session.add(Amenity(name="Wifi"))
+                db.session.commit()
+                response = app.test_client().get("/api/v1/amenities/")
+                self.assertEqual(json_encoder.name, name)
+                self.assertEqual(response.mimetype, "application/json")
+                self.assertEqual(response.get_json()[0]["name"], "Wifi")
+                self.assertTrue(response.get_data().endswith(b"\n"))
+                db.session.remove()
+                db.drop_all()
+
+
+if __name__ == "__main__":
+    unittest.main()
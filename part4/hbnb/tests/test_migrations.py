@@ -0,0 +1,62 @@
+import unittest
+from sqlalchemy import inspect
+from app import create_app
+from app.extensions import db
+from app.persistence.migrations import upgrade_schema
+from app.services import facade
+
+# Tables as created before the geohash, review aggregates and amenity bits
+OLD_SCHEMA = [
+    """CREATE TABLE users (id VARCHAR(36) PRIMARY KEY, first_name VARCHAR(50) NOT NULL,
+        last_name VARCHAR(50) NOT NULL, email VARCHAR(120) NOT NULL UNIQUE, password VARCHAR(128) NOT NULL,
+        is_admin BOOLEAN, created_at DATETIME, updated_at DATETIME)""",
+    """CREATE TABLE amenities (id VARCHAR(36) PRIMARY KEY, name VARCHAR(255) NOT NULL UNIQUE,
+        created_at DATETIME, updated_at DATETIME)""",
+    """CREATE TABLE places (id VARCHAR(36) PRIMARY KEY, title VARCHAR(50) NOT NULL,
+        description VARCHAR(3000) NOT NULL, price FLOAT NOT NULL, latitude FLOAT NOT NULL,
+        longitude FLOAT NOT NULL, owner_id VARCHAR(36) NOT NULL REFERENCES users (id),
+        created_at DATETIME, updated_at DATETIME)""",
+    """CREATE TABLE place_amenities (place_id VARCHAR(36) NOT NULL REFERENCES places (id),
+        amenity_id VARCHAR(36) NOT NULL REFERENCES amenities (id), PRIMARY KEY (place_id, amenity_id))""",
+    "INSERT INTO users (id, first_name, last_name, email, password) VALUES ('u1', 'A', 'B', 'a@hbnb.io', 'x')",
+    "INSERT INTO amenities (id, name) VALUES ('a1', 'WiFi')",
+    """INSERT INTO places (id, title, description, price, latitude, longitude, owner_id)
+        VALUES ('p1', 'Flat', 'desc', 80.0, 45.0, 5.0, 'u1')""",
+    "INSERT INTO place_amenities (place_id, amenity_id) VALUES ('p1', 'a1')",
+]
+
+
+class TestUpgradeSchema(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        with db.engine.begin() as connection:
+            for statement in OLD_SCHEMA:
+                connection.exec_driver_sql(statement)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_old_database_is_upgraded_and_backfilled(self):
+        changes = upgrade_schema()
+        self.assertIn("added column places.geohash", changes)
+        self.assertIn("added column amenities.bit", changes)
+        self.assertIn("created table reviews", changes)
+        self.assertIn("ix_places_geohash", {index['name'] for index in inspect(db.engine).get_indexes('places')})
+        self.assertEqual(upgrade_schema(), [])
+
+        self.assertEqual(facade.reconcile_geohashes(), 1)
+        self.assertEqual(facade.reconcile_geohashes(), 0)
+        self.assertEqual(facade.reconcile_amenity_bitmaps(), (1, 1))
+
+        results, _ = facade.search_places(10, bbox=(44.0, 4.0, 46.0, 6.0), amenity_ids=['a1'])
+        self.assertEqual([place.id for place, _ in results], ['p1'])
+        self.assertEqual(facade.get_place('p1').review_count, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+import unittest
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.persistence.repository import InMemoryRepository, SQLAlchemyRepository
+
+
+class TestCursorPagination(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        start = datetime(2025, 1, 1)
+        # Two amenities share a timestamp to exercise the id tie-breaker
+        self.amenities = [
+            Amenity(name=f"Amenity {i}", created_at=start + timedelta(minutes=i // 2))
+            for i in range(7)
+        ]
+        db.session.add_all(self.amenities)
+        db.session.commit()
+        self.expected = [a.id for a in sorted(self.amenities, key=lambda a: (a.created_at, a.id))]
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def walk(self, repo, limit):
+        ids, cursor = [], None
+        while True:
+            page, cursor = repo.get_page(limit, cursor)
+            self.assertLessEqual(len(page), limit)
+            ids.extend(obj.id for obj in page)
+            if cursor is None:
+                return ids
+
+    def test_sqlalchemy_pages_cover_table_in_order(self):
+        self.assertEqual(self.walk(SQLAlchemyRepository(Amenity), 3), self.expected)
+
+    def test_in_memory_pages_cover_storage_in_order(self):
+        repo = InMemoryRepository()
+        for amenity in self.amenities:
+            repo.add(amenity)
+        self.assertEqual(self.walk(repo, 2), self.expected)
+
+    def test_in_memory_order_follows_writes(self):
+        repo = InMemoryRepository()
+        for amenity in self.amenities:
+            repo.add(amenity)
+        repo.delete(self.expected[0])
+        moved = repo.get(self.expected[1])
+        moved.created_at = datetime(2030, 1, 1)
+        repo.reindex(moved)
+        self.assertEqual(self.walk(repo, 2), self.expected[2:] + [moved.id])
+        self.assertEqual([a.id for a in repo.get_page(None)[0]], self.expected[2:] + [moved.id])
+
+    def test_rows_without_created_at_come_first(self):
+        # Rows inserted by the SQL scripts have no created_at
+        missing = sorted(a.id for a in self.amenities[3:5])
+        db.session.execute(text("UPDATE amenities SET created_at = NULL WHERE id IN (:a, :b)"),
+                           {"a": missing[0], "b": missing[1]})
+        db.session.commit()
+        db.session.expire_all()
+        expected = missing + [amenity_id for amenity_id in self.expected if amenity_id not in missing]
+        for limit in (1, 3):
+            self.assertEqual(self.walk(SQLAlchemyRepository(Amenity), limit), expected)
+
+        repo = InMemoryRepository()
+        for amenity in self.amenities:
+            repo.add(amenity)
+        self.assertEqual(self.walk(repo, 1), expected)
+
+    def test_invalid_cursor(self):
+        with self.assertRaises(ValueError):
+            SQLAlchemyRepository(Amenity).get_page(3, "not-a-cursor")
+
+    def test_endpoint_next_cursor_headers(self):
+        client = self.app.test_client()
+        response = client.get("/api/v1/amenities/?limit=5")
+        self.assertEqual(len(response.get_json()), 5)
+        cursor = response.headers['X-Next-Cursor']
+
+        response = client.get(f"/api/v1/amenities/?limit=5&after={cursor}")
+        self.assertEqual(len(response.get_json()), 2)
+        self.assertNotIn('X-Next-Cursor', response.headers)
+
+    def test_endpoint_pagination_is_opt_in(self):
+        self.app.config['PAGE_SIZE_DEFAULT'] = 2
+        client = self.app.test_client()
+        # Existing clients get the whole list, as before pagination
+        response = client.get("/api/v1/amenities/")
+        self.assertEqual(len(response.get_json()), 7)
+        self.assertNotIn('X-Next-Cursor', response.headers)
+
+        cursor = client.get("/api/v1/amenities/?limit=1").headers['X-Next-Cursor']
+        response = client.get(f"/api/v1/amenities/?after={cursor}")
+        self.assertEqual(len(response.get_json()), 2)
+        self.assertIn('X-Next-Cursor', response.headers)
+
+    def test_endpoint_rejects_bad_cursor(self):
+        client = self.app.test_client()
+        response = client.get("/api/v1/amenities/?after=garbage")
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
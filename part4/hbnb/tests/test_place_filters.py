@@ -0,0 +1,62 @@
+import unittest
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.user import User
+from app.models.place import Place
+
+
+class TestPlaceFilters(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        owner = User(first_name="Owner", last_name="User", email="owner@hbnb.io", password="x")
+        self.wifi = Amenity(name="WiFi")
+        self.pool = Amenity(name="Pool")
+        places = [
+            ("Cabin", 40.0, []),
+            ("Flat", 80.0, [self.wifi]),
+            ("Villa", 250.0, [self.wifi, self.pool]),
+            ("Resort", 120.0, [self.pool]),
+        ]
+        for title, price, amenities in places:
+            place = Place(title=title, description="desc", price=price,
+                          latitude=45.0, longitude=5.0, owner=owner)
+            place.amenities = amenities
+            db.session.add(place)
+        db.session.commit()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def titles(self, query):
+        response = self.client.get(f"/api/v1/places/?{query}")
+        self.assertEqual(response.status_code, 200)
+        return sorted(p['title'] for p in response.get_json())
+
+    def test_price_range(self):
+        self.assertEqual(self.titles("max_price=100"), ["Cabin", "Flat"])
+        self.assertEqual(self.titles("min_price=80&max_price=120"), ["Flat", "Resort"])
+
+    def test_must_have_all_amenities(self):
+        self.assertEqual(self.titles(f"amenities={self.wifi.id}"), ["Flat", "Villa"])
+        self.assertEqual(self.titles(f"amenities={self.wifi.id},{self.pool.id}"), ["Villa"])
+
+    def test_filters_combine_with_search(self):
+        query = f"near=45.0,5.0&radius_km=1&max_price=200&amenities={self.pool.id}"
+        self.assertEqual(self.titles(query), ["Resort"])
+
+    def test_invalid_price(self):
+        response = self.client.get("/api/v1/places/?max_price=cheap")
+        self.assertEqual(response.status_code, 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import unittest
+from contextlib import contextmanager
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+from app.models.amenity import Amenity
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+
+
+@contextmanager
+def count_queries():
+    """Count the SQL statements executed on the engine inside the block."""
+    statements = []
+
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+
+    engine = db.engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+class TestPlaceLoadingProfiles(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def create_place(self, review_count, suffix=""):
+        owner = User(first_name="Owner", last_name="User", email=f"owner{suffix}@hbnb.io", password="x")
+        place = Place(title="Flat", description="desc", price=100.0, latitude=45.0, longitude=5.0, owner=owner)
+        place.amenities = [Amenity(name=f"Amenity {suffix}{i}") for i in range(3)]
+        for i in range(review_count):
+            author = User(first_name="Guest", last_name=str(i), email=f"guest{suffix}{i}@hbnb.io", password="x")
+            db.session.add(Review(text="Nice", rating=5, user=author, place=place))
+        db.session.add(place)
+        db.session.commit()
+        place_id = place.id
+        db.session.expunge_all()
+        return place_id
+
+    def detail_queries(self, place_id):
+        with count_queries() as statements:
+            response = self.client.get(f"/api/v1/places/{place_id}")
+        self.assertEqual(response.status_code, 200)
+        return len(statements), response.get_json()
+
+    def test_detail_query_count_is_constant(self):
+        few, body = self.detail_queries(self.create_place(1, "a"))
+        self.assertEqual(len(body['reviews']), 1)
+        many, body = self.detail_queries(self.create_place(25, "b"))
+        self.assertEqual(len(body['reviews']), 25)
+        self.assertEqual(few, many)
+        self.assertLessEqual(many, 3)
+
+    def test_list_query_count_is_constant(self):
+        for i in range(10):
+            self.create_place(0, f"list{i}")
+        with count_queries() as statements:
+            response = self.client.get("/api/v1/places/")
+        self.assertEqual(len(response.get_json()), 10)
+        # Collection ETag state + the page itself
+        self.assertEqual(len(statements), 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
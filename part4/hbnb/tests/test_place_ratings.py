@@ -0,0 +1,70 @@
+import unittest
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.services import facade
+
+
+class TestPlaceRatingAggregates(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        owner = User(first_name="Owner", last_name="User", email="owner@hbnb.io", password="x")
+        self.guests = [User(first_name="Guest", last_name=str(i), email=f"guest{i}@hbnb.io", password="x")
+                       for i in range(3)]
+        self.place = Place(title="Flat", description="desc", price=100.0, latitude=45.0, longitude=5.0, owner=owner)
+        db.session.add_all([owner, self.place, *self.guests])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def review(self, guest, rating):
+        return facade.create_review({"text": "Nice", "rating": rating,
+                                     "user_id": guest.id, "place_id": self.place.id})
+
+    def test_create_update_delete_maintain_aggregates(self):
+        first = self.review(self.guests[0], 5)
+        self.review(self.guests[1], 2)
+        self.assertEqual((self.place.review_count, self.place.rating_sum), (2, 7))
+        self.assertEqual(self.place.average_rating, 3.5)
+
+        facade.update_review(first.id, {"rating": 3})
+        self.assertEqual((self.place.review_count, self.place.rating_sum), (2, 5))
+
+        facade.delete_review(first.id)
+        self.assertEqual((self.place.review_count, self.place.rating_sum), (1, 2))
+
+    def test_invalid_update_leaves_aggregates(self):
+        review = self.review(self.guests[0], 4)
+        with self.assertRaises(ValueError):
+            facade.update_review(review.id, {"rating": 9})
+        self.assertEqual((self.place.review_count, self.place.rating_sum), (1, 4))
+
+    def test_reconcile(self):
+        for guest, rating in zip(self.guests, (5, 4, 3)):
+            db.session.add(Review(text="Raw", rating=rating, user=guest, place=self.place))
+        db.session.commit()
+        self.assertEqual(self.place.review_count, 0)
+
+        facade.reconcile_place_ratings()
+        self.assertEqual((self.place.review_count, self.place.rating_sum), (3, 12))
+
+    def test_min_rating_filter(self):
+        self.review(self.guests[0], 2)
+        client = self.app.test_client()
+        self.assertEqual(client.get("/api/v1/places/?min_rating=3").get_json(), [])
+        places = client.get("/api/v1/places/?min_rating=2").get_json()
+        self.assertEqual(places[0]['average_rating'], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
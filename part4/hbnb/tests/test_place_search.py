@@ -0,0 +1,144 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+from app import create_app
+from app.extensions import db
+from app.geo import cover_bbox, encode_geohash, haversine_km
+from app.models.user import User
+from app.models.place import Place
+from app.persistence.repository import InMemoryRepository, pack_cursor
+from app.services import facade
+
+# name: (latitude, longitude)
+CITIES = {
+    "Paris": (48.8566, 2.3522),
+    "Versailles": (48.8049, 2.1204),
+    "Lyon": (45.7640, 4.8357),
+    "London": (51.5074, -0.1278),
+    "Sydney": (-33.8688, 151.2093),
+}
+
+
+class TestGeo(unittest.TestCase):
+
+    def test_encode_geohash(self):
+        self.assertEqual(encode_geohash(48.8566, 2.3522, 6), "u09tvw")
+
+    def test_cover_contains_points_inside_box(self):
+        prefixes = cover_bbox(48.0, 1.5, 49.5, 3.0)
+        self.assertLessEqual(len(prefixes), 16)
+        for lat, lng in [(48.0, 1.5), (49.5, 3.0), (48.8566, 2.3522), (48.1, 2.9)]:
+            geohash = encode_geohash(lat, lng)
+            self.assertTrue(any(geohash.startswith(p) for p in prefixes))
+
+    def test_haversine(self):
+        self.assertAlmostEqual(haversine_km(*CITIES["Paris"], *CITIES["Lyon"]), 392, delta=2)
+
+
+class TestPlaceSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        owner = User(first_name="Owner", last_name="User", email="owner@hbnb.io", password="x")
+        for name, (lat, lng) in CITIES.items():
+            db.session.add(Place(title=name, description="desc", price=100.0,
+                                 latitude=lat, longitude=lng, owner=owner))
+        db.session.commit()
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def titles(self, query):
+        response = self.client.get(f"/api/v1/places/?{query}")
+        self.assertEqual(response.status_code, 200)
+        return [p['title'] for p in response.get_json()], response
+
+    def test_geohash_maintained(self):
+        place = Place.query.filter_by(title="Paris").first()
+        self.assertTrue(place.geohash.startswith("u09tvw"))
+        place.update({"latitude": 45.7640, "longitude": 4.8357})
+        self.assertEqual(place.geohash, encode_geohash(45.7640, 4.8357))
+
+    def test_near_sorted_by_distance(self):
+        titles, response = self.titles("near=48.8566,2.3522&radius_km=50")
+        self.assertEqual(titles, ["Paris", "Versailles"])
+        self.assertEqual(response.get_json()[0]['distance_km'], 0)
+
+    def test_bbox(self):
+        titles, _ = self.titles("bbox=-1,45,5,52")
+        self.assertEqual(sorted(titles), ["London", "Lyon", "Paris", "Versailles"])
+
+    def test_search_pagination(self):
+        titles, response = self.titles("near=48.8566,2.3522&radius_km=1000&limit=2")
+        self.assertEqual(titles, ["Paris", "Versailles"])
+        cursor = response.headers['X-Next-Cursor']
+        titles, response = self.titles(f"near=48.8566,2.3522&radius_km=1000&limit=2&after={cursor}")
+        self.assertEqual(titles, ["London", "Lyon"])
+        self.assertNotIn('X-Next-Cursor', response.headers)
+
+    def test_pages_read_only_nearby_places(self):
+        owner = User.query.first()
+        for i in range(20):
+            for j in range(20):
+                db.session.add(Place(title=f"Grid {i} {j}", description="desc", price=100.0,
+                                     latitude=44.0 + i * 0.4, longitude=-2.0 + j * 0.4, owner=owner))
+        db.session.commit()
+        bbox = (44.0, -2.0, 52.0, 6.0)
+        center = (48.0, 2.0)
+        expected = sorted((haversine_km(*center, p.latitude, p.longitude), p.id)
+                          for p in Place.query.all() if 44.0 <= p.latitude <= 52.0 and -2.0 <= p.longitude <= 6.0)
+
+        get_in_bbox = facade.place_repo.get_in_bbox
+        read = []
+
+        def counted(*args, **kwargs):
+            places = get_in_bbox(*args, **kwargs)
+            read.append(len(places))
+            return places
+
+        found, cursor = [], None
+        with patch.object(facade.place_repo, "get_in_bbox", counted):
+            page, cursor = facade.search_places(10, bbox=bbox)
+            # The first page only reads the places around the center
+            self.assertLess(sum(read), 100)
+            while True:
+                found.extend(place.id for place, _ in page)
+                if cursor is None:
+                    break
+                page, cursor = facade.search_places(10, cursor, bbox=bbox)
+        self.assertEqual(found, [place_id for _, place_id in expected])
+
+    def test_invalid_search(self):
+        for query in ["near=48.8,2.3", "bbox=1,2,3", "near=100,0&radius_km=5", "bbox=5,45,-1,52"]:
+            response = self.client.get(f"/api/v1/places/?{query}")
+            self.assertEqual(response.status_code, 400, query)
+
+    def test_forged_cursor_distance(self):
+        for distance in [-1e308, -1e6, -1.0, float("inf"), float("nan"), True]:
+            after = pack_cursor([distance, "x"])
+            response = self.client.get(f"/api/v1/places/?near=48.8,2.3&radius_km=50&after={after}")
+            self.assertEqual(response.status_code, 400, distance)
+
+
+class TestInMemoryGrid(unittest.TestCase):
+
+    def test_get_in_bbox_follows_deletes(self):
+        repo = InMemoryRepository()
+        for name, (lat, lng) in CITIES.items():
+            repo.add(SimpleNamespace(id=name, latitude=lat, longitude=lng))
+        found = repo.get_in_bbox(45, -1, 52, 5)
+        self.assertEqual(sorted(p.id for p in found), ["London", "Lyon", "Paris", "Versailles"])
+
+        repo.delete("London")
+        found = repo.get_in_bbox(45, -1, 52, 5)
+        self.assertEqual(sorted(p.id for p in found), ["Lyon", "Paris", "Versailles"])
+
+
+if __name__ == "__main__":
+    unittest.main()
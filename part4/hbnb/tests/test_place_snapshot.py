@@ -0,0 +1,145 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime, timedelta
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.models.amenity import Amenity
+from app.models.place import Place
+from app.persistence.snapshot import MappedSnapshot, export_snapshot, place_snapshot
+from app.services import facade
+
+# title: (price, latitude, longitude)
+PLACES = {
+    "Paris": (120.0, 48.8566, 2.3522),
+    "Versailles": (80.0, 48.8049, 2.1204),
+    "Lyon": (95.0, 45.7640, 4.8357),
+    "London": (150.0, 51.5074, -0.1278),
+    "Sydney": (60.0, -33.8688, 151.2093),
+}
+
+
+class TestPlaceSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "places.snapshot")
+
+        owner = User(first_name="Owner", last_name="User", email="owner@hbnb.io", password="x")
+        self.wifi, self.pool = Amenity(name="Wifi"), Amenity(name="Pool")
+        db.session.add_all([owner, self.wifi, self.pool])
+        start = datetime(2024, 1, 1)
+        self.places = {}
+        for i, (title, (price, lat, lng)) in enumerate(PLACES.items()):
+            place = Place(title=title, description=f"Stay in {title} ✓", price=price, latitude=lat,
+                          longitude=lng, owner=owner, created_at=start + timedelta(minutes=i // 2))
+            db.session.add(place)
+            self.places[title] = place
+        self.places["Paris"].amenities = [self.wifi, self.pool]
+        self.places["Lyon"].amenities = [self.wifi]
+        self.places["Paris"].review_count, self.places["Paris"].rating_sum = 2, 9
+        db.session.commit()
+
+    def tearDown(self):
+        self.app.config["PLACE_SNAPSHOT_PATH"] = None
+        place_snapshot.init_app(self.app)
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+        self.tmpdir.cleanup()
+
+    def export(self):
+        self.assertEqual(export_snapshot(self.path), (len(PLACES), 2))
+        snapshot = MappedSnapshot(self.path)
+        self.addCleanup(snapshot.close)
+        return snapshot
+
+    def all_pages(self, source, **filters):
+        ids, after = [], None
+        while True:
+            page, after = source.get_page(2, after, **filters)
+            ids.append([place.id for place in page])
+            if after is None:
+                return ids
+
+    def test_round_trip(self):
+        snapshot = self.export()
+        self.assertEqual(len(snapshot), len(PLACES))
+        paris = self.places["Paris"]
+        row = next(row for row in range(len(snapshot)) if snapshot.ids[row] == paris.id)
+        mapped = snapshot.place(row)
+        for field in mapped._fields:
+            self.assertEqual(getattr(mapped, field), getattr(paris, field), field)
+        self.assertEqual(mapped.average_rating, 4.5)
+        self.assertEqual(sorted(snapshot.amenity_ids(row)), sorted([self.wifi.id, self.pool.id]))
+        self.assertEqual(snapshot.get_collection_state(), facade.place_repo.get_collection_state())
+
+    def test_pages_and_filters_match_repository(self):
+        snapshot = self.export()
+        for filters in ({}, {"min_price": 80, "max_price": 120}, {"amenity_ids": [self.wifi.id]},
+                        {"amenity_ids": [self.wifi.id, self.pool.id]}, {"amenity_ids": ["missing"]},
+                        {"min_rating": 4}, {"max_price": 100, "amenity_ids": [self.wifi.id]}):
+            self.assertEqual(self.all_pages(snapshot, **filters),
+                             self.all_pages(facade.place_repo, **filters), filters)
+        # Cursors are interchangeable
+        _, after = facade.place_repo.get_page(3)
+        self.assertEqual([p.id for p in snapshot.get_page(10, after)[0]],
+                         [p.id for p in facade.place_repo.get_page(10, after)[0]])
+
+    def test_price_pages_are_cheapest_first(self):
+        # Ties on price, including a place without created_at, keep (created_at, id) order
+        for title in ("Lyon", "London"):
+            self.places[title].price = 80.0
+        self.places["London"].created_at = None
+        db.session.commit()
+        snapshot = self.export()
+        filters = {"min_price": 70}
+        self.assertEqual(self.all_pages(snapshot, **filters), self.all_pages(facade.place_repo, **filters))
+        page, after = snapshot.get_page(2, **filters)
+        self.assertEqual([place.title for place in page], ["London", "Versailles"])
+        page, after = snapshot.get_page(2, after, **filters)
+        self.assertEqual([place.title for place in page], ["Lyon", "Paris"])
+        with self.assertRaises(ValueError):
+            snapshot.get_page(2, facade.place_repo.get_page(2)[1], **filters)
+
+    def test_bbox_matches_repository(self):
+        snapshot = self.export()
+        for bbox, filters in [((45.0, 0.0, 49.0, 5.0), {}), ((45.0, 0.0, 49.0, 5.0), {"max_price": 100}),
+                              ((-90.0, -180.0, 90.0, 180.0), {}), ((0.0, 0.0, 1.0, 1.0), {})]:
+            self.assertEqual(sorted(p.id for p in snapshot.get_in_bbox(*bbox, **filters)),
+                             sorted(p.id for p in facade.place_repo.get_in_bbox(*bbox, **filters)))
+
+    def test_api_reads_configured_snapshot(self):
+        self.app.config["PLACE_SNAPSHOT_PATH"] = self.path
+        place_snapshot.init_app(self.app)
+        # No file yet: the database is used
+        self.assertEqual(len(self.client.get("/api/v1/places/").get_json()), len(PLACES))
+        export_snapshot(self.path)
+
+        db.session.delete(self.places["Sydney"])
+        db.session.commit()
+        response = self.client.get("/api/v1/places/?max_price=100")
+        self.assertEqual([p["title"] for p in response.get_json()], ["Sydney", "Versailles", "Lyon"])
+        response = self.client.get("/api/v1/places/?near=48.8566,2.3522&radius_km=30")
+        self.assertEqual([p["title"] for p in response.get_json()], ["Paris", "Versailles"])
+
+        # A new export is mapped on the next read
+        export_snapshot(self.path)
+        response = self.client.get("/api/v1/places/?max_price=100")
+        self.assertEqual([p["title"] for p in response.get_json()], ["Versailles", "Lyon"])
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as other:
+            other.write(b"not a snapshot" * 10)
+        with self.assertRaises(ValueError):
+            MappedSnapshot(self.path)
+
+
+if __name__ == "__main__":
+    unittest.main()
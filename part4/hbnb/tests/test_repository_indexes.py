@@ -0,0 +1,80 @@
+import unittest
+import uuid
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.persistence.indexes import HashIndex, Range, SortedIndex
+from app.persistence.repository import InMemoryRepository, SQLAlchemyRepository
+
+
+class Item:
+
+    def __init__(self, email, owner_id, price):
+        self.id = str(uuid.uuid4())
+        self.email = email
+        self.owner_id = owner_id
+        self.price = price
+
+    def update(self, data):
+        for key, value in data.items():
+            setattr(self, key, value)
+
+
+class TestIndexedRepository(unittest.TestCase):
+
+    def setUp(self):
+        self.repo = InMemoryRepository(indexes=[
+            HashIndex('email', unique=True), HashIndex('owner_id'), SortedIndex('price')])
+        self.items = [Item(f"user{i}@hbnb.io", f"owner{i % 2}", float(i * 10)) for i in range(6)]
+        for item in self.items:
+            self.repo.add(item)
+
+    def test_lookups(self):
+        self.assertIs(self.repo.get_by_attribute('email', "user3@hbnb.io"), self.items[3])
+        self.assertIsNone(self.repo.get_by_attribute('email', "missing@hbnb.io"))
+        self.assertEqual(self.repo.filter_by(owner_id="owner1"), self.items[1::2])
+        self.assertEqual(self.repo.filter_by(price=Range(15, 40)), self.items[2:5])
+        self.assertEqual(self.repo.filter_by(price=Range(high=20), owner_id="owner0"),
+                         [self.items[0], self.items[2]])
+
+    def test_writes_maintain_indexes(self):
+        with self.assertRaises(ValueError):
+            self.repo.add(Item("user0@hbnb.io", "owner0", 1.0))
+        with self.assertRaises(ValueError):
+            self.repo.update(self.items[1].id, {"email": "user0@hbnb.io"})
+
+        self.repo.update(self.items[0].id, {"email": "new@hbnb.io", "price": 100.0})
+        self.assertIsNone(self.repo.get_by_attribute('email', "user0@hbnb.io"))
+        self.assertEqual(self.repo.filter_by(price=Range(60)), [self.items[0]])
+        self.repo.delete(self.items[1].id)
+        self.assertEqual(self.repo.filter_by(owner_id="owner1"), [self.items[3], self.items[5]])
+
+
+class TestSQLAlchemyFilterBy(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_filter_by(self):
+        owner = User(first_name="Owner", last_name="User", email="owner@hbnb.io", password="x")
+        places = [Place(title=f"Place {i}", description="desc", price=50.0 * (i + 1),
+                        latitude=0.0, longitude=0.0, owner=owner) for i in range(4)]
+        db.session.add_all([owner, *places])
+        db.session.commit()
+        repo = SQLAlchemyRepository(Place)
+        found = repo.filter_by(owner_id=owner.id, price=Range(100, 150))
+        self.assertEqual(sorted(place.price for place in found), [100.0, 150.0])
+        self.assertEqual(repo.filter_by(price=Range(low=500)), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,91 @@
+import unittest
+from datetime import datetime, timedelta
+from flask_jwt_extended import create_access_token
+from sqlalchemy.exc import IntegrityError
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.services import facade
+
+
+class TestReviewsByPlace(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        self.owner = User(first_name="Owner", last_name="User", email="owner@hbnb.io", password="x")
+        self.guest = User(first_name="Guest", last_name="User", email="guest@hbnb.io", password="x")
+        self.place = Place(title="Flat", description="desc", price=100.0, latitude=45.0, longitude=5.0, owner=self.owner)
+        self.other = Place(title="House", description="desc", price=80.0, latitude=40.0, longitude=2.0, owner=self.owner)
+        db.session.add_all([self.owner, self.guest, self.place, self.other])
+
+        start = datetime(2025, 1, 1)
+        for i in range(5):
+            author = User(first_name="Author", last_name=str(i), email=f"author{i}@hbnb.io", password="x")
+            db.session.add(Review(text=f"Review {i}", rating=4, user=author, place=self.place,
+                                  created_at=start + timedelta(days=i)))
+        db.session.add(Review(text="Elsewhere", rating=3, user=self.guest, place=self.other))
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def test_only_reviews_of_the_place(self):
+        reviews, _ = facade.get_reviews_by_place(self.place.id, 50)
+        self.assertEqual(len(reviews), 5)
+        self.assertTrue(all(r.place_id == self.place.id for r in reviews))
+
+    def test_ordered_oldest_first(self):
+        reviews, _ = facade.get_reviews_by_place(self.place.id, 50)
+        self.assertEqual([r.text for r in reviews], [f"Review {i}" for i in range(5)])
+
+    def test_pagination(self):
+        first, cursor = facade.get_reviews_by_place(self.place.id, 2)
+        second, cursor = facade.get_reviews_by_place(self.place.id, 2, cursor)
+        self.assertEqual([r.text for r in second], ["Review 2", "Review 3"])
+        last, cursor = facade.get_reviews_by_place(self.place.id, 2, cursor)
+        self.assertEqual([r.text for r in last], ["Review 4"])
+        self.assertIsNone(cursor)
+
+    def test_endpoint_rejects_invalid_limit(self):
+        client = self.app.test_client()
+        response = client.get(f"/api/v1/reviews/places/{self.place.id}/reviews?limit=0")
+        self.assertEqual(response.status_code, 400)
+
+    def test_endpoint_returns_page(self):
+        client = self.app.test_client()
+        response = client.get(f"/api/v1/reviews/places/{self.place.id}/reviews?limit=3")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.get_json()), 3)
+        self.assertIn('rel="next"', response.headers['Link'])
+
+
+    def test_has_user_reviewed_place(self):
+        self.assertTrue(facade.has_user_reviewed_place(self.guest.id, self.other.id))
+        self.assertFalse(facade.has_user_reviewed_place(self.guest.id, self.place.id))
+
+    def test_unique_review_per_user_and_place(self):
+        with self.assertRaises(IntegrityError):
+            facade.review_repo.add(Review(text="Again", rating=2, user_id=self.guest.id, place_id=self.other.id))
+        # The session stays usable after the rollback
+        self.assertEqual(len(facade.get_reviews_by_place(self.other.id, 50)[0]), 1)
+
+    def test_endpoint_rejects_duplicate_review(self):
+        client = self.app.test_client()
+        token = create_access_token(identity={'id': self.guest.id, 'is_admin': False})
+        response = client.post("/api/v1/reviews/",
+                               json={"text": "Again", "rating": 2, "place_id": self.other.id},
+                               headers={"Authorization": f"Bearer {token}"})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.get_json()['error'], 'You have already reviewed this place.')
+
+
+if __name__ == "__main__":
+    unittest.main()
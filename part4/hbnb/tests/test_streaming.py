@@ -0,0 +1,70 @@
+import json
+import unittest
+from datetime import datetime, timedelta
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+
+
+class TestStreamingExports(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.app.config["STREAM_BATCH_SIZE"] = 3
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+        self.client = self.app.test_client()
+
+        start = datetime(2025, 1, 1)
+        self.users = [User(first_name="User", last_name=str(i), email=f"user{i}@hbnb.io", password="x",
+                           created_at=start + timedelta(minutes=i)) for i in range(8)]
+        self.places = [Place(title=f"Place {i}", description="desc", price=10.0 * (i + 1),
+                             latitude=45.0, longitude=5.0, owner=self.users[0],
+                             created_at=start + timedelta(minutes=i)) for i in range(7)]
+        reviews = [Review(text="Nice", rating=4, user=user, place=self.places[0]) for user in self.users[1:]]
+        db.session.add_all([*self.users, *self.places, *reviews])
+        db.session.commit()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def lines(self, response):
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.mimetype, "application/x-ndjson")
+        self.assertTrue(response.is_streamed)
+        return [json.loads(line) for line in response.get_data(as_text=True).splitlines()]
+
+    def test_places_stream_all_rows_in_order(self):
+        rows = self.lines(self.client.get("/api/v1/places/?stream=1"))
+        self.assertEqual([row["title"] for row in rows], [f"Place {i}" for i in range(7)])
+        self.assertEqual(rows[0]["review_count"], 0)
+
+    def test_places_stream_applies_filters(self):
+        rows = self.lines(self.client.get("/api/v1/places/?max_price=30",
+                                          headers={"Accept": "application/x-ndjson"}))
+        self.assertEqual([row["price"] for row in rows], [10.0, 20.0, 30.0])
+
+    def test_stream_not_supported_with_search(self):
+        response = self.client.get("/api/v1/places/?stream=1&bbox=0,40,10,50")
+        self.assertEqual(response.status_code, 400)
+
+    def test_users_and_reviews_stream(self):
+        users = self.lines(self.client.get("/api/v1/users/", headers={"Accept": "application/x-ndjson"}))
+        self.assertEqual(len(users), 8)
+        reviews = self.lines(self.client.get("/api/v1/reviews/?stream=1"))
+        self.assertEqual(len(reviews), 7)
+        self.assertEqual({review["place_id"] for review in reviews}, {self.places[0].id})
+
+    def test_json_stays_default(self):
+        response = self.client.get("/api/v1/users/?limit=5", headers={"Accept": "*/*"})
+        self.assertEqual(response.mimetype, "application/json")
+        self.assertEqual(len(response.get_json()), 5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+from sqlalchemy import event
+from app import create_app
+from app.extensions import db
+from app.models.user import User
+from app.models.place import Place
+from app.models.review import Review
+from app.models.amenity import Amenity
+from app.persistence.unit_of_work import unit_of_work
+from app.services import facade
+
+
+class TestUnitOfWork(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app("config.TestingConfig")
+        self.ctx = self.app.app_context()
+        self.ctx.push()
+        db.create_all()
+
+        self.owner = User(first_name="Owner", last_name="User", email="owner@hbnb.io", password="x")
+        self.guest = User(first_name="Guest", last_name="User", email="guest@hbnb.io", password="x")
+        self.amenity = Amenity(name="Wifi")
+        db.session.add_all([self.owner, self.guest, self.amenity])
+        db.session.commit()
+
+        self.commits = 0
+        event.listen(db.session(), "after_commit", self.count_commit)
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        self.ctx.pop()
+
+    def count_commit(self, session):
+        # Released SAVEPOINTs (amenity inserts) also fire after_commit
+        if not session.in_nested_transaction():
+            self.commits += 1
+
+    def create_place(self):
+        return facade.create_place({"title": "Flat", "description": "desc", "price": 100.0,
+                                    "latitude": 45.0, "longitude": 5.0,
+                                    "owner_id": self.owner.id, "amenities": [self.amenity.id]})
+
+    def test_one_commit_per_operation(self):
+        place = self.create_place()
+        self.assertEqual(self.commits, 1)
+
+        facade.update_place(place.id, {"title": "Loft", "amenities": []})
+        self.assertEqual(self.commits, 2)
+
+        review = facade.create_review({"text": "Nice", "rating": 4,
+                                       "user_id": self.guest.id, "place_id": place.id})
+        self.assertEqual(self.commits, 3)
+
+        facade.update_review(review.id, {"rating": 5})
+        facade.delete_review(review.id)
+        self.assertEqual(self.commits, 5)
+
+    def test_invalid_update_rolls_back_everything(self):
+        place = self.create_place()
+        review = facade.create_review({"text": "Nice", "rating": 4,
+                                       "user_id": self.guest.id, "place_id": place.id})
+        with self.assertRaises(ValueError):
+            facade.update_review(review.id, {"text": "Changed", "rating": 9})
+
+        self.assertEqual(db.session.get(Review, review.id).text, "Nice")
+        self.assertEqual(db.session.get(Place, place.id).rating_sum, 4)
+
+    def test_nested_blocks_commit_once(self):
+        with unit_of_work():
+            with unit_of_work():
+                facade.create_amenity({"name": "Pool"})
+            facade.create_amenity({"name": "Parking"})
+            self.assertEqual(self.commits, 0)
+        self.assertEqual(self.commits, 1)
+        self.assertEqual(Amenity.query.count(), 3)
+
+    def test_failed_block_discards_earlier_writes(self):
+        with self.assertRaises(ValueError):
+            with unit_of_work():
+                facade.create_amenity({"name": "Pool"})
+                raise ValueError("abort")
+        self.assertEqual(self.commits, 0)
+        self.assertEqual(Amenity.query.count(), 1)
+
+
+if __name__ == "__main__":
+    unittest.main()